@@ -0,0 +1,31 @@
+"""inventory_log_keyset_index
+
+Composite index backing keyset pagination of inventory logs per product.
+
+Revision ID: 3c1f9a7be2d4
+Revises: ed5ee417d376
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7be2d4'
+down_revision: Union[str, None] = 'ed5ee417d376'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_inventory_logs_product_id_id', 'inventory_logs',
+        ['product_id', sa.text('id DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_logs_product_id_id', table_name='inventory_logs')
@@ -0,0 +1,42 @@
+"""cart_item_count
+
+Persist the cart item count alongside the cached cart totals.
+
+Revision ID: 5b7e1c9d3f20
+Revises: a8d2e6f04b71
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e1c9d3f20'
+down_revision: Union[str, None] = 'a8d2e6f04b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'carts',
+        sa.Column('item_count', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.execute(
+        """
+        UPDATE carts SET item_count = counts.quantity
+        FROM (
+            SELECT cart_id, SUM(quantity) AS quantity
+            FROM cart_items
+            GROUP BY cart_id
+        ) AS counts
+        WHERE counts.cart_id = carts.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('carts', 'item_count')
@@ -0,0 +1,43 @@
+"""unique_active_cart_per_user
+
+At most one active cart per user, so concurrent requests can upsert the
+cart instead of racing to insert two.
+
+Revision ID: a3f6c8e1b904
+Revises: e4b9a1c7d352
+Create Date: 2026-10-15 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f6c8e1b904'
+down_revision: Union[str, None] = 'e4b9a1c7d352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Racing requests could previously create a second active cart; keep the newest
+    op.execute("""
+        UPDATE carts SET status = 'abandoned'
+        WHERE status = 'active'
+          AND user_id IS NOT NULL
+          AND id NOT IN (
+              SELECT max(id) FROM carts
+              WHERE status = 'active' AND user_id IS NOT NULL
+              GROUP BY user_id
+          )
+    """)
+    op.create_index(
+        'uq_carts_user_active', 'carts', ['user_id'],
+        unique=True, postgresql_where=sa.text("status = 'active'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_carts_user_active', table_name='carts')
@@ -0,0 +1,41 @@
+"""dashboard_partial_indexes
+
+Partial indexes for the low-stock and dashboard order aggregates.
+
+Revision ID: a8d2e6f04b71
+Revises: 3c1f9a7be2d4
+Create Date: 2026-10-15 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2e6f04b71'
+down_revision: Union[str, None] = '3c1f9a7be2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_products_active_low_stock', 'products', ['stock'],
+        unique=False, postgresql_where=sa.text('is_active = true')
+    )
+    op.create_index(
+        'ix_orders_paid_created_at', 'orders', ['created_at'],
+        unique=False, postgresql_where=sa.text("payment_status = 'paid'")
+    )
+    op.create_index(
+        'ix_orders_open_status', 'orders', ['status'],
+        unique=False, postgresql_where=sa.text("status IN ('pending', 'processing')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_open_status', table_name='orders')
+    op.drop_index('ix_orders_paid_created_at', table_name='orders')
+    op.drop_index('ix_products_active_low_stock', table_name='products')
@@ -0,0 +1,33 @@
+"""drop_orders_open_status_index
+
+The dashboard counts every order status in one pass with per-status
+FILTER clauses, so nothing filters on status IN ('pending', 'processing')
+any more and ix_orders_open_status only adds write cost.
+
+Revision ID: b3e7d1a9c582
+Revises: f4a9c2d7b386
+Create Date: 2026-10-15 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7d1a9c582'
+down_revision: Union[str, None] = 'f4a9c2d7b386'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_orders_open_status', table_name='orders', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_orders_open_status', 'orders', ['status'],
+        unique=False, postgresql_where=sa.text("status IN ('pending', 'processing')")
+    )
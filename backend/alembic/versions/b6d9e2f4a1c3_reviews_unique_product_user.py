@@ -0,0 +1,38 @@
+"""reviews_unique_product_user
+
+One review per user and product, enforced by a unique constraint that
+also backs the duplicate check when a review is created.
+
+Revision ID: b6d9e2f4a1c3
+Revises: f1a7c3e95b28
+Create Date: 2026-10-15 16:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d9e2f4a1c3'
+down_revision: Union[str, None] = 'f1a7c3e95b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Racing requests could previously insert a second review; keep the first
+    op.execute("""
+        DELETE FROM reviews
+        WHERE id NOT IN (
+            SELECT min(id) FROM reviews GROUP BY product_id, user_id
+        )
+    """)
+    op.create_unique_constraint(
+        'uq_reviews_product_user', 'reviews', ['product_id', 'user_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_reviews_product_user', 'reviews', type_='unique')
@@ -0,0 +1,51 @@
+"""unique_cart_item_line
+
+One cart_items row per cart, product and variation, so add_item can upsert
+the line instead of looking it up first.
+
+Revision ID: b7d2e9f4a615
+Revises: a3f6c8e1b904
+Create Date: 2026-10-15 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e9f4a615'
+down_revision: Union[str, None] = 'a3f6c8e1b904'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fold duplicate lines into the oldest one before enforcing uniqueness
+    op.execute("""
+        UPDATE cart_items SET quantity = dup.quantity
+        FROM (
+            SELECT min(id) AS keep_id, sum(quantity) AS quantity
+            FROM cart_items
+            GROUP BY cart_id, product_id, coalesce(variation_id, 0)
+            HAVING count(*) > 1
+        ) AS dup
+        WHERE cart_items.id = dup.keep_id
+    """)
+    op.execute("""
+        DELETE FROM cart_items
+        WHERE id NOT IN (
+            SELECT min(id) FROM cart_items
+            GROUP BY cart_id, product_id, coalesce(variation_id, 0)
+        )
+    """)
+    op.create_index(
+        'uq_cart_items_cart_product_variation', 'cart_items',
+        ['cart_id', 'product_id', sa.text('coalesce(variation_id, 0)')],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_cart_items_cart_product_variation', table_name='cart_items')
@@ -0,0 +1,39 @@
+"""keyset_pagination_indexes
+
+Composite indexes backing keyset pagination of products and reviews.
+
+Revision ID: c4f2a81e6d37
+Revises: 5b7e1c9d3f20
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2a81e6d37'
+down_revision: Union[str, None] = '5b7e1c9d3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRODUCT_SORT_KEYS = ('created_at', 'price', 'rating', 'name', 'view_count')
+
+
+def upgrade() -> None:
+    for key in PRODUCT_SORT_KEYS:
+        op.create_index(
+            f'ix_products_active_{key}_id', 'products', ['is_active', key, 'id'], unique=False
+        )
+    op.create_index(
+        'ix_reviews_product_approved_created_id', 'reviews',
+        ['product_id', 'is_approved', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_product_approved_created_id', table_name='reviews')
+    for key in reversed(PRODUCT_SORT_KEYS):
+        op.drop_index(f'ix_products_active_{key}_id', table_name='products')
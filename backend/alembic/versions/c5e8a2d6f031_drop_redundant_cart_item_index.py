@@ -0,0 +1,33 @@
+"""drop_redundant_cart_item_index
+
+uq_cart_items_cart_product_variation already leads with (cart_id,
+product_id), so the plain composite index only adds write cost.
+
+Revision ID: c5e8a2d6f031
+Revises: b7d2e9f4a615
+Create Date: 2026-10-15 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a2d6f031'
+down_revision: Union[str, None] = 'b7d2e9f4a615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_cart_items_cart_product', table_name='cart_items', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_cart_items_cart_product', 'cart_items',
+        ['cart_id', 'product_id', 'variation_id'],
+        unique=False, if_not_exists=True
+    )
@@ -0,0 +1,44 @@
+"""product_list_filter_indexes
+
+Indexes for the product list's common filter shapes: featured and
+in-stock listings ordered newest first, and products by category.
+
+Revision ID: d2c8f5a17e93
+Revises: b6d9e2f4a1c3
+Create Date: 2026-10-15 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c8f5a17e93'
+down_revision: Union[str, None] = 'b6d9e2f4a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_products_featured_created_at_id', 'products', ['created_at', 'id'],
+        unique=False, postgresql_where=sa.text('is_active = true AND is_featured = true')
+    )
+    op.create_index(
+        'ix_products_in_stock_created_at_id', 'products', ['created_at', 'id'],
+        unique=False, postgresql_where=sa.text('is_active = true AND stock > 0')
+    )
+    op.create_index(
+        'ix_product_category_association_category_product', 'product_category_association',
+        ['category_id', 'product_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_product_category_association_category_product', table_name='product_category_association'
+    )
+    op.drop_index('ix_products_in_stock_created_at_id', table_name='products')
+    op.drop_index('ix_products_featured_created_at_id', table_name='products')
@@ -0,0 +1,50 @@
+"""product_trigram_indexes
+
+pg_trgm GIN indexes on product name, brand and SKU, so the substring
+(ILIKE '%term%') matches in catalog search and the brand filter are index
+scans instead of sequential scans.
+
+Revision ID: d8f3b6a1c947
+Revises: c5e8a2d6f031
+Create Date: 2026-10-15 20:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3b6a1c947'
+down_revision: Union[str, None] = 'c5e8a2d6f031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = {
+    'ix_products_name_trgm': 'name',
+    'ix_products_brand_trgm': 'brand',
+    'ix_products_sku_trgm': 'sku',
+}
+
+
+def upgrade() -> None:
+    # Trigram indexes are PostgreSQL-only; other databases keep plain ILIKE
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built concurrently so the catalog stays writable on large tables
+    with op.get_context().autocommit_block():
+        for name, column in TRIGRAM_INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON products USING GIN ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for name in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,42 @@
+"""unique_product_slug
+
+Enforce unique product slugs in the schema; product inserts pick a free
+slug and retry on the rare collision instead of trusting a prior lookup.
+
+Revision ID: e1c7f4b9d208
+Revises: d8f3b6a1c947
+Create Date: 2026-10-15 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c7f4b9d208'
+down_revision: Union[str, None] = 'd8f3b6a1c947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent creates could previously store the same slug; the oldest
+    # product keeps it and the others get their id appended
+    op.execute("""
+        UPDATE products SET slug = slug || '-' || id
+        WHERE slug IS NOT NULL
+          AND id NOT IN (
+              SELECT min(id) FROM products
+              WHERE slug IS NOT NULL
+              GROUP BY slug
+          )
+    """)
+    op.create_index('ix_products_slug', 'products', ['slug'], unique=True, if_not_exists=True)
+    op.drop_index('idx_products_slug', table_name='products', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('idx_products_slug', 'products', ['slug'], unique=False, if_not_exists=True)
+    op.drop_index('ix_products_slug', table_name='products', if_exists=True)
@@ -0,0 +1,42 @@
+"""cart_lookup_indexes
+
+Indexes for active-cart lookups by user and session, and a partial index
+on expires_at for the expired-cart sweep. The composite indexes were
+declared on the model but never created by a migration, so they are
+created only where missing.
+
+Revision ID: e4b9a1c7d352
+Revises: d2c8f5a17e93
+Create Date: 2026-10-15 18:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9a1c7d352'
+down_revision: Union[str, None] = 'd2c8f5a17e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_carts_user_active', 'carts', ['user_id', 'status'], unique=False, if_not_exists=True
+    )
+    op.create_index(
+        'ix_carts_session_active', 'carts', ['session_id', 'status'], unique=False, if_not_exists=True
+    )
+    op.create_index(
+        'ix_carts_active_expires', 'carts', ['expires_at'],
+        unique=False, postgresql_where=sa.text("status = 'active'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_carts_active_expires', table_name='carts')
+    op.drop_index('ix_carts_session_active', table_name='carts', if_exists=True)
+    op.drop_index('ix_carts_user_active', table_name='carts', if_exists=True)
@@ -0,0 +1,39 @@
+"""wishlist_indexes
+
+Indexes for listing a user's wishlist and their price-drop alerts.
+
+Revision ID: e93b5d02a7c4
+Revises: c4f2a81e6d37
+Create Date: 2026-10-15 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b5d02a7c4'
+down_revision: Union[str, None] = 'c4f2a81e6d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # wishlists is provisioned from database_schema02.sql, not by these migrations
+    if not sa.inspect(op.get_bind()).has_table('wishlists'):
+        return
+    op.create_index(
+        'ix_wishlists_user_added_at', 'wishlists', ['user_id', 'added_at'], unique=False
+    )
+    op.create_index(
+        'ix_wishlists_user_notify', 'wishlists', ['user_id', 'notify_on_price_drop'], unique=False
+    )
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('wishlists'):
+        return
+    op.drop_index('ix_wishlists_user_notify', table_name='wishlists')
+    op.drop_index('ix_wishlists_user_added_at', table_name='wishlists')
@@ -0,0 +1,59 @@
+"""sales_rollup_views
+
+Materialized daily sales and per-category sales rollups for the admin
+dashboard. Refreshed periodically by app.services.reporting.
+
+Revision ID: ed5ee417d376
+Revises: 90a4678bb2ca
+Create Date: 2026-10-15 10:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed5ee417d376'
+down_revision: Union[str, None] = '90a4678bb2ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS sales_daily AS
+        SELECT date(created_at) AS day,
+               count(*) AS order_count,
+               coalesce(sum(total_amount), 0) AS revenue
+        FROM orders
+        WHERE payment_status = 'paid'
+        GROUP BY date(created_at)
+    """)
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_sales_daily_day ON sales_daily (day)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS category_sales_rollup AS
+        SELECT c.id AS category_id,
+               c.name AS name,
+               count(oi.id) AS order_count,
+               coalesce(sum(oi.quantity), 0) AS items_sold,
+               coalesce(sum(oi.quantity * oi.price), 0) AS revenue
+        FROM categories c
+        JOIN product_category_association pca ON pca.category_id = c.id
+        JOIN order_items oi ON oi.product_id = pca.product_id
+        JOIN orders o ON o.id = oi.order_id
+        WHERE o.payment_status = 'paid'
+        GROUP BY c.id, c.name
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_category_sales_rollup_category "
+        "ON category_sales_rollup (category_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS category_sales_rollup")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS sales_daily")
@@ -0,0 +1,33 @@
+"""product_active_brand_index
+
+Partial index on brand over active products for the product list's
+multi-brand filter (brand IN (...)). Substring brand matches already use
+the trigram index from d8f3b6a1c947.
+
+Revision ID: f4a9c2d7b386
+Revises: e1c7f4b9d208
+Create Date: 2026-10-15 21:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c2d7b386'
+down_revision: Union[str, None] = 'e1c7f4b9d208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_products_active_brand', 'products', ['brand'],
+        unique=False, postgresql_where=sa.text('is_active = true')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_active_brand', table_name='products')
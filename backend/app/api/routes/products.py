@@ -6,6 +6,7 @@ from app.schemas.product import Product, ProductCreate, ProductUpdate, Review, R
 from app.models.product import Product as ProductModel, Category as CategoryModel, Review as ReviewModel, ProductImage as ProductImageModel
 from app.core.security import get_current_admin_user, get_current_user
 from app.models.customer import User
+from app.services import ratings
 import shutil
 import os
 
@@ -72,10 +73,7 @@ def create_review(id: int, review: ReviewCreate, db: Session = Depends(get_db),
     db.refresh(db_review)
 
     # Update product rating
-    reviews = db.query(ReviewModel).filter(ReviewModel.product_id == id).all()
-    product.rating = sum([r.rating for r in reviews]) / len(reviews)
-    product.review_count = len(reviews)
-    db.commit()
+    ratings.recalculate_product_rating(db, id)
 
     return db_review
 
@@ -0,0 +1,516 @@
+"""
+Response Caching
+Redis-backed JSON cache for expensive read endpoints.
+
+Caching is a no-op unless CACHE_ENABLED is set and REDIS_URL points at a
+reachable Redis instance, so endpoints behave identically without Redis.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import random
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple, cast
+
+import orjson
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "neatify"
+
+# Namespaces shared between cached readers and the writers that invalidate them
+DASHBOARD_NAMESPACE = "dashboard"
+PRODUCTS_NAMESPACE = "products"
+CART_NAMESPACE = "cart"
+
+# Suffix of the key holding the ETag recorded for a cached entry
+ETAG_SUFFIX = ":etag"
+
+# Sorted set per namespace of its live keys, scored by expiry time, so a
+# namespace can be invalidated without scanning the keyspace
+INDEX_PREFIX = f"{KEY_PREFIX}:index:"
+
+# Keys deleted per DEL call when invalidating a namespace
+INVALIDATE_BATCH_SIZE = 500
+
+# Seconds to wait before retrying a Redis connection after a failure
+RECONNECT_BACKOFF_SECONDS = 30
+
+# Suffix of the key held while one caller refills an expired entry
+LOCK_SUFFIX = ":lock"
+REFILL_LOCK_SECONDS = 5
+
+# How long callers that lose the refill lock poll for the new entry
+REFILL_WAIT_INTERVAL = 0.05
+REFILL_WAIT_STEPS = 20
+
+# Entries kept by the per-worker cache in front of Redis
+LOCAL_CACHE_MAXSIZE = 256
+
+_client = None
+_retry_at = 0.0
+
+
+class LocalTTLCache:
+    """
+    Small thread-safe LRU with per-entry expiry, private to this worker.
+    Sits in front of Redis for the hottest keys so repeat reads skip the
+    network round trip entirely.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any:
+        """Return the live value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store value for ttl seconds, evicting the least recently used entry"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every entry whose key starts with prefix"""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+_local_cache = LocalTTLCache(LOCAL_CACHE_MAXSIZE)
+
+
+def get_redis():
+    """
+    Get the shared Redis client, or None when caching is unavailable.
+    Connection failures are logged once and retried after a short backoff.
+    """
+    global _client, _retry_at
+
+    if not settings.CACHE_ENABLED or not settings.REDIS_URL:
+        return None
+    if _client is not None:
+        return _client
+    if time.monotonic() < _retry_at:
+        return None
+
+    try:
+        import redis
+
+        client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        client.ping()
+        _client = client
+    except Exception as e:
+        logger.warning(f"Redis cache unavailable: {e}. Continuing without cache.")
+        _retry_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
+    return _client
+
+
+def reset_client() -> None:
+    """Drop the client after a runtime error so the next call reconnects"""
+    global _client, _retry_at
+    _client = None
+    _retry_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
+
+
+def make_key(namespace: str, name: str, params: Optional[dict] = None) -> str:
+    """Build a cache key from a namespace, a name and scalar parameters"""
+    key = f"{KEY_PREFIX}:{namespace}:{name}"
+    if params:
+        key += ":" + ",".join(f"{k}={params[k]}" for k in sorted(params))
+    return key
+
+
+def cache_get(key: str) -> Any:
+    """Return the cached JSON value for key, or None on miss/unavailable"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = cast(Optional[str], client.get(key))
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        reset_client()
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+def _cache_get_raw(key: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the cached JSON text for key and its ETag, or (None, None)"""
+    client = get_redis()
+    if client is None:
+        return None, None
+    try:
+        raw, etag = cast(List[Optional[str]], client.mget(key, key + ETAG_SUFFIX))
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        reset_client()
+        return None, None
+    if raw is None:
+        return None, None
+    return raw, etag
+
+
+def cache_get_with_etag(key: str) -> Tuple[Any, Optional[str]]:
+    """Return the cached JSON value for key and its ETag, or (None, None)"""
+    raw, etag = _cache_get_raw(key)
+    if raw is None:
+        return None, None
+    return orjson.loads(raw), etag
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize pydantic models as their JSON form and anything else as str"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header covers etag: `*`, or any entry of its
+    comma-separated list, compared weakly (a W/ prefix is ignored).
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _make_etag(key: str, expires_at: int) -> str:
+    """Weak ETag for a cache entry, from its key and expiry timestamp"""
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'W/"{digest}-{expires_at}"'
+
+
+def _encode(value: Any) -> bytes:
+    """JSON-encode a value for the cache"""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def cache_set(key: str, value: Any, ttl: Optional[int] = None, jitter: int = 0) -> Optional[str]:
+    """
+    Store a JSON-serializable value under key with a TTL in seconds, plus up
+    to `jitter` random seconds so entries written together do not expire
+    together. Returns the ETag recorded alongside the entry, or None if not stored.
+    """
+    if get_redis() is None:
+        return None
+    return _cache_set_raw(key, _encode(value), ttl, jitter)
+
+
+def _cache_set_raw(key: str, payload: bytes, ttl: Optional[int] = None, jitter: int = 0) -> Optional[str]:
+    """Store already-encoded JSON under key; see cache_set()"""
+    client = get_redis()
+    if client is None:
+        return None
+    ttl = (ttl or settings.CACHE_TTL) + (random.randint(0, jitter) if jitter else 0)
+    now = int(time.time())
+    etag = _make_etag(key, now + ttl)
+    index = _namespace_index(key)
+    try:
+        pipe = client.pipeline()
+        pipe.set(key, payload, ex=ttl)
+        pipe.set(key + ETAG_SUFFIX, etag, ex=ttl)
+        if index:
+            pipe.zadd(index, {key: now + ttl})
+            pipe.zremrangebyscore(index, "-inf", now)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+        reset_client()
+        return None
+    return etag
+
+
+def _namespace_index(key: str) -> Optional[str]:
+    """Index key for the namespace of a make_key() key, None for other keys"""
+    prefix, _, rest = key.partition(":")
+    namespace = rest.partition(":")[0]
+    if prefix != KEY_PREFIX or not namespace:
+        return None
+    return INDEX_PREFIX + namespace
+
+
+def _acquire_refill_lock(key: str) -> bool:
+    """
+    Take the short-lived lock for refilling key. Returns True when this
+    caller should run the query; also True when Redis errors, so a broken
+    lock never blocks a refill.
+    """
+    client = get_redis()
+    if client is None:
+        return True
+    try:
+        return bool(client.set(key + LOCK_SUFFIX, "1", nx=True, ex=REFILL_LOCK_SECONDS))
+    except Exception as e:
+        logger.warning(f"Cache lock failed for {key}: {e}")
+        reset_client()
+        return True
+
+
+def _release_refill_lock(key: str) -> None:
+    """Release the refill lock for key"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(key + LOCK_SUFFIX)
+    except Exception as e:
+        logger.warning(f"Cache unlock failed for {key}: {e}")
+        reset_client()
+
+
+def cache_delete(*keys: str) -> None:
+    """Delete cached entries (and their ETags) by key"""
+    client = get_redis()
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys, *(key + ETAG_SUFFIX for key in keys))
+    except Exception as e:
+        logger.warning(f"Cache delete failed for {', '.join(keys)}: {e}")
+        reset_client()
+
+
+def invalidate_namespace(namespace: str) -> None:
+    """
+    Delete every cached entry in a namespace, found through the namespace's
+    key index rather than a keyspace scan. Local entries are dropped in
+    this worker only; other workers' copies expire with their short TTL.
+    """
+    _local_cache.invalidate_prefix(f"{KEY_PREFIX}:{namespace}:")
+    client = get_redis()
+    if client is None:
+        return
+    index = INDEX_PREFIX + namespace
+    try:
+        # Take the key list and clear the index atomically, so entries
+        # written after this point are indexed for the next invalidation
+        pipe = client.pipeline()
+        pipe.zrange(index, 0, -1)
+        pipe.delete(index)
+        keys = pipe.execute()[0]
+        for i in range(0, len(keys), INVALIDATE_BATCH_SIZE):
+            batch = keys[i:i + INVALIDATE_BATCH_SIZE]
+            client.delete(*batch, *(key + ETAG_SUFFIX for key in batch))
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for namespace {namespace}: {e}")
+        reset_client()
+
+
+def _endpoint_key(namespace: str, func: Callable, kwargs: dict) -> str:
+    """Cache key for an endpoint call from its scalar keyword arguments"""
+    params = {
+        k: v for k, v in kwargs.items()
+        if v is None or isinstance(v, (str, int, float, bool))
+    }
+    return make_key(namespace, func.__name__, params)
+
+
+def _conditional(kwargs: dict, etag: Optional[str]) -> Optional[Response]:
+    """
+    Attach etag to the endpoint's `response` parameter and return a 304 when
+    the endpoint's `request` parameter already carries it in If-None-Match.
+    """
+    if not etag:
+        return None
+    response = kwargs.get("response")
+    if isinstance(response, Response):
+        response.headers["ETag"] = etag
+    request = kwargs.get("request")
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _respond(kwargs: dict, value: Any, etag: Optional[str], raw: bool) -> Any:
+    """
+    The cached value, or a 304 when the client already holds its ETag.
+    With `raw`, value is JSON text sent back as-is.
+    """
+    not_modified = _conditional(kwargs, etag)
+    if not_modified is not None:
+        return not_modified
+    if raw:
+        headers = {"ETag": etag} if etag else None
+        return Response(content=value, media_type="application/json", headers=headers)
+    return value
+
+
+def _lookup(key: str, kwargs: dict, local_ttl: Optional[int], raw: bool) -> Tuple[bool, Any]:
+    """Serve a call from the local cache, then Redis; returns (hit, response)"""
+    if local_ttl:
+        entry = _local_cache.get(key)
+        if entry is not None:
+            value, etag = entry
+            return True, _respond(kwargs, value, etag, raw)
+    text, etag = _cache_get_raw(key)
+    if text is None:
+        return False, None
+    value = text if raw else orjson.loads(text)
+    if local_ttl:
+        _local_cache.set(key, (value, etag), local_ttl)
+    return True, _respond(kwargs, value, etag, raw)
+
+
+def _store(
+    key: str,
+    kwargs: dict,
+    result: Any,
+    ttl: Optional[int],
+    jitter: int,
+    local_ttl: Optional[int],
+    raw: bool
+) -> Any:
+    """
+    Cache a freshly computed result in Redis and the local cache and
+    return what the endpoint should send: with `raw`, the encoded JSON
+    itself, so FastAPI does not serialize the result a second time.
+    """
+    payload = _encode(result)
+    etag = _cache_set_raw(key, payload, ttl, jitter)
+    if local_ttl:
+        _local_cache.set(key, (payload if raw else result, etag), local_ttl)
+    if raw:
+        return _respond(kwargs, payload, etag, raw)
+    _conditional(kwargs, etag)
+    return result
+
+
+def cached(
+    namespace: str,
+    ttl: Optional[int] = None,
+    jitter: int = 0,
+    lock: bool = False,
+    local_ttl: Optional[int] = None,
+    raw: bool = False
+) -> Callable:
+    """
+    Cache the JSON result of an endpoint in Redis.
+
+    Works on both `def` and `async def` endpoints. The key is built from
+    the function name and its scalar keyword arguments
+    (str/int/float/bool/None); dependencies such as the database session or
+    current user are ignored, so only use this on endpoints whose response
+    does not depend on who is asking.
+
+    Endpoints that declare `request: Request` and `response: Response`
+    parameters also get an ETag tied to the cache entry, and a 304 when the
+    client already holds it.
+
+    `jitter` adds up to that many random seconds to each entry's TTL. With
+    `lock`, only one caller refills an expired entry; the others briefly
+    poll for it and fall back to running the endpoint themselves.
+    `local_ttl` also keeps results in a per-worker LRU for that many
+    seconds (keep it below `ttl`); it still applies when Redis is down.
+    With `raw`, responses carry the stored JSON directly instead of having
+    FastAPI validate and re-encode the result against the response model,
+    on hits and on the miss that fills the entry; only use it when the
+    endpoint returns instances of that model.
+
+    Pydantic models in the result are stored in their JSON form, so
+    endpoints that return ORM objects should validate them into their
+    response schema first.
+
+    Usage:
+        @router.get("/stats")
+        @cached("dashboard", ttl=120)
+        def get_stats(days: int = 30, db: Session = Depends(get_db)):
+            ...
+    """
+    def bypass() -> bool:
+        if local_ttl:
+            return not settings.CACHE_ENABLED
+        return get_redis() is None
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if await asyncio.to_thread(bypass):
+                    return await func(*args, **kwargs)
+
+                key = _endpoint_key(namespace, func, kwargs)
+                # The Redis client is synchronous; keep its calls off the event loop
+                hit, response = await asyncio.to_thread(_lookup, key, kwargs, local_ttl, raw)
+                if hit:
+                    return response
+                locked = False
+                if lock:
+                    locked = await asyncio.to_thread(_acquire_refill_lock, key)
+                    for _ in range(0 if locked else REFILL_WAIT_STEPS):
+                        await asyncio.sleep(REFILL_WAIT_INTERVAL)
+                        hit, response = await asyncio.to_thread(_lookup, key, kwargs, local_ttl, raw)
+                        if hit:
+                            return response
+
+                try:
+                    result = await func(*args, **kwargs)
+                    return await asyncio.to_thread(
+                        _store, key, kwargs, result, ttl, jitter, local_ttl, raw
+                    )
+                finally:
+                    if locked:
+                        await asyncio.to_thread(_release_refill_lock, key)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if bypass():
+                return func(*args, **kwargs)
+
+            key = _endpoint_key(namespace, func, kwargs)
+            hit, response = _lookup(key, kwargs, local_ttl, raw)
+            if hit:
+                return response
+            locked = False
+            if lock:
+                locked = _acquire_refill_lock(key)
+                for _ in range(0 if locked else REFILL_WAIT_STEPS):
+                    time.sleep(REFILL_WAIT_INTERVAL)
+                    hit, response = _lookup(key, kwargs, local_ttl, raw)
+                    if hit:
+                        return response
+
+            try:
+                result = func(*args, **kwargs)
+                return _store(key, kwargs, result, ttl, jitter, local_ttl, raw)
+            finally:
+                if locked:
+                    _release_refill_lock(key)
+
+        return wrapper
+
+    return decorator
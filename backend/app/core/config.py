@@ -53,10 +53,18 @@ class Settings(BaseSettings):
         return v or default_url
 
     # Database Pool Configuration
+    # Each worker process can open up to DB_POOL_SIZE + DB_MAX_OVERFLOW sync
+    # connections (the background job locks come out of this pool) plus
+    # DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW async ones; multiply by the
+    # worker count and keep the total under PostgreSQL's max_connections.
     DB_POOL_SIZE: int = 15
     DB_MAX_OVERFLOW: int = 30
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 5
     DB_POOL_TIMEOUT: int = 60
     DB_POOL_RECYCLE: int = 1800
+    # Compiled SQL cache entries per engine (SQLAlchemy default is 500)
+    DB_QUERY_CACHE_SIZE: int = 1200
 
     # =========================================================================
     # Security & Authentication
@@ -158,6 +166,20 @@ class Settings(BaseSettings):
     REDIS_URL: Optional[str] = None
     CACHE_ENABLED: bool = False
     CACHE_TTL: int = 300
+    DASHBOARD_CACHE_TTL: int = 120
+    PRODUCT_CACHE_TTL: int = 300
+    PRODUCT_CACHE_TTL_JITTER: int = 60
+    PRODUCT_LOCAL_CACHE_TTL: int = 60
+    PRODUCT_COUNT_CACHE_TTL: int = 60
+    CART_CACHE_TTL: int = 60
+    VIEW_COUNT_FLUSH_SECONDS: int = 60
+
+    # Dashboard sales rollups (PostgreSQL materialized views)
+    SALES_ROLLUPS_ENABLED: bool = True
+    SALES_ROLLUP_REFRESH_SECONDS: int = 300
+
+    # Exact recalculation of incrementally maintained product ratings
+    RATING_RECALC_SECONDS: int = 3600
 
     # Google OAuth
     GOOGLE_CLIENT_ID: Optional[str] = None
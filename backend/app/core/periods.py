@@ -0,0 +1,38 @@
+"""
+Reporting Periods
+UTC day and month boundaries shared by the dashboard aggregates.
+
+Bounds are computed once per minute so every query in a request buckets
+orders against the same instants, even when the request crosses midnight.
+"""
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class PeriodBounds(NamedTuple):
+    """Naive UTC period boundaries; end bounds are exclusive"""
+    today_start: datetime
+    month_start: datetime
+    last_month_start: datetime
+    last_month_end: datetime
+
+
+@lru_cache(maxsize=1)
+def _period_bounds(minute_key: int) -> PeriodBounds:
+    """Compute the bounds for the minute identified by minute_key"""
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = today_start.replace(day=1)
+    last_month_start = (month_start - timedelta(days=1)).replace(day=1)
+    return PeriodBounds(
+        today_start=today_start,
+        month_start=month_start,
+        last_month_start=last_month_start,
+        last_month_end=month_start,
+    )
+
+
+def current_period_bounds() -> PeriodBounds:
+    """Period bounds for now, cached for the current minute"""
+    return _period_bounds(int(time.time()) // 60)
@@ -1,18 +1,26 @@
 """
 Rate Limiting Middleware
-Simple in-memory rate limiting for API endpoints.
+Simple in-memory rate limiting for API endpoints, plus a Redis-backed
+per-user limiter for authenticated write endpoints.
 For production, consider using Redis-backed solutions like slowapi.
 """
+import logging
 import time
 from collections import defaultdict
-from typing import Callable, Dict, Tuple
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
 from functools import wraps
 
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.core.cache import KEY_PREFIX, get_redis, reset_client
 from app.core.config import settings
+from app.core.security import get_current_user
+from app.models.customer import User
+
+logger = logging.getLogger(__name__)
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -148,6 +156,99 @@ class EndpointRateLimiter:
         return request.client.host if request.client else "unknown"
 
 
+# Increment a fixed-window counter, starting its expiry on the first hit;
+# returns the count and the seconds left in the window
+_FIXED_WINDOW_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {count, redis.call('TTL', KEYS[1])}
+"""
+
+
+class UserRateLimiter:
+    """
+    Per-user, per-endpoint rate limiter for authenticated routes.
+    Use as a route dependency; counts live in Redis so limits hold across
+    workers, with an in-process fallback when Redis is unavailable.
+    
+    Each check is a single EVALSHA of a fixed-window INCR + EXPIRE script.
+    
+    Usage:
+        @router.post("/reviews", dependencies=[Depends(user_write_rate_limiter)])
+        def create_review(...):
+            ...
+    """
+    
+    def __init__(self, max_requests: int = 30, window_seconds: int = 60):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._script: Any = None
+        self._script_client = None
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._next_sweep = time.monotonic() + window_seconds
+        self._lock = Lock()
+    
+    def __call__(self, request: Request, current_user: User = Depends(get_current_user)):
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        
+        # The route's name rather than its URL, so one bucket covers every product
+        route = request.scope.get("route")
+        endpoint = getattr(route, "name", None) or request.url.path
+        key = f"{KEY_PREFIX}:rl:{endpoint}:{current_user.id}"
+        
+        count, retry_after = self._hit_redis(key)
+        if count is None or retry_after is None:
+            count, retry_after = self._hit_local(key)
+        
+        if count > self.max_requests:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many requests. Try again in {retry_after} seconds.",
+                headers={"Retry-After": str(retry_after)}
+            )
+        return None
+    
+    def _hit_redis(self, key: str) -> Tuple[Optional[int], Optional[int]]:
+        """Count a request in Redis; returns (None, None) when unavailable"""
+        client = get_redis()
+        if client is None:
+            return None, None
+        try:
+            if self._script_client is not client:
+                self._script = client.register_script(_FIXED_WINDOW_SCRIPT)
+                self._script_client = client
+            count, ttl = self._script(keys=[key], args=[self.window_seconds])
+        except Exception as e:
+            logger.warning(f"Rate limit check failed for {key}: {e}")
+            reset_client()
+            return None, None
+        return int(count), max(int(ttl), 1)
+    
+    def _hit_local(self, key: str) -> Tuple[int, int]:
+        """Count a request in this process's fixed window for key"""
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            started, count = self._windows.get(key, (now, 0))
+            if now - started >= self.window_seconds:
+                started, count = now, 0
+            count += 1
+            self._windows[key] = (started, count)
+        return count, max(int(self.window_seconds - (now - started)), 1)
+    
+    def _sweep(self, now: float) -> None:
+        """Drop expired windows, at most once per window; caller holds the lock"""
+        self._windows = {
+            key: window for key, window in self._windows.items()
+            if now - window[0] < self.window_seconds
+        }
+        self._next_sweep = now + self.window_seconds
+
+
 # =============================================================================
 # PRE-CONFIGURED RATE LIMITERS
 # =============================================================================
@@ -163,3 +264,6 @@ standard_rate_limiter = EndpointRateLimiter(max_requests=30, window_seconds=60)
 
 # Relaxed limiter for read-only endpoints (100 requests per minute)
 read_rate_limiter = EndpointRateLimiter(max_requests=100, window_seconds=60)
+
+# Per-user limiter for authenticated writes such as reviews and wishlist changes
+user_write_rate_limiter = UserRateLimiter(max_requests=30, window_seconds=60)
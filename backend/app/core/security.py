@@ -4,6 +4,7 @@ Password hashing, JWT token management, and authentication helpers
 """
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, Any
+import re
 import secrets
 import hashlib
 from functools import lru_cache
@@ -614,6 +615,13 @@ def generate_secure_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
+# Character classes scored by check_password_strength
+_UPPERCASE_RE = re.compile(r"[A-Z]")
+_LOWERCASE_RE = re.compile(r"[a-z]")
+_DIGIT_RE = re.compile(r"\d")
+_SPECIAL_RE = re.compile(r"[!@#$%^&*(),.?\":{}|<>]")
+
+
 def check_password_strength(password: str) -> dict:
     """
     Check password strength and return feedback.
@@ -624,8 +632,6 @@ def check_password_strength(password: str) -> dict:
     Returns:
         Dictionary with strength score and suggestions
     """
-    import re
-    
     score = 0
     suggestions = []
     
@@ -637,22 +643,22 @@ def check_password_strength(password: str) -> dict:
     if len(password) >= 12:
         score += 1
     
-    if re.search(r"[A-Z]", password):
+    if _UPPERCASE_RE.search(password):
         score += 1
     else:
         suggestions.append("Add uppercase letters")
     
-    if re.search(r"[a-z]", password):
+    if _LOWERCASE_RE.search(password):
         score += 1
     else:
         suggestions.append("Add lowercase letters")
     
-    if re.search(r"\d", password):
+    if _DIGIT_RE.search(password):
         score += 1
     else:
         suggestions.append("Add numbers")
     
-    if re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+    if _SPECIAL_RE.search(password):
         score += 1
     else:
         suggestions.append("Add special characters")
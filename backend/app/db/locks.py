@@ -0,0 +1,79 @@
+"""
+Background Job Locks
+Elects one process to run a periodic job that every worker starts.
+
+The elected process holds a session-level PostgreSQL advisory lock on a
+connection kept for the job's lifetime. The lock belongs to that
+connection, so when the process dies the server releases it and the next
+worker to check takes over. On other databases (SQLite in development)
+there is a single process and it always runs the job.
+"""
+import logging
+import zlib
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class JobLeadership:
+    """
+    Advisory lock deciding whether this process runs a named job.
+    Call acquire() before each run and release() when the loop stops.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # Stable across processes, unlike hash()
+        self.key = zlib.crc32(f"neatify:job:{name}".encode())
+        self._conn: Optional[Connection] = None
+
+    def acquire(self) -> bool:
+        """Whether this process should run the job now"""
+        from app.db.session import engine
+
+        if engine.dialect.name != "postgresql":
+            return True
+
+        if self._conn is not None:
+            # Still the leader as long as the lock's connection is alive
+            try:
+                self._conn.execute(text("SELECT 1"))
+                self._conn.commit()
+                return True
+            except Exception as e:
+                logger.warning(f"Lost the {self.name} job lock: {e}")
+                self._conn.invalidate()
+                self._conn.close()
+                self._conn = None
+
+        conn = engine.connect()
+        try:
+            held = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar()
+            # End the transaction; the lock is held by the session, not it
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not held:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def release(self) -> None:
+        """Give up the lock so another process can take the job over"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to release the {self.name} job lock: {e}")
+        finally:
+            self._conn.close()
+            self._conn = None
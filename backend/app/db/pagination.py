@@ -0,0 +1,102 @@
+"""
+Keyset Pagination
+Page through queries by seeking past the last row seen instead of using
+OFFSET, so deep pages cost the same as the first and no COUNT is needed.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Query, Session
+
+
+def keyset_page(
+    query: Query,
+    id_column,
+    before: Optional[int] = None,
+    limit: int = 50
+) -> Tuple[List, bool]:
+    """
+    Return up to `limit` rows with id below `before`, newest first, and
+    whether another page exists. One extra row is fetched to answer the
+    latter, so the cost scales with the page size rather than the table.
+    """
+    if before:
+        query = query.filter(id_column < before)
+    rows = query.order_by(id_column.desc()).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque, URL-safe cursor for the sort key of the last row on a page"""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        default=str
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode an encode_cursor() value, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_value(column, value: Any) -> Any:
+    """Convert a decoded cursor value back to the column's Python type"""
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def cursor_page(
+    query: Union[Query, Select],
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    limit: int = 20,
+    session: Optional[Session] = None
+) -> Tuple[List, Optional[str]]:
+    """
+    Return up to `limit` rows ordered by (sort_column, id_column) starting
+    after `cursor`, plus the cursor for the next page (None on the last page).
+    `query` is either a legacy Query or a select() of one entity executed
+    with `session`.
+
+    The cursor becomes a row-value predicate such as
+    `(created_at, id) < (:ts, :id)`, which an index on the same columns can
+    seek to directly. Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor)
+            bound = tuple_(_cursor_value(sort_column, sort_value), int(last_id))
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        key = tuple_(sort_column, id_column)
+        query = query.where(key < bound if descending else key > bound)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    query = query.limit(limit + 1)
+    rows = list(query.all() if session is None else session.scalars(query).all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -1,4 +1,8 @@
+from typing import Any, AsyncGenerator, Dict
+
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from app.core.config import settings
@@ -6,6 +10,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _executemany_options(url: str) -> Dict[str, Any]:
+    """
+    Batch executemany for the sync engine: INSERTs go out as multi-row VALUES
+    pages and psycopg2 also batches UPDATE/DELETE executemany via execute_batch.
+    """
+    options: Dict[str, Any] = {"insertmanyvalues_page_size": 1000}
+    if make_url(url).get_driver_name() == "psycopg2":
+        options["executemany_mode"] = "values_plus_batch"
+    return options
+
+
 # Create engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
@@ -15,7 +30,9 @@ engine = create_engine(
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,  # Test connections before using them
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **_executemany_options(settings.DATABASE_URL),
 )
 
 # Add connection pool event listeners for better debugging
@@ -72,4 +89,45 @@ def get_db_with_transaction():
         logger.error(f"Transaction rolled back due to error: {e}")
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# =============================================================================
+# ASYNC ENGINE (asyncpg)
+# =============================================================================
+
+def _async_database_url(url: str):
+    """
+    Derive the asyncpg URL from DATABASE_URL.
+    asyncpg takes `ssl` instead of libpq's `sslmode` query parameter.
+    """
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(async_url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return async_url.set(query=query)
+
+
+# Engine for I/O-bound async endpoints. It has its own, smaller pool on top
+# of the sync one; see the DB_* pool settings for the per-worker budget.
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    echo=settings.DEBUG,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an AsyncSession for `async def` endpoints"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
@@ -16,6 +16,10 @@ from app.routers import (
 )
 from app.db.base import Base
 from app.db.session import engine
+from app.services.reporting import run_rollup_refresher
+from app.services.ratings import run_rating_recalculator
+from app.services.view_counter import run_view_count_flusher
+import asyncio
 import os
 import logging
 import traceback
@@ -127,6 +131,31 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Failed to initialize Redis cache: {e}. Continuing without cache.")
 
+    # Keep the dashboard sales rollup views fresh
+    if settings.SALES_ROLLUPS_ENABLED and engine.dialect.name == "postgresql":
+        app.state.rollup_refresher = asyncio.create_task(
+            run_rollup_refresher(settings.SALES_ROLLUP_REFRESH_SECONDS)
+        )
+
+    # Batch product view counts collected in Redis into the products table
+    if settings.CACHE_ENABLED and settings.REDIS_URL:
+        app.state.view_count_flusher = asyncio.create_task(
+            run_view_count_flusher(settings.VIEW_COUNT_FLUSH_SECONDS)
+        )
+
+    # Correct drift in the product ratings updated per review
+    app.state.rating_recalculator = asyncio.create_task(
+        run_rating_recalculator(settings.RATING_RECALC_SECONDS)
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task_name in ("rollup_refresher", "view_count_flusher", "rating_recalculator"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["Authentication"])
 app.include_router(products.router, prefix=f"{settings.API_V1_STR}", tags=["Products"])
@@ -16,6 +16,8 @@ from sqlalchemy import (
     Numeric,
     String,
     func,
+    literal_column,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship  # type: ignore[attr-defined]
 
@@ -35,6 +37,10 @@ class CartStatus(str, enum.Enum):
     ABANDONED = "abandoned"
 
 
+# Partial-index predicate for the one active cart a user may have
+ACTIVE_CART_PREDICATE = "status = 'active'"
+
+
 class Cart(Base):
     """
     Cart model for grouping cart items.
@@ -70,6 +76,7 @@ class Cart(Base):
     tax_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), default=0)
     discount_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), default=0)
     total: Mapped[Decimal] = mapped_column(Numeric(12, 2), default=0)
+    item_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     # Promo code
     promo_code: Mapped[Optional[str]] = mapped_column(String(50))
@@ -85,6 +92,14 @@ class Cart(Base):
         Index("ix_carts_user_active", "user_id", "status"),
         Index("ix_carts_session_active", "session_id", "status"),
         Index("ix_carts_expires", "expires_at"),
+        # Expiry sweep only ever looks at active carts
+        Index("ix_carts_active_expires", "expires_at", postgresql_where=text(ACTIVE_CART_PREDICATE)),
+        # At most one active cart per user; get_or_create_cart upserts against it
+        Index(
+            "uq_carts_user_active", "user_id", unique=True,
+            postgresql_where=text(ACTIVE_CART_PREDICATE),
+            sqlite_where=text(ACTIVE_CART_PREDICATE),
+        ),
     )
 
     @property
@@ -94,11 +109,6 @@ class Cart(Base):
             return datetime.utcnow() > self.expires_at
         return False
 
-    @property
-    def item_count(self) -> int:
-        """Get total number of items in cart"""
-        return sum(item.quantity for item in self.items) if self.items else 0
-
     def set_expiration(self, hours: int = 72):
         """Set cart expiration time"""
         self.expires_at = datetime.utcnow() + timedelta(hours=hours)
@@ -162,10 +172,6 @@ class CartItem(Base):
         "ProductVariation", lazy="selectin"
     )
 
-    __table_args__ = (
-        Index("ix_cart_items_cart_product", "cart_id", "product_id", "variation_id"),
-    )
-
     @property
     def line_total(self) -> float:
         """Calculate line total for this item"""
@@ -175,3 +181,11 @@ class CartItem(Base):
             else (float(self.product.price) if self.product else 0)
         )
         return price * self.quantity
+
+
+# One line per product and variation in a cart. variation_id is coalesced so
+# lines without a variation conflict too; add_item upserts against this key.
+CART_ITEM_LINE_KEY = [
+    CartItem.cart_id, CartItem.product_id, func.coalesce(CartItem.variation_id, literal_column("0"))
+]
+Index("uq_cart_items_cart_product_variation", *CART_ITEM_LINE_KEY, unique=True)
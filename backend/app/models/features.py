@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
     Column, BigInteger, Integer, String, Text, Boolean, Numeric,
-    ForeignKey, TIMESTAMP, CheckConstraint, UniqueConstraint
+    ForeignKey, TIMESTAMP, CheckConstraint, UniqueConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -30,6 +30,8 @@ class Wishlist(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "product_id", name="uq_wishlist_user_product"),
+        Index("ix_wishlists_user_added_at", "user_id", "added_at"),
+        Index("ix_wishlists_user_notify", "user_id", "notify_on_price_drop"),
     )
 
     user = relationship("User", back_populates="wishlists")
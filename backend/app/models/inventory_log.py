@@ -6,9 +6,11 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship  # type: ignore[attr-defined]
 
@@ -54,5 +56,10 @@ class InventoryLog(Base):
     admin: Mapped[Optional["User"]] = relationship("User", foreign_keys=[admin_id])
     order: Mapped[Optional["Order"]] = relationship("Order", back_populates="inventory_logs")
 
+    __table_args__ = (
+        # Keyset pagination of a product's log history (newest first)
+        Index("ix_inventory_logs_product_id_id", "product_id", text("id DESC")),
+    )
+
     def __repr__(self) -> str:
         return f"<InventoryLog(id={self.id}, product_id={self.product_id}, change={self.change_quantity}, new_stock={self.new_stock})>"
\ No newline at end of file
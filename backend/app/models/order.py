@@ -16,6 +16,7 @@ from sqlalchemy import (
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship  # type: ignore[attr-defined]
 
@@ -338,4 +339,8 @@ class OrderStatusHistory(Base):
 
     # Relationships
     order: Mapped["Order"] = relationship("Order")
-    user: Mapped[Optional["User"]] = relationship("User")
\ No newline at end of file
+    user: Mapped[Optional["User"]] = relationship("User")
+
+
+# Partial index for dashboard aggregates
+Index("ix_orders_paid_created_at", Order.created_at, postgresql_where=text("payment_status = 'paid'"))
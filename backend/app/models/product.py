@@ -15,8 +15,12 @@ from sqlalchemy import (
     Numeric,
     String,
     Text,
+    UniqueConstraint,
     func,
+    literal_column,
+    text,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship  # type: ignore[attr-defined]
 
 from app.db.base import Base
@@ -26,11 +30,15 @@ if TYPE_CHECKING:
     from app.models.inventory_log import InventoryLog
 
 
+_SLUG_INVALID_CHARS = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATORS = re.compile(r"[-\s]+")
+
+
 def generate_slug(name: str) -> str:
     """Generate URL-friendly slug from name"""
     slug = name.lower().strip()
-    slug = re.sub(r"[^\w\s-]", "", slug)
-    slug = re.sub(r"[-\s]+", "-", slug)
+    slug = _SLUG_INVALID_CHARS.sub("", slug)
+    slug = _SLUG_SEPARATORS.sub("-", slug)
     return slug
 
 
@@ -166,6 +174,11 @@ class ProductCategoryAssociation(Base):
         Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True
     )
 
+    __table_args__ = (
+        # The primary key leads with product_id; category filters need the reverse
+        Index("ix_product_category_association_category_product", "category_id", "product_id"),
+    )
+
 
 class ProductImage(Base):
     """Product images with support for multiple images per product"""
@@ -229,7 +242,11 @@ class Review(Base):
 
     __table_args__ = (
         CheckConstraint("rating BETWEEN 1 AND 5", name="rating_check"),
+        # One review per user and product; also serves the duplicate check
+        UniqueConstraint("product_id", "user_id", name="uq_reviews_product_user"),
         Index("ix_reviews_product_rating", "product_id", "rating"),
+        # Keyset pagination of approved reviews, newest first
+        Index("ix_reviews_product_approved_created_id", "product_id", "is_approved", "created_at", "id"),
     )
 
     product: Mapped["Product"] = relationship("Product", back_populates="reviews")
@@ -239,4 +256,29 @@ class Review(Base):
 # Add indexes for performance optimization
 Index("ix_products_is_active", Product.is_active)
 Index("ix_products_created_at", Product.created_at)
-Index("ix_products_is_active_created_at", Product.is_active, Product.created_at)
\ No newline at end of file
+Index("ix_products_is_active_created_at", Product.is_active, Product.created_at)
+# Partial index for low-stock lookups (stock < threshold ORDER BY stock on active products)
+Index("ix_products_active_low_stock", Product.stock, postgresql_where=text("is_active = true"))
+# Multi-brand filter (brand IN (...)) on active products
+Index("ix_products_active_brand", Product.brand, postgresql_where=text("is_active = true"))
+# Keyset pagination of the public product list, one index per sort key
+Index("ix_products_active_created_at_id", Product.is_active, Product.created_at, Product.id)
+Index("ix_products_active_price_id", Product.is_active, Product.price, Product.id)
+Index("ix_products_active_rating_id", Product.is_active, Product.rating, Product.id)
+Index("ix_products_active_name_id", Product.is_active, Product.name, Product.id)
+Index("ix_products_active_view_count_id", Product.is_active, Product.view_count, Product.id)
+# Featured and in-stock listings, newest first
+Index(
+    "ix_products_featured_created_at_id", Product.created_at, Product.id,
+    postgresql_where=text("is_active = true AND is_featured = true")
+)
+Index(
+    "ix_products_in_stock_created_at_id", Product.created_at, Product.id,
+    postgresql_where=text("is_active = true AND stock > 0")
+)
+
+# Weighted full-text vector over name, brand and description. PostgreSQL
+# generates and GIN-indexes it (migration f1a7c3e95b28); it is left unmapped
+# so Base.metadata.create_all() still works on other databases.
+PRODUCT_SEARCH_CONFIG = "english"
+product_search_vector = literal_column("products.search_vector", TSVECTOR)
@@ -0,0 +1,30 @@
+"""
+Reporting Rollups - Read-only mappings for dashboard materialized views.
+
+These views are created by migration and refreshed by
+app.services.reporting. They live on their own MetaData so
+Base.metadata.create_all() never tries to create them as tables.
+"""
+from sqlalchemy import Column, Date, Integer, MetaData, Numeric, String, Table
+
+reporting_metadata = MetaData()
+
+# Paid order count and revenue per calendar day
+sales_daily = Table(
+    "sales_daily",
+    reporting_metadata,
+    Column("day", Date, primary_key=True),
+    Column("order_count", Integer),
+    Column("revenue", Numeric(12, 2)),
+)
+
+# Paid order items, quantity and revenue per category
+category_sales_rollup = Table(
+    "category_sales_rollup",
+    reporting_metadata,
+    Column("category_id", Integer, primary_key=True),
+    Column("name", String(100)),
+    Column("order_count", Integer),
+    Column("items_sold", Integer),
+    Column("revenue", Numeric(12, 2)),
+)
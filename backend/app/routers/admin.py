@@ -6,6 +6,7 @@ from app.models.customer import User, Role
 from app.models.order import Order
 from app.schemas.user import UserOut, UserUpdate
 from app.core.security import get_current_admin_user
+from app.core.cache import invalidate_namespace, DASHBOARD_NAMESPACE
 from sqlalchemy import func, desc
 from decimal import Decimal
 
@@ -235,6 +236,7 @@ def update_admin_order_status(
     
     db.commit()
     db.refresh(order)
+    invalidate_namespace(DASHBOARD_NAMESPACE)
     
     return {"message": "Order status updated", "status": order.status}
 
@@ -262,5 +264,6 @@ def cancel_admin_order(
         order.notes = f"Cancelled: {reason}"
     
     db.commit()
+    invalidate_namespace(DASHBOARD_NAMESPACE)
     
     return {"message": "Order cancelled successfully"}
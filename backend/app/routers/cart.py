@@ -2,20 +2,27 @@
 Cart Router - Shopping cart management endpoints
 Supports both authenticated users and anonymous session carts with intelligent user detection.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Cookie, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Cookie, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from app.db.session import get_db
+from decimal import Decimal
+import asyncio
+import hashlib
+from app.db.session import get_db, get_async_db
 from app.schemas.cart import (
     CartItemCreate, CartItemUpdate, CartResponse, CartItemResponse,
-    CartSummary, ApplyPromoCode, CartMergeRequest
+    CartItemProductInfo, CartItemVariationInfo,
+    CartSummary, ApplyPromoCode, CartMergeRequest, SessionActivity, SessionActivityBatch
 )
 from app.models.cart import Cart, CartItem as CartItemModel
 from app.models.customer import User
+from app.core.cache import cache_delete, etag_matches
 from app.core.security import get_current_user, get_current_user_optional
 from app.services.cart_service import CartService, CartError
 
-router = APIRouter(prefix="/cart", tags=["Cart"])
+router = APIRouter(prefix="/cart", tags=["Cart"], default_response_class=ORJSONResponse)
 
 
 # =============================================================================
@@ -25,6 +32,7 @@ router = APIRouter(prefix="/cart", tags=["Cart"])
 @router.get("/smart", response_model=CartResponse)
 def get_smart_cart(
     request: Request,
+    response: Response,
     session_id: Optional[str] = Cookie(None, alias="cart_session_id"),
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
@@ -47,12 +55,15 @@ def get_smart_cart(
 
         cart = CartService.get_or_create_cart(db, session_id=session_id)
 
+    etag = _cart_etag(cart, include_session_id=not bool(current_user))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     # Validate cart and get warnings
     is_valid, issues = CartService.validate_cart_for_checkout(db, cart)
 
-    response = _build_cart_response(cart, not is_valid, issues, include_session_id=not bool(current_user))
-
-    return response
+    return _build_cart_response(cart, not is_valid, issues, include_session_id=not bool(current_user))
 
 
 @router.post("/smart/items", response_model=CartItemResponse, status_code=status.HTTP_201_CREATED)
@@ -262,15 +273,23 @@ def convert_guest_to_user(
 
 @router.get("", response_model=CartResponse)
 def get_cart(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get current user's cart with items and totals.
     Creates a new cart if one doesn't exist.
+    Answers 304 when If-None-Match carries the current ETag.
     """
     cart = CartService.get_or_create_cart(db, user_id=current_user.id)
     
+    etag = _cart_etag(cart)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     # Validate cart and get warnings
     is_valid, issues = CartService.validate_cart_for_checkout(db, cart)
     
@@ -283,12 +302,7 @@ def get_cart_summary(
     current_user: User = Depends(get_current_user)
 ):
     """Get cart summary with totals"""
-    cart = CartService.get_cart(db, user_id=current_user.id)
-    
-    if not cart:
-        return CartSummary()
-    
-    return CartService.get_cart_summary(db, cart)
+    return CartService.get_cached_cart_summary(db, user_id=current_user.id)
 
 
 @router.post("/items", response_model=CartItemResponse, status_code=status.HTTP_201_CREATED)
@@ -449,11 +463,18 @@ def merge_session_cart(
 @router.get("/session/{session_id}", response_model=CartResponse)
 def get_session_cart(
     session_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Get anonymous session cart"""
     cart = CartService.get_or_create_cart(db, session_id=session_id)
     
+    etag = _cart_etag(cart, include_session_id=True)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     is_valid, issues = CartService.validate_cart_for_checkout(db, cart)
     
     return _build_cart_response(cart, not is_valid, issues, include_session_id=True)
@@ -538,6 +559,32 @@ def generate_session_id():
 # HELPER FUNCTIONS
 # =============================================================================
 
+def _cart_etag(cart: Cart, include_session_id: bool = False) -> str:
+    """
+    Weak ETag over everything a cart response is built from.
+    cart.updated_at is not usable here because every read refreshes the
+    cart expiration, so the ETag covers the stored totals plus the item
+    quantities, prices and stock levels behind the stock warnings.
+    """
+    parts = [
+        cart.id, cart.status, cart.promo_code, include_session_id,
+        cart.subtotal, cart.tax_amount, cart.discount_amount, cart.total, cart.item_count,
+    ]
+    for item in cart.items:
+        product = item.product
+        variation = item.variation
+        parts.extend((
+            item.id, item.quantity, item.unit_price, item.is_reserved,
+            product.updated_at if product else None,
+            product.stock if product else None,
+            product.is_active if product else None,
+            variation.updated_at if variation else None,
+            variation.stock if variation else None,
+        ))
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"cart-{digest}"'
+
+
 def _build_cart_response(cart: Cart, has_issues: bool, issues: list, include_session_id: bool = False) -> CartResponse:
     """Build CartResponse from Cart model"""
     response = CartResponse(
@@ -562,53 +609,60 @@ def _build_cart_response(cart: Cart, has_issues: bool, issues: list, include_ses
 
 
 def _build_cart_item_response(item: CartItemModel) -> CartItemResponse:
-    """Build CartItemResponse from CartItem model"""
-    from app.schemas.cart import CartItemProductInfo, CartItemVariationInfo
-    
+    """
+    Build CartItemResponse from CartItem model.
+    Values come straight from the database, so the embedded schemas are
+    built with model_construct() to skip re-validation.
+    """
+    product = item.product
+    variation = item.variation
+    quantity = item.quantity
+    unit_price = item.unit_price
+
     product_info = None
     variation_info = None
     available_quantity = 0
     in_stock = True
     
-    if item.product:
-        product_info = CartItemProductInfo(
-            id=item.product.id,
-            name=item.product.name,
-            slug=item.product.slug,
-            price=item.product.price,
-            original_price=item.product.original_price,
-            primary_image=item.product.primary_image,
-            stock=item.product.stock,
-            is_active=item.product.is_active,
+    if product:
+        product_stock = product.stock
+        product_info = CartItemProductInfo.model_construct(
+            id=product.id,
+            name=product.name,
+            slug=product.slug,
+            price=product.price,
+            original_price=product.original_price,
+            primary_image=product.primary_image,
+            stock=product_stock,
+            is_active=product.is_active,
         )
-        available_quantity = item.product.stock
-        in_stock = item.product.stock >= item.quantity
-    
-    if item.variation:
-        variation_info = CartItemVariationInfo(
-            id=item.variation.id,
-            name=item.variation.name,
-            value=getattr(item.variation, 'value', None),
-            price_modifier=getattr(item.variation, 'price_modifier', None),
-            stock=item.variation.stock,
+        available_quantity = product_stock
+        in_stock = product_stock >= quantity
+    
+    if variation:
+        variation_stock = variation.stock
+        variation_info = CartItemVariationInfo.model_construct(
+            id=variation.id,
+            name=variation.name,
+            value=getattr(variation, 'value', None),
+            price_modifier=getattr(variation, 'price_modifier', None),
+            stock=variation_stock,
         )
-        if item.variation.stock is not None:
-            available_quantity = item.variation.stock
-            in_stock = item.variation.stock >= item.quantity
+        if variation_stock is not None:
+            available_quantity = variation_stock
+            in_stock = variation_stock >= quantity
     
     # Calculate line total
-    price = float(item.unit_price) if item.unit_price else (
-        float(item.product.price) if item.product else 0
-    )
-    line_total = price * item.quantity
+    price = unit_price if unit_price else (product.price if product else Decimal("0"))
+    line_total = price * quantity
     
-    return CartItemResponse(
+    return CartItemResponse.model_construct(
         id=item.id,
         cart_id=item.cart_id,
         product_id=item.product_id,
         variation_id=item.variation_id,
-        quantity=item.quantity,
-        unit_price=item.unit_price,
+        quantity=quantity,
+        unit_price=unit_price,
         line_total=line_total,
         is_reserved=item.is_reserved,
         reserved_until=item.reserved_until,
@@ -641,22 +695,42 @@ def get_session_product_count(
 
 
 @router.post("/session/{session_id}/track-activity")
-def track_session_activity(
+async def track_session_activity(
     session_id: str,
     product_id: int,
     activity_type: str = "view",  # view, add_to_cart, remove_from_cart, purchase
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Track user activity for a session (product views, cart actions, etc.)
     """
     try:
-        CartService.track_session_activity(db, session_id, product_id, activity_type)
+        activity = SessionActivity(product_id=product_id, activity_type=activity_type)
+        await db.run_sync(CartService.track_session_activities, session_id, [activity])
+        # The session count reports the cart's updated_at as last_activity
+        await asyncio.to_thread(cache_delete, CartService.session_count_key(session_id))
         return {"message": f"Activity '{activity_type}' tracked for session {session_id} and product {product_id}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error tracking session activity: {str(e)}")
 
 
+@router.post("/session/{session_id}/track-activities")
+async def track_session_activities(
+    session_id: str,
+    batch: SessionActivityBatch,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Track several activities for a session in one request and one transaction.
+    """
+    try:
+        await db.run_sync(CartService.track_session_activities, session_id, batch.activities)
+        await asyncio.to_thread(cache_delete, CartService.session_count_key(session_id))
+        return {"message": f"{len(batch.activities)} activities tracked for session {session_id}"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error tracking session activities: {str(e)}")
+
+
 @router.get("/session/{session_id}/statistics", response_model=dict)
 def get_session_statistics(
     session_id: str,
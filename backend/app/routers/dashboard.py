@@ -2,143 +2,148 @@
 Admin Dashboard Router
 Provides dashboard statistics, charts data, and quick overviews for admin panel
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, case
+from sqlalchemy import Float, cast, func, desc, select
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
 from decimal import Decimal
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.models.customer import User
 from app.models.product import Product, Category
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, OrderStatus
 from app.core.security import get_current_admin_user
+from app.core.config import settings
+from app.core.cache import cached, DASHBOARD_NAMESPACE
+from app.core.periods import current_period_bounds
+from app.services import reporting
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+def _scalar_count(model, *criteria):
+    """Uncorrelated COUNT subquery that can ride along in another SELECT"""
+    return select(func.count(model.id)).where(*criteria).correlate(None).scalar_subquery()
 
 
 @router.get("/stats")
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+@cached(DASHBOARD_NAMESPACE, ttl=settings.DASHBOARD_CACHE_TTL)
+async def get_dashboard_stats(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """Get main dashboard statistics"""
-    # Calculate date boundaries
-    today = datetime.now().date()
-    today_start = datetime.combine(today, datetime.min.time())
-    month_start = today.replace(day=1)
-    month_start_dt = datetime.combine(month_start, datetime.min.time())
-    
-    # Get all stats in fewer queries
-    # Basic counts
-    total_users = db.query(func.count(User.id)).scalar() or 0
-    total_products = db.query(func.count(Product.id)).filter(Product.is_active == True).scalar() or 0
-    total_orders = db.query(func.count(Order.id)).scalar() or 0
-    
-    # Revenue queries combined
-    revenue_stats = db.query(
-        func.coalesce(func.sum(Order.total_amount), 0).label('total_revenue'),
-        # Count orders created today
-        func.count(
-            case((Order.created_at >= today_start, Order.id), else_=None)
-        ).label('today_orders'),
-        # Sum revenue for today
-        func.coalesce(
-            func.sum(
-                case((Order.created_at >= today_start, Order.total_amount), else_=0)
-            ),
-            0
-        ).label('today_revenue'),
-        # Count orders for current month
-        func.count(
-            case((Order.created_at >= month_start_dt, Order.id), else_=None)
+    """
+    Get main dashboard statistics.
+    While cached, responses carry an ETag and polls holding it get a 304.
+    """
+    bounds = current_period_bounds()
+
+    paid = Order.payment_status == "paid"
+
+    # All order and catalogue aggregates in a single round trip: one scan of
+    # orders computes the per-status counts and the paid revenue buckets via
+    # FILTER clauses, the user and product counts ride along as scalar
+    # subqueries.
+    stats = (await db.execute(select(
+        _scalar_count(User).label('total_users'),
+        _scalar_count(Product, Product.is_active == True).label('total_products'),
+        _scalar_count(Product, Product.stock < 10, Product.is_active == True).label('low_stock_count'),
+        func.count(Order.id).label('total_orders'),
+        *(
+            func.count(Order.id).filter(Order.status == s.value).label(f'status_{s.value}')
+            for s in OrderStatus
+        ),
+        cast(func.coalesce(func.sum(Order.total_amount).filter(paid), 0), Float).label('total_revenue'),
+        # Paid orders and revenue for current month
+        func.count(Order.id).filter(
+            paid, Order.created_at >= bounds.month_start
         ).label('monthly_orders'),
-        # Sum revenue for current month
-        func.coalesce(
-            func.sum(
-                case((Order.created_at >= month_start_dt, Order.total_amount), else_=0)
+        cast(func.coalesce(
+            func.sum(Order.total_amount).filter(paid, Order.created_at >= bounds.month_start),
+            0
+        ), Float).label('monthly_revenue'),
+        # Paid revenue for last month (growth comparison)
+        cast(func.coalesce(
+            func.sum(Order.total_amount).filter(
+                paid,
+                Order.created_at >= bounds.last_month_start,
+                Order.created_at < bounds.last_month_end
             ),
             0
-        ).label('monthly_revenue')
-    ).filter(Order.payment_status == "paid").first()
-    
-    total_revenue, today_orders, today_revenue, monthly_orders, monthly_revenue = revenue_stats
-    
-    # Pending orders and low stock
-    pending_orders = db.query(func.count(Order.id)).filter(
-        Order.status.in_(["pending", "processing"])
-    ).scalar() or 0
-    
-    low_stock_count = db.query(func.count(Product.id)).filter(
-        Product.stock < 10,
-        Product.is_active == True
-    ).scalar() or 0
-    
-    # Calculate last month revenue for growth comparison
-    last_month_start = (month_start - timedelta(days=1)).replace(day=1)
-    last_month_end = month_start - timedelta(days=1)
-    
-    last_month_revenue = db.query(
-        func.coalesce(func.sum(Order.total_amount), 0)
-    ).filter(
-        Order.created_at >= last_month_start,
-        Order.created_at <= last_month_end,
-        Order.payment_status == "paid"
-    ).scalar() or 0
-    
+        ), Float).label('last_month_revenue')
+    ).select_from(Order))).one()
+
+    total_users = stats.total_users or 0
+    total_products = stats.total_products or 0
+    low_stock_count = stats.low_stock_count or 0
+    total_orders = stats.total_orders or 0
+    total_revenue = stats.total_revenue
+    monthly_orders = stats.monthly_orders
+    monthly_revenue = stats.monthly_revenue
+    last_month_revenue = stats.last_month_revenue or 0
+
     revenue_growth = 0.0
-    if float(last_month_revenue) > 0:
-        revenue_growth = ((float(monthly_revenue) - float(last_month_revenue)) / float(last_month_revenue)) * 100
+    if last_month_revenue > 0:
+        revenue_growth = ((monthly_revenue - last_month_revenue) / last_month_revenue) * 100
     
-    # Status breakdown
+    # Status breakdown (statuses with no orders are omitted)
     status_breakdown = {}
-    status_counts = db.query(Order.status, func.count(Order.id)).group_by(Order.status).all()
-    for status, count in status_counts:
-        status_breakdown[status] = count
+    for s in OrderStatus:
+        count = getattr(stats, f'status_{s.value}')
+        if count:
+            status_breakdown[s.value] = count
+    pending_orders = (
+        status_breakdown.get(OrderStatus.PENDING.value, 0)
+        + status_breakdown.get(OrderStatus.PROCESSING.value, 0)
+    )
     
     # Top products
-    top_products = db.query(
+    top_products = (await db.execute(select(
         Product.id,
         Product.name,
         Product.primary_image,
         func.coalesce(func.sum(OrderItem.quantity), 0).label('total_sold')
     ).join(OrderItem, OrderItem.product_id == Product.id, isouter=True
     ).join(Order, Order.id == OrderItem.order_id, isouter=True
-    ).filter(Product.is_active == True
+    ).where(Product.is_active == True
     ).group_by(Product.id
     ).order_by(desc('total_sold')
-    ).limit(6).all()
+    ).limit(6))).all()
     
     # Recent orders
-    recent_orders = db.query(
+    recent_orders = (await db.execute(select(
         Order.id,
         User.full_name.label('customer_name'),
-        Order.total_amount,
+        cast(Order.total_amount, Float).label('total_amount'),
         Order.status,
         Order.created_at
     ).join(User, User.id == Order.user_id
     ).order_by(desc(Order.created_at)
-    ).limit(5).all()
+    ).limit(5))).all()
     
     # Low stock products
-    low_stock_products = db.query(
+    low_stock_products = (await db.execute(select(
         Product.id,
         Product.name,
         Product.stock
-    ).filter(
+    ).where(
         Product.stock < 10,
         Product.is_active == True
     ).order_by(Product.stock
-    ).limit(5).all()
+    ).limit(5))).all()
     
     return {
         "total_users": total_users,
         "total_products": total_products,
         "total_orders": total_orders,
-        "total_revenue": float(total_revenue),
-        "monthly_revenue": float(monthly_revenue),
-        "last_month_revenue": float(last_month_revenue),
+        "total_revenue": total_revenue,
+        "monthly_revenue": monthly_revenue,
+        "last_month_revenue": last_month_revenue,
         "revenue_growth": revenue_growth,
         "monthly_orders": monthly_orders,
         "status_breakdown": status_breakdown,
@@ -149,14 +154,14 @@ def get_dashboard_stats(
                 "id": p.id,
                 "name": p.name,
                 "primary_image": p.primary_image,
-                "total_sold": int(p.total_sold)
+                "total_sold": p.total_sold
             } for p in top_products
         ],
         "recent_orders": [
             {
                 "id": o.id,
                 "customer_name": o.customer_name,
-                "total_amount": float(o.total_amount),
+                "total_amount": o.total_amount,
                 "status": o.status,
                 "created_at": o.created_at.isoformat()
             } for o in recent_orders
@@ -172,29 +177,18 @@ def get_dashboard_stats(
 
 
 @router.get("/sales")
-def get_sales_data(
+@cached(DASHBOARD_NAMESPACE, ttl=settings.DASHBOARD_CACHE_TTL)
+async def get_sales_data(
     period: str = Query("daily", enum=["daily", "weekly", "monthly"]),
     days: int = Query(30, ge=7, le=365),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get sales data for charts"""
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
+    start_date = current_period_bounds().today_start - timedelta(days=days)
     
-    # Get orders with their dates and amounts
-    orders = db.query(
-        func.date(Order.created_at).label('date'),
-        func.count(Order.id).label('order_count'),
-        func.sum(Order.total_amount).label('revenue')
-    ).filter(
-        Order.created_at >= start_date,
-        Order.payment_status == "paid"
-    ).group_by(
-        func.date(Order.created_at)
-    ).order_by(
-        func.date(Order.created_at)
-    ).all()
+    # Get paid order counts and revenue per day
+    orders = await db.run_sync(reporting.get_daily_sales, start_date.date())
     
     # Format for chart
     sales_data = []
@@ -202,7 +196,7 @@ def get_sales_data(
         sales_data.append({
             "date": order.date.isoformat() if order.date else None,
             "orders": order.order_count or 0,
-            "revenue": float(order.revenue or 0)
+            "revenue": order.revenue or 0
         })
     
     return {
@@ -213,6 +207,7 @@ def get_sales_data(
 
 
 @router.get("/top-products")
+@cached(DASHBOARD_NAMESPACE, ttl=settings.DASHBOARD_CACHE_TTL)
 def get_top_products(
     limit: int = Query(5, ge=1, le=20),
     db: Session = Depends(get_db),
@@ -224,11 +219,11 @@ def get_top_products(
         top_products = db.query(
             Product.id,
             Product.name,
-            Product.price,
+            cast(Product.price, Float).label('price'),
             Product.stock,
             Product.primary_image,
             func.coalesce(func.sum(OrderItem.quantity), 0).label('total_sold'),
-            func.coalesce(func.sum(OrderItem.quantity * OrderItem.price), 0).label('total_revenue')
+            cast(func.coalesce(func.sum(OrderItem.quantity * OrderItem.price), 0), Float).label('total_revenue')
         ).outerjoin(
             OrderItem, OrderItem.product_id == Product.id
         ).outerjoin(
@@ -245,11 +240,11 @@ def get_top_products(
             {
                 "id": p.id,
                 "name": p.name,
-                "price": float(p.price) if p.price else 0,
+                "price": p.price or 0,
                 "stock": p.stock or 0,
                 "image": p.primary_image,
-                "total_sold": int(p.total_sold or 0),
-                "revenue": float(p.total_revenue or 0)
+                "total_sold": p.total_sold or 0,
+                "revenue": p.total_revenue or 0
             }
             for p in top_products
         ]
@@ -273,49 +268,22 @@ def get_top_products(
 
 
 @router.get("/category-sales")
+@cached(DASHBOARD_NAMESPACE, ttl=settings.DASHBOARD_CACHE_TTL)
 def get_category_sales(
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get sales by category"""
     try:
-        from app.models.product import ProductCategoryAssociation
-        
-        # Single query to get all category sales data
-        category_sales = db.query(
-            Category.id,
-            Category.name,
-            func.count(OrderItem.id).label('order_count'),
-            func.coalesce(func.sum(OrderItem.quantity), 0).label('items_sold'),
-            func.coalesce(func.sum(OrderItem.quantity * OrderItem.price), 0).label('revenue')
-        ).outerjoin(
-            ProductCategoryAssociation,
-            ProductCategoryAssociation.category_id == Category.id
-        ).outerjoin(
-            Product,
-            Product.id == ProductCategoryAssociation.product_id
-        ).outerjoin(
-            OrderItem,
-            OrderItem.product_id == Product.id
-        ).outerjoin(
-            Order,
-            Order.id == OrderItem.order_id
-        ).filter(
-            Order.payment_status == "paid"
-        ).group_by(
-            Category.id,
-            Category.name
-        ).order_by(
-            desc('revenue')
-        ).all()
+        category_sales = reporting.get_category_sales(db)
         
         return [
             {
                 "id": cat.id,
                 "name": cat.name,
                 "order_count": cat.order_count,
-                "items_sold": int(cat.items_sold),
-                "revenue": float(cat.revenue)
+                "items_sold": cat.items_sold,
+                "revenue": cat.revenue
             }
             for cat in category_sales
         ]
@@ -341,7 +309,19 @@ def get_recent_orders(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get recent orders for dashboard"""
-    orders = db.query(Order).order_by(
+    orders = db.query(
+        Order.id,
+        Order.order_number,
+        Order.user_id,
+        User.full_name.label('customer_name'),
+        User.email.label('customer_email'),
+        cast(Order.total_amount, Float).label('total_amount'),
+        Order.status,
+        Order.payment_status,
+        Order.created_at
+    ).outerjoin(
+        User, User.id == Order.user_id
+    ).order_by(
         desc(Order.created_at)
     ).limit(limit).all()
     
@@ -349,12 +329,12 @@ def get_recent_orders(
         {
             "id": order.id,
             "order_number": order.order_number,
-            "customer_name": order.guest_name or (order.user.full_name if order.user else "Guest"),
-            "customer_email": order.guest_email or (order.user.email if order.user else None),
-            "total_amount": float(order.total_amount),
+            "customer_name": order.customer_name if order.user_id else "Guest",
+            "customer_email": order.customer_email,
+            "total_amount": order.total_amount,
             "status": order.status,
             "payment_status": order.payment_status,
-            "created_at": order.created_at.isoformat() if order.created_at else None
+            "created_at": order.created_at
         }
         for order in orders
     ]
@@ -368,7 +348,14 @@ def get_low_stock_products(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Get products with low stock"""
-    products = db.query(Product).filter(
+    products = db.query(
+        Product.id,
+        Product.name,
+        Product.sku,
+        Product.stock,
+        cast(Product.price, Float).label('price'),
+        Product.primary_image
+    ).filter(
         Product.stock < threshold,
         Product.is_active == True
     ).order_by(
@@ -381,7 +368,7 @@ def get_low_stock_products(
             "name": p.name,
             "sku": p.sku,
             "stock": p.stock,
-            "price": float(p.price),
+            "price": p.price,
             "image": p.primary_image
         }
         for p in products
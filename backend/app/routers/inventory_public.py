@@ -3,10 +3,10 @@ Public Inventory endpoints
 """
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, joinedload
 
 from app.dependencies import get_db
+from app.db.pagination import keyset_page
 from app.models.product import Product
 from app.models.inventory_log import InventoryLog
 
@@ -16,6 +16,7 @@ router = APIRouter(tags=["inventory"])
 @router.get("/logs")
 def get_inventory_logs(
     product_id: Optional[int] = None,
+    before_id: Optional[int] = None,
     limit: int = 50,
     db: Session = Depends(get_db)
 ):
@@ -24,18 +25,23 @@ def get_inventory_logs(
 
     Optional filters:
     - product_id: Filter by specific product
+    - before_id: Return logs older than this log id (keyset pagination);
+      pass the previous page's `next_before_id` to fetch the next page
     - limit: Number of logs to return (default: 50)
     """
-    query = db.query(InventoryLog)
+    query = db.query(InventoryLog).options(
+        joinedload(InventoryLog.product),
+        joinedload(InventoryLog.admin)
+    )
 
     if product_id:
         query = query.filter(InventoryLog.product_id == product_id)
 
-    total = query.count()
-    logs = query.order_by(desc(InventoryLog.created_at)).limit(limit).all()
+    logs, has_more = keyset_page(query, InventoryLog.id, before=before_id, limit=limit)
 
     return {
-        "total": total,
+        "has_more": has_more,
+        "next_before_id": logs[-1].id if has_more else None,
         "logs": [
             {
                 "id": log.id,
@@ -67,7 +73,14 @@ def get_low_stock_products(
     - threshold: Stock level to consider "low" (default: 10)
     - limit: Maximum number of products to return (default: 10)
     """
-    products = db.query(Product).filter(
+    products = db.query(
+        Product.id,
+        Product.name,
+        Product.sku,
+        Product.stock,
+        Product.primary_image,
+        Product.price
+    ).filter(
         Product.stock < threshold,
         Product.is_active == True
     ).order_by(Product.stock).limit(limit).all()
@@ -11,6 +11,7 @@ from app.db.session import get_db
 from app.models.customer import User
 from app.models.order import OrderStatus, PaymentStatus
 from app.core.security import get_current_user, get_current_admin_user
+from app.core.cache import invalidate_namespace, DASHBOARD_NAMESPACE
 from app.schemas.order import (
     OrderCreate, OrderFromCart, GuestOrderCreate,
     OrderResponse, OrderListResponse, OrderSummary,
@@ -45,6 +46,7 @@ def create_order(
     """
     try:
         order = OrderService.create_order_from_cart(db, current_user, order_data)
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return _build_order_response(order)
     except OrderError as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -86,6 +88,7 @@ def create_direct_order(
         )
         
         order = OrderService.create_order_from_cart(db, current_user, order_from_cart)
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return _build_order_response(order)
     except OrderError as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -153,6 +156,7 @@ def cancel_order(
         order = OrderService.cancel_order(
             db, order_id, current_user.id, reason, is_admin=False
         )
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return _build_order_response(order)
     except OrderError as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -195,6 +199,7 @@ def create_guest_order(
     """
     try:
         order = OrderService.create_guest_order(db, order_data)
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return {
             "order_id": order.id,
             "order_number": order.order_number,
@@ -296,6 +301,7 @@ def update_order_status(
         order = OrderService.update_order_status(
             db, order_id, status_update.status.value, admin_user.id, status_update.notes
         )
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return _build_order_response(order)
     except OrderError as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -314,6 +320,7 @@ def update_payment_status(
             db, order_id, payment_update.payment_status.value,
             payment_update.transaction_id, admin_user.id
         )
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return _build_order_response(order)
     except OrderError as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -353,6 +360,7 @@ def admin_cancel_order(
         order = OrderService.cancel_order(
             db, order_id, admin_user.id, reason, is_admin=True
         )
+        invalidate_namespace(DASHBOARD_NAMESPACE)
         return _build_order_response(order)
     except OrderError as e:
         raise HTTPException(status_code=e.status_code, detail=e.message)
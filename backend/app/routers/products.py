@@ -3,11 +3,18 @@ Product Router
 Complete product management endpoints with CRUD operations, image upload, and search.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, UploadFile, File, Form, status
 # from fastapi_cache.decorator import cache
+from sqlalchemy import and_, exists, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
-from app.db.session import get_db
+from app.core.cache import cached, invalidate_namespace, PRODUCTS_NAMESPACE
+from app.core.config import settings
+from app.core.rate_limit import user_write_rate_limiter
+from app.db.session import get_db, get_async_db
+from app.db.pagination import cursor_page
 from app.models.customer import User
 from app.models.product import Product as ProductModel, Category as CategoryModel, ProductImage as ProductImageModel, Review as ReviewModel
 from app.core.security import get_current_user, get_current_admin_user
@@ -18,12 +25,38 @@ from app.schemas.product import (
     ProductImage, ProductImageCreate,
     StockUpdateRequest
 )
-from app.services import product_service
+from app.services import product_service, ratings, view_counter
 from app.services.upload import save_product_image, delete_product_images, MAX_IMAGES_PER_PRODUCT
 
 
 router = APIRouter()
 
+# Homepage listings are read-heavy and slow-changing; cache them briefly and
+# drop them whenever an admin changes a product. Entries are stored as
+# ProductSimple JSON, so hits are sent as-is.
+_cached_listing = cached(
+    PRODUCTS_NAMESPACE,
+    ttl=settings.PRODUCT_CACHE_TTL,
+    jitter=settings.PRODUCT_CACHE_TTL_JITTER,
+    lock=True,
+    raw=True
+)
+
+# The hottest few (keyed only by limit) are also kept in each worker
+_cached_homepage_listing = cached(
+    PRODUCTS_NAMESPACE,
+    ttl=settings.PRODUCT_CACHE_TTL,
+    jitter=settings.PRODUCT_CACHE_TTL_JITTER,
+    lock=True,
+    local_ttl=settings.PRODUCT_LOCAL_CACHE_TTL,
+    raw=True
+)
+
+
+def _simple_list(products) -> List[ProductSimple]:
+    """Validate ORM products into the listing schema so they can be cached"""
+    return [ProductSimple.model_validate(p) for p in products]
+
 
 # =============================================================================
 # PUBLIC PRODUCT ENDPOINTS
@@ -31,8 +64,8 @@ router = APIRouter()
 
 @router.get("/products", response_model=ProductListResponse)
 # @cache(expire=300)  # Cache for 5 minutes
-def list_products(
-    page: int = Query(1, ge=1, description="Page number"),
+async def list_products(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, max_length=100, description="Search in name, description, brand"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
@@ -42,11 +75,17 @@ def list_products(
     is_featured: Optional[bool] = Query(None, description="Filter featured products"),
     in_stock: Optional[bool] = Query(None, description="Filter by stock availability"),
     min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum rating"),
-    sort_by: str = Query("created_at", pattern="^(price|rating|created_at|name|view_count)$"),
+    sort_by: str = Query("created_at", pattern="^(price|rating|created_at|name|view_count|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get paginated list of products with filtering and sorting. Public endpoint."""
+    """
+    Get paginated list of products with filtering and sorting. Public endpoint.
+    Uses keyset pagination: pass meta.next_cursor back as `cursor` for the next page.
+    With `search`, sort_by=relevance orders by full-text rank.
+    Runs on the async engine, so a request waiting on the database does not
+    hold a threadpool worker.
+    """
     filters = ProductFilter(
         search=search,
         category_id=category_id,
@@ -60,88 +99,132 @@ def list_products(
         sort_order=sort_order,
         is_active=True
     )
-    return product_service.get_products_paginated(db, page, per_page, filters)
+    try:
+        # The service's sync query code runs on the AsyncSession's connection
+        return await db.run_sync(product_service.get_products_by_cursor, cursor, per_page, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/products/featured", response_model=List[ProductSimple])
+@_cached_homepage_listing
 def get_featured_products(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
     """Get featured products for homepage"""
-    return product_service.get_featured_products(db, limit)
+    return _simple_list(product_service.get_featured_products(db, limit))
 
 
 @router.get("/products/new-arrivals", response_model=List[ProductSimple])
+@_cached_homepage_listing
 def get_new_arrivals(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
     """Get newest products"""
-    return product_service.get_new_arrivals(db, limit)
+    return _simple_list(product_service.get_new_arrivals(db, limit))
 
 
 @router.get("/products/bestsellers", response_model=List[ProductSimple])
+@_cached_homepage_listing
 def get_bestsellers(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
     """Get best-selling products"""
-    return product_service.get_bestsellers(db, limit)
+    return _simple_list(product_service.get_bestsellers(db, limit))
 
 
 @router.get("/products/{product_id}", response_model=ProductDetail)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(
+    product_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Get a single product by ID with full details"""
     product = product_service.get_product_by_id(db, product_id)
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    product_service.increment_view_count(db, product_id)
+    _record_view(product.id, background_tasks)
     return product
 
 
 @router.get("/products/slug/{slug}", response_model=ProductDetail)
-def get_product_by_slug(slug: str, db: Session = Depends(get_db)):
+def get_product_by_slug(
+    slug: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Get a single product by slug"""
     product = product_service.get_product_by_slug(db, slug)
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    product_service.increment_view_count(db, product.id)
+    _record_view(product.id, background_tasks)
     return product
 
 
+def _record_view(product_id: int, background_tasks: BackgroundTasks) -> None:
+    """Count a product view off the request path (Redis batch, else after the response)"""
+    if not view_counter.record_product_view(product_id):
+        background_tasks.add_task(view_counter.increment_view_count_in_background, product_id)
+
+
 @router.get("/products/{product_id}/related", response_model=List[ProductSimple])
+@_cached_listing
 def get_related_products(
     product_id: int,
     limit: int = Query(4, ge=1, le=20),
     db: Session = Depends(get_db)
 ):
     """Get related products based on categories"""
-    return product_service.get_related_products(db, product_id, limit)
+    return _simple_list(product_service.get_related_products(db, product_id, limit))
 
 
 @router.get("/products/{product_id}/reviews", response_model=List[Review])
 def get_product_reviews(
     product_id: int,
-    page: int = Query(1, ge=1),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     per_page: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
-    """Get reviews for a product"""
-    product = product_service.get_product_by_id(db, product_id)
-    if not product:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    offset = (page - 1) * per_page
-    reviews = db.query(ReviewModel).options(
+    """
+    Get reviews for a product, newest first.
+    When more reviews exist, the X-Next-Cursor header carries the cursor
+    for the next page.
+    """
+    # Joining the product doubles as the existence check: rows come back
+    # only for an active product
+    stmt = select(ReviewModel).join(
+        ProductModel,
+        and_(ProductModel.id == ReviewModel.product_id, ProductModel.is_active == True)
+    ).options(
         joinedload(ReviewModel.user)
-    ).filter(
+    ).where(
         ReviewModel.product_id == product_id,
         ReviewModel.is_approved == True
-    ).order_by(ReviewModel.created_at.desc()).offset(offset).limit(per_page).all()
+    )
+    try:
+        reviews, next_cursor = cursor_page(
+            stmt, ReviewModel.created_at, ReviewModel.id, cursor=cursor, limit=per_page, session=db
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # An empty page needs the separate check to tell "no reviews" from 404
+    if not reviews and not product_service.product_exists(db, product_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return reviews
 
 
-@router.post("/products/{product_id}/reviews", response_model=Review, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/products/{product_id}/reviews",
+    response_model=Review,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(user_write_rate_limiter)]
+)
 def create_review(
     product_id: int,
     review_data: ReviewCreate,
@@ -149,19 +232,28 @@ def create_review(
     current_user: User = Depends(get_current_user)
 ):
     """Create a review for a product (authenticated users only)"""
-    product = product_service.get_product_by_id(db, product_id)
-    if not product:
+    # Product and duplicate checks in a single round trip
+    product_found, already_reviewed = db.execute(select(
+        exists().where(ProductModel.id == product_id, ProductModel.is_active == True),
+        exists().where(ReviewModel.product_id == product_id, ReviewModel.user_id == current_user.id)
+    )).one()
+    if not product_found:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    existing = db.query(ReviewModel).filter(
-        ReviewModel.product_id == product_id,
-        ReviewModel.user_id == current_user.id
-    ).first()
-    if existing:
+    if already_reviewed:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You have already reviewed this product")
     review = ReviewModel(product_id=product_id, user_id=current_user.id, **review_data.model_dump())
     db.add(review)
-    db.commit()
-    product_service.update_product_rating(db, product_id)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A concurrent request from the same user got there first
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You have already reviewed this product")
+    # Commits the review together with the product's updated rating
+    if review.is_approved:
+        ratings.add_review_to_rating(db, product_id, review.rating)
+    else:
+        db.commit()
     db.refresh(review)
     return review
 
@@ -182,9 +274,11 @@ def create_product_simple(
     SKU is auto-generated.
     """
     try:
-        return product_service.create_product_simple(db, product_data)
+        product = product_service.create_product_simple(db, product_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    invalidate_namespace(PRODUCTS_NAMESPACE)
+    return product
 
 
 @router.post("/admin/products", response_model=Product, status_code=status.HTTP_201_CREATED)
@@ -195,9 +289,11 @@ def create_product(
 ):
     """Create a new product (Admin only)"""
     try:
-        return product_service.create_product(db, product_data)
+        product = product_service.create_product(db, product_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    invalidate_namespace(PRODUCTS_NAMESPACE)
+    return product
 
 
 @router.put("/admin/products/{product_id}", response_model=Product)
@@ -211,6 +307,7 @@ def update_product(
     product = product_service.update_product(db, product_id, product_data)
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    invalidate_namespace(PRODUCTS_NAMESPACE)
     return product
 
 
@@ -225,11 +322,13 @@ def delete_product(
     success = product_service.hard_delete_product(db, product_id) if hard_delete else product_service.delete_product(db, product_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    invalidate_namespace(PRODUCTS_NAMESPACE)
 
 
 @router.get("/admin/products", response_model=ProductListResponse)
 def admin_list_products(
     page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
     per_page: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     category_id: Optional[int] = None,
@@ -246,7 +345,10 @@ def admin_list_products(
         search=search, category_id=category_id, is_active=is_active,
         is_featured=is_featured, in_stock=in_stock, sort_by=sort_by, sort_order=sort_order
     )
-    return product_service.get_products_paginated(db, page, per_page, filters)
+    try:
+        return product_service.get_products_paginated(db, page, per_page, filters, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 # =============================================================================
@@ -280,6 +382,7 @@ async def upload_product_image(
         db=db, product_id=product_id, image_url=result.image_url,
         alt_text=alt_text or file.filename, is_primary=set_as_primary
     )
+    invalidate_namespace(PRODUCTS_NAMESPACE)
     return image
 
 
@@ -295,6 +398,7 @@ def delete_image(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
     # result is image_url string - delete the file
     delete_product_images(result, None)
+    invalidate_namespace(PRODUCTS_NAMESPACE)
 
 
 @router.patch("/admin/products/{product_id}/images/{image_id}/primary", status_code=status.HTTP_200_OK)
@@ -307,6 +411,7 @@ def set_primary_image(
     """Set an image as the primary image (Admin only)"""
     if not product_service.set_primary_image(db, product_id, image_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    invalidate_namespace(PRODUCTS_NAMESPACE)
     return {"message": "Primary image updated"}
 
 
@@ -326,6 +431,7 @@ def update_stock(
         product = product_service.update_stock(db, product_id, stock_update.quantity, stock_update.reason)
         if not product:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        invalidate_namespace(PRODUCTS_NAMESPACE)
         return product
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
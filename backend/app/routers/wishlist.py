@@ -5,58 +5,81 @@ CRUD endpoints for user wishlists with price tracking.
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import delete, exists, literal, select, true, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.db.session import get_db
 from app.models.customer import User
 from app.models.product import Product
 from app.models.features import Wishlist
 from app.schemas.features import WishlistItem, WishlistItemCreate, WishlistResponse
+from app.core.rate_limit import user_write_rate_limiter
 from app.core.security import get_current_user
 
 router = APIRouter(tags=["wishlist"])
 
+# Columns serialized by WishlistItem
+WISHLIST_ITEM_COLUMNS = (
+    Wishlist.id,
+    Wishlist.user_id,
+    Wishlist.product_id,
+    Wishlist.added_at,
+    Wishlist.price_at_addition,
+    Wishlist.notify_on_price_drop,
+)
+
 
 @router.get("", response_model=WishlistResponse)
 def get_wishlist(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get current user's wishlist"""
-    items = db.query(Wishlist).filter(Wishlist.user_id == current_user.id).all()
-    # Convert ORM objects to Pydantic via from_attributes
+    """Get current user's wishlist, most recently added first"""
+    # Project only the serialized columns; rows convert via from_attributes
+    items = db.execute(
+        select(*WISHLIST_ITEM_COLUMNS)
+        .where(Wishlist.user_id == current_user.id)
+        .order_by(Wishlist.added_at.desc())
+    ).all()
     return WishlistResponse(items=items, total=len(items))  # type: ignore[arg-type]
 
 
-@router.post("/{product_id}", response_model=WishlistItem, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{product_id}",
+    response_model=WishlistItem,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(user_write_rate_limiter)]
+)
 def add_to_wishlist(
     product_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Add a product to wishlist"""
-    # Check product exists
-    product = db.query(Product).filter(Product.id == product_id, Product.is_active == True).first()
-    if not product:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-
-    # Check if already in wishlist
-    existing = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.id,
-        Wishlist.product_id == product_id
-    ).first()
-    if existing:
+    # Validate the product, snapshot its price and insert in one statement;
+    # the unique (user_id, product_id) constraint absorbs duplicates.
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(Wishlist).from_select(
+        ["user_id", "product_id", "price_at_addition", "notify_on_price_drop"],
+        select(
+            literal(current_user.id), Product.id, Product.price, true()
+        ).where(Product.id == product_id, Product.is_active == True),
+    ).on_conflict_do_nothing(
+        index_elements=["user_id", "product_id"]
+    ).returning(*WISHLIST_ITEM_COLUMNS)
+
+    wishlist_item = db.execute(stmt).first()
+    if wishlist_item is None:
+        # Nothing inserted: either no such product or it is already listed
+        product_exists = db.execute(
+            select(exists().where(Product.id == product_id, Product.is_active == True))
+        ).scalar()
+        if not product_exists:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Product already in wishlist")
 
-    wishlist_item = Wishlist(
-        user_id=current_user.id,
-        product_id=product_id,
-        price_at_addition=product.price,
-        notify_on_price_drop=True,
-    )
-    db.add(wishlist_item)
     db.commit()
-    db.refresh(wishlist_item)
     return wishlist_item
 
 
@@ -67,14 +90,14 @@ def remove_from_wishlist(
     current_user: User = Depends(get_current_user),
 ):
     """Remove a product from wishlist"""
-    item = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.id,
-        Wishlist.product_id == product_id
-    ).first()
-    if not item:
+    result = db.execute(
+        delete(Wishlist).where(
+            Wishlist.user_id == current_user.id,
+            Wishlist.product_id == product_id
+        )
+    )
+    if not result.rowcount:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not in wishlist")
-
-    db.delete(item)
     db.commit()
 
 
@@ -84,20 +107,23 @@ def get_price_drops(
     current_user: User = Depends(get_current_user),
 ):
     """Get wishlist items where price has dropped"""
-    items = (
-        db.query(Wishlist)
-        .join(Product)
-        .filter(
+    items = db.execute(
+        select(*WISHLIST_ITEM_COLUMNS)
+        .join(Product, Product.id == Wishlist.product_id)
+        .where(
             Wishlist.user_id == current_user.id,
             Wishlist.notify_on_price_drop == True,
             Product.price < Wishlist.price_at_addition,
         )
-        .all()
-    )
+    ).all()
     return items
 
 
-@router.patch("/{product_id}/notify", response_model=WishlistItem)
+@router.patch(
+    "/{product_id}/notify",
+    response_model=WishlistItem,
+    dependencies=[Depends(user_write_rate_limiter)]
+)
 def toggle_price_notification(
     product_id: int,
     notify: bool,
@@ -105,14 +131,16 @@ def toggle_price_notification(
     current_user: User = Depends(get_current_user),
 ):
     """Toggle price drop notification for wishlist item"""
-    item = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.id,
-        Wishlist.product_id == product_id
+    item = db.execute(
+        update(Wishlist)
+        .where(
+            Wishlist.user_id == current_user.id,
+            Wishlist.product_id == product_id
+        )
+        .values(notify_on_price_drop=notify)
+        .returning(*WISHLIST_ITEM_COLUMNS)
     ).first()
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not in wishlist")
-
-    setattr(item, 'notify_on_price_drop', notify)
     db.commit()
-    db.refresh(item)
     return item
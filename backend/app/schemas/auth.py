@@ -5,7 +5,6 @@ Pydantic models for authentication requests and responses
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
-import re
 
 from app.models.customer import Role
 
@@ -14,6 +13,30 @@ from app.models.customer import Role
 # PASSWORD VALIDATION
 # =============================================================================
 
+PASSWORD_SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Character classes a password must contain, tracked as bit flags
+_HAS_UPPER = 1
+_HAS_LOWER = 2
+_HAS_DIGIT = 4
+_HAS_SPECIAL = 8
+
+
+def _password_character_classes(password: str) -> int:
+    """Bit flags for the required character classes present, in one pass"""
+    flags = 0
+    for ch in password:
+        if "A" <= ch <= "Z":
+            flags |= _HAS_UPPER
+        elif "a" <= ch <= "z":
+            flags |= _HAS_LOWER
+        elif ch.isdecimal():
+            flags |= _HAS_DIGIT
+        elif ch in PASSWORD_SPECIAL_CHARACTERS:
+            flags |= _HAS_SPECIAL
+    return flags
+
+
 def validate_password_strength(password: str) -> str:
     """
     Validate password meets security requirements:
@@ -25,13 +48,14 @@ def validate_password_strength(password: str) -> str:
     """
     if len(password) < 8:
         raise ValueError("Password must be at least 8 characters long")
-    if not re.search(r"[A-Z]", password):
+    flags = _password_character_classes(password)
+    if not flags & _HAS_UPPER:
         raise ValueError("Password must contain at least one uppercase letter")
-    if not re.search(r"[a-z]", password):
+    if not flags & _HAS_LOWER:
         raise ValueError("Password must contain at least one lowercase letter")
-    if not re.search(r"\d", password):
+    if not flags & _HAS_DIGIT:
         raise ValueError("Password must contain at least one digit")
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+    if not flags & _HAS_SPECIAL:
         raise ValueError("Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)")
     return password
 
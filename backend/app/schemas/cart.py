@@ -168,6 +168,21 @@ class SessionCartItemAdd(BaseModel):
     quantity: int = Field(ge=1, le=10, default=1)
 
 
+# Most activities accepted in one track-activities request
+MAX_TRACKED_ACTIVITIES = 1000
+
+
+class SessionActivity(BaseModel):
+    """One product activity in a session (view, add_to_cart, remove_from_cart, purchase)"""
+    product_id: int
+    activity_type: str = "view"
+
+
+class SessionActivityBatch(BaseModel):
+    """Session activities tracked together in one request"""
+    activities: List[SessionActivity] = Field(min_length=1, max_length=MAX_TRACKED_ACTIVITIES)
+
+
 # =============================================================================
 # BACKWARD COMPATIBILITY - Legacy schemas
 # =============================================================================
@@ -5,6 +5,8 @@ from datetime import datetime
 from decimal import Decimal
 import re
 
+SKU_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
 
 # =============================================================================
 # PRODUCT IMAGE SCHEMAS
@@ -186,7 +188,7 @@ class ProductCreate(ProductBase):
     
     @validator('sku')
     def validate_sku(cls, v):
-        if not re.match(r'^[A-Za-z0-9_-]+$', v):
+        if not SKU_PATTERN.match(v):
             raise ValueError('SKU can only contain letters, numbers, underscores, and hyphens')
         return v.upper()
     
@@ -306,13 +308,17 @@ class ProductDetail(Product):
 # =============================================================================
 
 class PaginationMeta(BaseModel):
-    """Pagination metadata"""
-    total: int
-    page: int
+    """
+    Pagination metadata.
+    Offset pages fill total/page/total_pages; cursor pages fill next_cursor.
+    """
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 class ProductListResponse(BaseModel):
@@ -338,13 +344,13 @@ class ProductFilter(BaseModel):
     category_ids: Optional[List[int]] = None
     brand: Optional[str] = None
     brands: Optional[List[str]] = None
-    min_price: Optional[Decimal] = Field(None, ge=0)
-    max_price: Optional[Decimal] = Field(None, ge=0)
+    min_price: Optional[Decimal] = Field(default=None, ge=0)
+    max_price: Optional[Decimal] = Field(default=None, ge=0)
     is_featured: Optional[bool] = None
     is_active: Optional[bool] = True
     in_stock: Optional[bool] = None
-    min_rating: Optional[Decimal] = Field(None, ge=0, le=5)
-    sort_by: str = Field(default="created_at", pattern="^(price|rating|created_at|name|view_count)$")
+    min_rating: Optional[Decimal] = Field(default=None, ge=0, le=5)
+    sort_by: str = Field(default="created_at", pattern="^(price|rating|created_at|name|view_count|relevance)$")
     sort_order: str = Field(default="desc", pattern="^(asc|desc)$")
 
 
@@ -1,20 +1,23 @@
 """
 Cart Service - Business logic for shopping cart operations
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, or_, func, insert, lambda_stmt, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import HTTPException, status
 from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 import uuid
 
-from app.models.cart import Cart, CartItem, CartStatus
+from app.core.cache import CART_NAMESPACE, cache_delete, cache_get, cache_set, make_key
+from app.core.config import settings
+from app.models.cart import ACTIVE_CART_PREDICATE, CART_ITEM_LINE_KEY, Cart, CartItem, CartStatus
 from app.models.product import Product, ProductVariation
 from app.models.customer import User
 from app.schemas.cart import (
     CartItemCreate, CartItemUpdate, CartResponse, 
-    CartItemResponse, CartSummary
+    CartItemResponse, CartSummary, SessionActivity
 )
 
 
@@ -35,6 +38,135 @@ class CartService:
     TAX_RATE = Decimal("0.18")  # 18% VAT
     FREE_SHIPPING_THRESHOLD = Decimal("50000")  # Free shipping over 50,000
     SHIPPING_COST = Decimal("5000")  # Default shipping cost
+    _ZERO = Decimal("0")  # Shared zero amount; Decimal is immutable
+    CLEANUP_BATCH_SIZE = 1000  # Carts expired per transaction
+    
+    @staticmethod
+    def _cart_options() -> tuple:
+        """
+        Load a cart's items with their product and variation in the cart query
+        itself. The product's own collections (images, categories, variations)
+        are not needed for cart pages and load lazily if touched.
+        """
+        items = joinedload(Cart.items)
+        return (
+            items.joinedload(CartItem.product).lazyload("*"),
+            items.joinedload(CartItem.variation),
+        )
+    
+    @classmethod
+    def _active_cart(
+        cls,
+        db: Session,
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None,
+        cart_id: Optional[int] = None
+    ) -> Optional[Cart]:
+        """
+        Active cart for a user, session or cart id, with items preloaded.
+        Built as a lambda statement: after the first call SQLAlchemy reuses
+        the statement and its compiled SQL and only binds the new values.
+        """
+        options = cls._cart_options()
+        stmt = lambda_stmt(
+            lambda: select(Cart).options(*options).where(Cart.status == CartStatus.ACTIVE.value).limit(1)
+        )
+        if user_id is not None:
+            stmt += lambda s: s.where(Cart.user_id == user_id)
+        if session_id is not None:
+            stmt += lambda s: s.where(Cart.session_id == session_id)
+        if cart_id is not None:
+            stmt += lambda s: s.where(Cart.id == cart_id)
+        return db.execute(stmt).unique().scalar_one_or_none()
+    
+    @staticmethod
+    def _owner_params(user_id: Optional[int] = None, session_id: Optional[str] = None) -> dict:
+        """Cache key parameters identifying a cart's owner"""
+        return {"user": user_id} if user_id else {"session": session_id}
+    
+    @classmethod
+    def _invalidate_cart_cache(cls, cart: Cart) -> None:
+        """
+        Drop cached summary and session counts for a cart's owner, and the
+        session -> cart mapping once the cart is no longer active.
+        """
+        keys = [make_key(CART_NAMESPACE, "summary", cls._owner_params(cart.user_id, cart.session_id))]
+        if cart.session_id:
+            keys.append(cls.session_count_key(cart.session_id))
+            if cart.status != CartStatus.ACTIVE.value:
+                keys.append(cls._session_cart_key(cart.session_id))
+        cache_delete(*keys)
+    
+    @staticmethod
+    def session_count_key(session_id: str) -> str:
+        """Cache key of a session's product count statistics"""
+        return make_key(CART_NAMESPACE, "session-count", {"session": session_id})
+    
+    @staticmethod
+    def _session_cart_key(session_id: str) -> str:
+        """Cache key mapping a session id to its active cart id"""
+        return make_key(CART_NAMESPACE, "session-cart", {"session": session_id})
+    
+    @classmethod
+    def _remember_session_cart(cls, cart: Cart) -> None:
+        """Cache the session id -> cart id mapping for an active session cart"""
+        if cart.session_id:
+            cache_set(
+                cls._session_cart_key(cart.session_id), cart.id,
+                ttl=cls.CART_EXPIRATION_HOURS * 3600
+            )
+    
+    @classmethod
+    def _session_cart(cls, db: Session, session_id: str) -> Optional[Cart]:
+        """
+        Active cart for a guest session. A cached cart id turns the lookup
+        into a primary-key fetch; stale ids fall back to the session index.
+        """
+        key = cls._session_cart_key(session_id)
+        cart_id = cache_get(key)
+        if cart_id is not None:
+            cart = cls._active_cart(db, session_id=session_id, cart_id=cart_id)
+            if cart:
+                return cart
+            cache_delete(key)
+        
+        cart = cls._active_cart(db, session_id=session_id)
+        if cart:
+            cls._remember_session_cart(cart)
+        return cart
+    
+    @classmethod
+    def _create_cart(cls, db: Session, user_id: Optional[int], session_id: Optional[str]) -> Cart:
+        """
+        Create an active cart. On PostgreSQL a user's cart is inserted with
+        ON CONFLICT DO NOTHING against uq_carts_user_active, so concurrent
+        requests end up sharing the one cart that won the insert.
+        """
+        if user_id and db.get_bind().dialect.name == "postgresql":
+            cart = db.scalars(
+                pg_insert(Cart).values(
+                    user_id=user_id,
+                    status=CartStatus.ACTIVE.value,
+                    expires_at=datetime.utcnow() + timedelta(hours=cls.CART_EXPIRATION_HOURS),
+                ).on_conflict_do_nothing(
+                    index_elements=[Cart.user_id],
+                    index_where=text(ACTIVE_CART_PREDICATE),
+                ).returning(Cart)
+            ).first()
+            db.commit()
+            return cart or cls._active_cart(db, user_id=user_id)
+        
+        cart = Cart(
+            user_id=user_id,
+            session_id=session_id if not user_id else None,
+            status=CartStatus.ACTIVE.value,
+        )
+        cart.set_expiration(cls.CART_EXPIRATION_HOURS)
+        db.add(cart)
+        db.commit()
+        db.refresh(cart)
+        cls._remember_session_cart(cart)
+        return cart
     
     @classmethod
     def get_or_create_cart(
@@ -51,47 +183,21 @@ class CartService:
         
         if user_id:
             # Look for user's active cart
-            cart = db.query(Cart).filter(
-                and_(
-                    Cart.user_id == user_id,
-                    Cart.status == CartStatus.ACTIVE.value
-                )
-            ).first()
+            cart = cls._active_cart(db, user_id=user_id)
         elif session_id:
             # Look for session cart
-            cart = db.query(Cart).filter(
-                and_(
-                    Cart.session_id == session_id,
-                    Cart.status == CartStatus.ACTIVE.value
-                )
-            ).first()
+            cart = cls._session_cart(db, session_id)
         
         if not cart:
-            # Create new cart
-            cart = Cart(
-                user_id=user_id,
-                session_id=session_id if not user_id else None,
-                status=CartStatus.ACTIVE.value,
-            )
-            cart.set_expiration(cls.CART_EXPIRATION_HOURS)
-            db.add(cart)
-            db.commit()
-            db.refresh(cart)
+            cart = cls._create_cart(db, user_id, session_id)
         else:
             # Check if cart has expired
             if cart.is_expired:
                 cart.status = CartStatus.EXPIRED.value
                 db.commit()
+                cls._invalidate_cart_cache(cart)
                 # Create new cart
-                cart = Cart(
-                    user_id=user_id,
-                    session_id=session_id if not user_id else None,
-                    status=CartStatus.ACTIVE.value,
-                )
-                cart.set_expiration(cls.CART_EXPIRATION_HOURS)
-                db.add(cart)
-                db.commit()
-                db.refresh(cart)
+                cart = cls._create_cart(db, user_id, session_id)
             else:
                 # Refresh expiration on activity
                 cart.refresh_expiration(cls.CART_EXPIRATION_HOURS)
@@ -108,19 +214,9 @@ class CartService:
     ) -> Optional[Cart]:
         """Get cart without creating if doesn't exist"""
         if user_id:
-            return db.query(Cart).filter(
-                and_(
-                    Cart.user_id == user_id,
-                    Cart.status == CartStatus.ACTIVE.value
-                )
-            ).first()
+            return cls._active_cart(db, user_id=user_id)
         elif session_id:
-            return db.query(Cart).filter(
-                and_(
-                    Cart.session_id == session_id,
-                    Cart.status == CartStatus.ACTIVE.value
-                )
-            ).first()
+            return cls._session_cart(db, session_id)
         return None
     
     @classmethod
@@ -161,18 +257,34 @@ class CartService:
             "user_type": "guest"
         }
         
+        owners = []
         if user:
             status_info["user_type"] = "registered"
-            user_cart = cls.get_cart(db, user_id=user.id)
-            if user_cart and user_cart.items:
-                status_info["has_user_cart"] = True
-                status_info["user_cart_items"] = len(user_cart.items)
-        
+            owners.append(Cart.user_id == user.id)
         if session_id:
-            session_cart = cls.get_cart(db, session_id=session_id)
-            if session_cart and session_cart.items:
+            owners.append(Cart.session_id == session_id)
+        
+        # Line counts of both active carts without loading their items
+        rows = db.query(
+            Cart.user_id,
+            Cart.session_id,
+            func.count(CartItem.id).label("line_count")
+        ).join(
+            CartItem, CartItem.cart_id == Cart.id
+        ).filter(
+            Cart.status == CartStatus.ACTIVE.value,
+            or_(*owners)
+        ).group_by(
+            Cart.id
+        ).all() if owners else []
+        
+        for row in rows:
+            if user and row.user_id == user.id:
+                status_info["has_user_cart"] = True
+                status_info["user_cart_items"] = row.line_count
+            if session_id and row.session_id == session_id:
                 status_info["has_session_cart"] = True
-                status_info["session_cart_items"] = len(session_cart.items)
+                status_info["session_cart_items"] = row.line_count
         
         # Determine if merge is possible and recommended
         if status_info["has_user_cart"] and status_info["has_session_cart"]:
@@ -180,6 +292,8 @@ class CartService:
             # Recommend merge if session cart has items and user just logged in
             status_info["recommend_merge"] = status_info["session_cart_items"] > 0
         
+        return status_info
+    
     @classmethod
     def detect_user_cart_based_on_products(
         cls,
@@ -202,41 +316,51 @@ class CartService:
             "cart_priority": "session"  # Default to session for guests
         }
         
-        # Check user's cart for relevant products
+        owners = []
         if user:
-            user_cart = cls.get_cart(db, user_id=user.id)
-            if user_cart and user_cart.items:
-                relevant_items = []
-                for item in user_cart.items:
-                    if item.product_id in product_ids:
-                        relevant_items.append({
-                            "product_id": item.product_id,
-                            "quantity": item.quantity,
-                            "in_stock": item.product.stock >= item.quantity if item.product else False
-                        })
-                
-                if relevant_items:
-                    detection_result["user_has_relevant_cart"] = True
-                    detection_result["relevant_user_items"] = relevant_items
-                    detection_result["recommend_user_cart"] = True
-                    detection_result["cart_priority"] = "user"
-        
-        # Check session cart for relevant products
+            owners.append(Cart.user_id == user.id)
         if session_id:
-            session_cart = cls.get_cart(db, session_id=session_id)
-            if session_cart and session_cart.items:
-                relevant_items = []
-                for item in session_cart.items:
-                    if item.product_id in product_ids:
-                        relevant_items.append({
-                            "product_id": item.product_id,
-                            "quantity": item.quantity,
-                            "in_stock": item.product.stock >= item.quantity if item.product else False
-                        })
-                
-                if relevant_items:
-                    detection_result["session_has_relevant_cart"] = True
-                    detection_result["relevant_session_items"] = relevant_items
+            owners.append(Cart.session_id == session_id)
+        if not owners or not product_ids:
+            return detection_result
+        
+        # Matching lines of both carts with their product stock in one query
+        rows = db.query(
+            Cart.user_id,
+            Cart.session_id,
+            CartItem.product_id,
+            CartItem.quantity,
+            Product.stock
+        ).join(
+            CartItem, CartItem.cart_id == Cart.id
+        ).outerjoin(
+            Product, Product.id == CartItem.product_id
+        ).filter(
+            Cart.status == CartStatus.ACTIVE.value,
+            or_(*owners),
+            CartItem.product_id.in_(product_ids)
+        ).order_by(
+            CartItem.id
+        ).all()
+        
+        for row in rows:
+            relevant_item = {
+                "product_id": row.product_id,
+                "quantity": row.quantity,
+                "in_stock": row.stock is not None and row.stock >= row.quantity
+            }
+            if user and row.user_id == user.id:
+                detection_result["relevant_user_items"].append(relevant_item)
+            if session_id and row.session_id == session_id:
+                detection_result["relevant_session_items"].append(dict(relevant_item))
+        
+        if detection_result["relevant_user_items"]:
+            detection_result["user_has_relevant_cart"] = True
+            detection_result["recommend_user_cart"] = True
+            detection_result["cart_priority"] = "user"
+        
+        if detection_result["relevant_session_items"]:
+            detection_result["session_has_relevant_cart"] = True
         
         # Determine merge recommendation
         if (detection_result["user_has_relevant_cart"] and 
@@ -293,51 +417,6 @@ class CartService:
         
         return cart, metadata
     
-    @classmethod
-    def handle_guest_user_cart(
-        cls,
-        db: Session,
-        session_id: str,
-        product_ids: List[int] = None,
-        user_context: dict = None
-    ) -> dict:
-        """
-        Special handling for guest users.
-        - Extends cart expiration for guest users with specific products
-        - Tracks guest cart analytics
-        - Prepares for potential conversion to registered user
-        """
-        cart = cls.get_cart(db, session_id=session_id)
-        
-        if not cart:
-            return {"status": "no_cart", "message": "No guest cart found"}
-        
-        # Extend expiration for guest carts with valuable items
-        if product_ids:
-            # Check if cart contains high-value or frequently purchased items
-            valuable_items = []
-            for item in cart.items:
-                if item.product_id in product_ids:
-                    valuable_items.append(item.product_id)
-            
-            if valuable_items:
-                # Extend expiration by 24 hours for carts with target products
-                cart.refresh_expiration(96)  # 4 days instead of 3
-                db.commit()
-                
-                return {
-                    "status": "extended",
-                    "message": f"Guest cart expiration extended due to valuable items",
-                    "valuable_items": valuable_items,
-                    "expires_at": cart.expires_at
-                }
-        
-        return {
-            "status": "standard",
-            "message": "Standard guest cart handling",
-            "expires_at": cart.expires_at
-        }
-    
     @classmethod
     def add_item(
         cls,
@@ -352,47 +431,48 @@ class CartService:
         - Enforces max quantity per item
         - Updates or creates cart item
         """
-        # Validate product
-        product = db.query(Product).filter(
+        # Product, variation and any existing line for them, in one query
+        row = db.query(
+            Product.price,
+            Product.stock,
+            ProductVariation.id.label("variation_id"),
+            ProductVariation.stock.label("variation_stock"),
+            CartItem.id.label("item_id"),
+            CartItem.quantity.label("item_quantity")
+        ).outerjoin(
+            ProductVariation,
             and_(
-                Product.id == item_data.product_id,
-                Product.is_active == True
+                ProductVariation.id == item_data.variation_id,
+                ProductVariation.product_id == Product.id
+            )
+        ).outerjoin(
+            CartItem,
+            and_(
+                CartItem.cart_id == cart.id,
+                CartItem.product_id == Product.id,
+                CartItem.variation_id.is_not_distinct_from(item_data.variation_id)
             )
+        ).filter(
+            Product.id == item_data.product_id,
+            Product.is_active == True
         ).first()
         
-        if not product:
+        if not row:
             raise CartError("Product not found or not available", status.HTTP_404_NOT_FOUND)
         
         # Validate variation if provided
-        variation = None
-        available_stock = product.stock
+        available_stock = row.stock
         
         if item_data.variation_id:
-            variation = db.query(ProductVariation).filter(
-                and_(
-                    ProductVariation.id == item_data.variation_id,
-                    ProductVariation.product_id == item_data.product_id
-                )
-            ).first()
-            
-            if not variation:
+            if row.variation_id is None:
                 raise CartError("Product variation not found", status.HTTP_404_NOT_FOUND)
             
-            if variation.stock is not None:
-                available_stock = variation.stock
-        
-        # Check existing item in cart
-        existing_item = db.query(CartItem).filter(
-            and_(
-                CartItem.cart_id == cart.id,
-                CartItem.product_id == item_data.product_id,
-                CartItem.variation_id == item_data.variation_id
-            )
-        ).first()
+            if row.variation_stock is not None:
+                available_stock = row.variation_stock
         
         new_quantity = item_data.quantity
-        if existing_item:
-            new_quantity = existing_item.quantity + item_data.quantity
+        if row.item_id:
+            new_quantity = row.item_quantity + item_data.quantity
         
         # Validate quantity limits
         if new_quantity > cls.MAX_QUANTITY_PER_ITEM:
@@ -408,14 +488,32 @@ class CartService:
                 status.HTTP_400_BAD_REQUEST
             )
         
-        if existing_item:
+        if db.get_bind().dialect.name == "postgresql":
+            # Insert the line or add to the one a concurrent request just created
+            stmt = pg_insert(CartItem).values(
+                cart_id=cart.id,
+                user_id=cart.user_id,
+                product_id=item_data.product_id,
+                variation_id=item_data.variation_id,
+                quantity=item_data.quantity,
+                unit_price=row.price,
+            )
+            cart_item = db.scalars(
+                stmt.on_conflict_do_update(
+                    index_elements=CART_ITEM_LINE_KEY,
+                    set_={
+                        "quantity": CartItem.quantity + stmt.excluded.quantity,
+                        "unit_price": stmt.excluded.unit_price,
+                        "updated_at": func.now(),
+                    },
+                ).returning(CartItem),
+                execution_options={"populate_existing": True},
+            ).one()
+        elif row.item_id:
             # Update quantity
-            existing_item.quantity = new_quantity
-            existing_item.unit_price = product.price
-            db.commit()
-            db.refresh(existing_item)
-            cls._update_cart_totals(db, cart)
-            return existing_item
+            cart_item = db.get_one(CartItem, row.item_id)
+            cart_item.quantity = new_quantity
+            cart_item.unit_price = row.price
         else:
             # Create new cart item
             cart_item = CartItem(
@@ -424,13 +522,26 @@ class CartService:
                 product_id=item_data.product_id,
                 variation_id=item_data.variation_id,
                 quantity=item_data.quantity,
-                unit_price=product.price,
+                unit_price=row.price,
             )
             db.add(cart_item)
-            db.commit()
-            db.refresh(cart_item)
-            cls._update_cart_totals(db, cart)
-            return cart_item
+        
+        # The line write and the new totals commit together
+        db.flush()
+        cls._update_cart_totals(db, cart)
+        return cart_item
+    
+    @staticmethod
+    def _cart_line(cart: Cart, item_id: int) -> CartItem:
+        """
+        Item of a cart by id. Carts are loaded with their items, products and
+        variations, so this reads the session's identity map instead of
+        selecting the line and its product again.
+        """
+        for item in cart.items:
+            if item.id == item_id:
+                return item
+        raise CartError("Cart item not found", status.HTTP_404_NOT_FOUND)
     
     @classmethod
     def update_item_quantity(
@@ -441,15 +552,7 @@ class CartService:
         quantity: int
     ) -> CartItem:
         """Update cart item quantity with validation"""
-        cart_item = db.query(CartItem).filter(
-            and_(
-                CartItem.id == item_id,
-                CartItem.cart_id == cart.id
-            )
-        ).first()
-        
-        if not cart_item:
-            raise CartError("Cart item not found", status.HTTP_404_NOT_FOUND)
+        cart_item = cls._cart_line(cart, item_id)
         
         # Validate quantity limit
         if quantity > cls.MAX_QUANTITY_PER_ITEM:
@@ -472,28 +575,23 @@ class CartService:
                 status.HTTP_400_BAD_REQUEST
             )
         
+        # Same quantity at the same price leaves the totals as they are
+        if cart_item.quantity == quantity and cart_item.unit_price == product.price:
+            return cart_item
+        
         cart_item.quantity = quantity
         cart_item.unit_price = product.price  # Update price
-        db.commit()
-        db.refresh(cart_item)
+        db.flush()
         cls._update_cart_totals(db, cart)
         return cart_item
     
     @classmethod
     def remove_item(cls, db: Session, cart: Cart, item_id: int) -> bool:
         """Remove item from cart"""
-        cart_item = db.query(CartItem).filter(
-            and_(
-                CartItem.id == item_id,
-                CartItem.cart_id == cart.id
-            )
-        ).first()
-        
-        if not cart_item:
-            raise CartError("Cart item not found", status.HTTP_404_NOT_FOUND)
+        cart_item = cls._cart_line(cart, item_id)
         
         db.delete(cart_item)
-        db.commit()
+        db.flush()
         cls._update_cart_totals(db, cart)
         return True
     
@@ -501,55 +599,90 @@ class CartService:
     def clear_cart(cls, db: Session, cart: Cart) -> bool:
         """Remove all items from cart"""
         db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
-        cart.subtotal = Decimal("0")
-        cart.tax_amount = Decimal("0")
-        cart.total = Decimal("0")
-        cart.discount_amount = Decimal("0")
+        cart.subtotal = cls._ZERO
+        cart.tax_amount = cls._ZERO
+        cart.total = cls._ZERO
+        cart.discount_amount = cls._ZERO
+        cart.item_count = 0
         db.commit()
+        cls._invalidate_cart_cache(cart)
         return True
     
     @classmethod
     def _update_cart_totals(cls, db: Session, cart: Cart) -> None:
-        """Recalculate and update cart totals"""
-        subtotal = Decimal("0")
-        
-        for item in cart.items:
-            price = item.unit_price or item.product.price
-            subtotal += Decimal(str(price)) * item.quantity
-        
-        tax_amount = subtotal * cls.TAX_RATE
+        """
+        Recalculate and persist cart totals and item count.
+        Called after every item mutation so reads can use the stored columns;
+        callers flush their change first so the two commit together.
+        """
+        # One-row aggregate, also for an empty cart, joined into the cart UPDATE
+        totals = select(
+            literal(cart.id).label("cart_id"),
+            func.coalesce(
+                func.sum(func.coalesce(CartItem.unit_price, Product.price) * CartItem.quantity), 0
+            ).label("subtotal"),
+            func.coalesce(func.sum(CartItem.quantity), 0).label("item_count")
+        ).join(
+            Product, Product.id == CartItem.product_id
+        ).where(
+            CartItem.cart_id == cart.id
+        ).subquery("totals")
+        
+        tax_amount = totals.c.subtotal * cls.TAX_RATE
         
         # Apply shipping
-        shipping = Decimal("0")
-        if subtotal < cls.FREE_SHIPPING_THRESHOLD and subtotal > 0:
-            shipping = cls.SHIPPING_COST
-        
-        # Apply discount
-        discount = cart.discount_amount or Decimal("0")
-        
-        total = subtotal + tax_amount + shipping - discount
+        shipping = case(
+            (and_(totals.c.subtotal > 0, totals.c.subtotal < cls.FREE_SHIPPING_THRESHOLD), cls.SHIPPING_COST),
+            else_=cls._ZERO
+        )
         
-        cart.subtotal = subtotal
-        cart.tax_amount = tax_amount
-        cart.total = total
+        # Apply discount in the same statement so the cart row is not re-read
+        db.execute(
+            update(Cart).where(Cart.id == totals.c.cart_id).values(
+                subtotal=totals.c.subtotal,
+                tax_amount=tax_amount,
+                total=totals.c.subtotal + tax_amount + shipping - func.coalesce(Cart.discount_amount, 0),
+                item_count=totals.c.item_count,
+            ).execution_options(synchronize_session=False)
+        )
         db.commit()
+        cls._invalidate_cart_cache(cart)
+    
+    @classmethod
+    def get_cached_cart_summary(
+        cls,
+        db: Session,
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None
+    ) -> CartSummary:
+        """
+        Cart summary for a user or session, read through the cache.
+        Cart writes invalidate the entry; anything missed expires with CART_CACHE_TTL.
+        """
+        key = make_key(CART_NAMESPACE, "summary", cls._owner_params(user_id, session_id))
+        cached_summary = cache_get(key)
+        if cached_summary is not None:
+            return CartSummary(**cached_summary)
+        
+        cart = cls.get_cart(db, user_id=user_id, session_id=session_id)
+        summary = cls.get_cart_summary(db, cart) if cart else CartSummary()
+        cache_set(key, summary, ttl=settings.CART_CACHE_TTL)
+        return summary
     
     @classmethod
     def get_cart_summary(cls, db: Session, cart: Cart) -> CartSummary:
-        """Get cart summary with totals"""
-        cls._update_cart_totals(db, cart)
-        
-        shipping_estimate = Decimal("0")
+        """Get cart summary from the totals stored on the cart"""
+        shipping_estimate = cls._ZERO
         if cart.subtotal and cart.subtotal < cls.FREE_SHIPPING_THRESHOLD and cart.subtotal > 0:
             shipping_estimate = cls.SHIPPING_COST
         
         return CartSummary(
             item_count=cart.item_count,
-            subtotal=cart.subtotal or Decimal("0"),
-            tax_amount=cart.tax_amount or Decimal("0"),
+            subtotal=cart.subtotal or cls._ZERO,
+            tax_amount=cart.tax_amount or cls._ZERO,
             shipping_estimate=shipping_estimate,
-            discount_amount=cart.discount_amount or Decimal("0"),
-            total=cart.total or Decimal("0"),
+            discount_amount=cart.discount_amount or cls._ZERO,
+            total=cart.total or cls._ZERO,
         )
     
     @classmethod
@@ -564,24 +697,39 @@ class CartService:
             issues.append("Cart is empty")
             return False, issues
         
-        for item in cart.items:
-            product = item.product
-            
+        # Only lines that are unavailable or short on stock come back
+        available_stock = func.coalesce(ProductVariation.stock, Product.stock)
+        problems = db.query(
+            Product.name,
+            Product.is_active,
+            CartItem.quantity,
+            available_stock.label("available_stock")
+        ).select_from(
+            CartItem
+        ).outerjoin(
+            Product, Product.id == CartItem.product_id
+        ).outerjoin(
+            ProductVariation, ProductVariation.id == CartItem.variation_id
+        ).filter(
+            CartItem.cart_id == cart.id,
+            or_(
+                Product.id.is_(None),
+                Product.is_active.is_not(True),
+                CartItem.quantity > available_stock
+            )
+        ).order_by(
+            CartItem.id
+        ).all()
+        
+        for row in problems:
             # Check product is still active
-            if not product or not product.is_active:
-                issues.append(f"Product '{product.name if product else 'Unknown'}' is no longer available")
+            if not row.is_active:
+                issues.append(f"Product '{row.name or 'Unknown'}' is no longer available")
                 continue
             
-            # Check stock
-            available_stock = product.stock
-            if item.variation_id and item.variation:
-                if item.variation.stock is not None:
-                    available_stock = item.variation.stock
-            
-            if item.quantity > available_stock:
-                issues.append(
-                    f"'{product.name}' has only {available_stock} items in stock (you have {item.quantity})"
-                )
+            issues.append(
+                f"'{row.name}' has only {row.available_stock} items in stock (you have {row.quantity})"
+            )
         
         return len(issues) == 0, issues
     
@@ -596,12 +744,7 @@ class CartService:
         Merge anonymous session cart into user's cart.
         Called when user logs in.
         """
-        session_cart = db.query(Cart).filter(
-            and_(
-                Cart.session_id == session_id,
-                Cart.status == CartStatus.ACTIVE.value
-            )
-        ).first()
+        session_cart = cls._session_cart(db, session_id)
         
         if not session_cart or not session_cart.items:
             return None
@@ -609,25 +752,62 @@ class CartService:
         # Get or create user cart
         user_cart = cls.get_or_create_cart(db, user_id=user.id)
         
-        # Merge items
+        # Both carts were loaded with their items, products and variations, so
+        # merged quantities are checked in Python and written in two statements
+        quantities = {
+            (item.product_id, item.variation_id): item.quantity for item in user_cart.items
+        }
+        existing_ids = {
+            (item.product_id, item.variation_id): item.id for item in user_cart.items
+        }
+        prices = {}
+        
         for session_item in session_cart.items:
-            try:
-                cls.add_item(
-                    db, 
-                    user_cart,
-                    CartItemCreate(
-                        product_id=session_item.product_id,
-                        variation_id=session_item.variation_id,
-                        quantity=session_item.quantity
-                    )
-                )
-            except CartError:
-                # Skip items that can't be added (out of stock, etc.)
-                pass
-        
-        # Mark session cart as converted
+            product = session_item.product
+            variation = session_item.variation
+            # Skip items that can't be added (inactive, out of stock, etc.)
+            if not product or not product.is_active:
+                continue
+            if session_item.variation_id and (not variation or variation.product_id != product.id):
+                continue
+            
+            available_stock = product.stock
+            if variation and variation.stock is not None:
+                available_stock = variation.stock
+            
+            key = (session_item.product_id, session_item.variation_id)
+            new_quantity = quantities.get(key, 0) + session_item.quantity
+            if new_quantity > cls.MAX_QUANTITY_PER_ITEM or new_quantity > available_stock:
+                continue
+            
+            quantities[key] = new_quantity
+            prices[key] = product.price
+        
+        updates = [
+            {"id": existing_ids[key], "quantity": quantities[key], "unit_price": price}
+            for key, price in prices.items() if key in existing_ids
+        ]
+        inserts = [
+            {
+                "cart_id": user_cart.id,
+                "user_id": user_cart.user_id,
+                "product_id": product_id,
+                "variation_id": variation_id,
+                "quantity": quantities[(product_id, variation_id)],
+                "unit_price": price,
+            }
+            for (product_id, variation_id), price in prices.items()
+            if (product_id, variation_id) not in existing_ids
+        ]
+        if updates:
+            db.execute(update(CartItem), updates)
+        if inserts:
+            db.execute(insert(CartItem), inserts)
+        
+        # Mark session cart as converted; committed with the new totals
         session_cart.status = CartStatus.CONVERTED.value
-        db.commit()
+        cls._update_cart_totals(db, user_cart)
+        cls._invalidate_cart_cache(session_cart)
         
         return user_cart
     
@@ -647,10 +827,13 @@ class CartService:
         # Placeholder for promo code validation
         # In production, query promotions table
         
+        if cart.promo_code == promo_code:
+            return True, "Promo code applied"
+        
         cart.promo_code = promo_code
         # cart.discount_amount = calculated_discount
+        # Totals only need recalculating once the discount above is set
         db.commit()
-        cls._update_cart_totals(db, cart)
         
         return True, "Promo code applied"
     
@@ -659,27 +842,39 @@ class CartService:
         """Mark cart as converted after order creation"""
         cart.status = CartStatus.CONVERTED.value
         db.commit()
+        cls._invalidate_cart_cache(cart)
     
     @classmethod
     def cleanup_expired_carts(cls, db: Session) -> int:
         """
         Cleanup expired carts (batch job).
+        Carts are expired in id-ordered batches, each in its own short transaction.
         Returns number of carts cleaned up.
         """
-        expired_carts = db.query(Cart).filter(
-            and_(
-                Cart.expires_at < datetime.utcnow(),
+        cutoff = datetime.utcnow()
+        cleaned = 0
+        while True:
+            # Rows locked by a concurrent sweep are skipped rather than waited on
+            batch = select(Cart.id).where(
+                Cart.expires_at < cutoff,
                 Cart.status == CartStatus.ACTIVE.value
+            ).order_by(
+                Cart.id
+            ).limit(
+                cls.CLEANUP_BATCH_SIZE
+            ).with_for_update(skip_locked=True)
+            result = db.execute(
+                update(Cart).where(Cart.id.in_(batch.scalar_subquery())).values(
+                    status=CartStatus.EXPIRED.value
+                ).execution_options(synchronize_session=False)
             )
-        ).all()
-        
-        count = 0
-        for cart in expired_carts:
-            cart.status = CartStatus.EXPIRED.value
-            count += 1
-        
-        db.commit()
-        return count
+            db.commit()
+            cleaned += result.rowcount
+            if result.rowcount < cls.CLEANUP_BATCH_SIZE:
+                break
+        # Cached session -> cart ids of these carts are dropped on their next
+        # lookup, which only accepts active carts
+        return cleaned
     
     @classmethod
     def handle_guest_user_cart(
@@ -710,14 +905,13 @@ class CartService:
         # Extend expiration for carts with valuable items
         if product_ids:
             valuable_items = []
-            total_value = 0
+            total_value = cls._ZERO
             
             for item in cart.items:
                 if item.product and item.product_id in product_ids:
                     valuable_items.append(item.product_id)
                     # Calculate approximate value
-                    price = float(item.product.price)
-                    total_value += price * item.quantity
+                    total_value += item.product.price * item.quantity
             
             # Extend expiration based on cart value and items
             if valuable_items:
@@ -752,7 +946,7 @@ class CartService:
             "expiration_extended": expiration_extended,
             "expires_at": cart.expires_at,
             "conversion_potential": conversion_potential,
-            "cart_value": sum(float(item.line_total or 0) for item in cart.items),
+            "cart_value": cart.subtotal or cls._ZERO,
             "item_count": cart.item_count
         }
     
@@ -770,12 +964,36 @@ class CartService:
         """
         Get product count statistics for a session.
         Returns total products viewed, added to cart, etc.
+        Read through the cache; cart writes invalidate the entry.
         """
-        # Get cart for session
-        cart = cls.get_cart(db, session_id=session_id)
+        key = cls.session_count_key(session_id)
+        stats = cache_get(key)
+        if stats is not None:
+            return stats
+        
+        # Aggregate in SQL; no Cart or CartItem objects are loaded
+        row = db.query(
+            Cart.status,
+            Cart.updated_at,
+            Cart.expires_at,
+            func.coalesce(func.sum(CartItem.quantity), 0).label("total_quantity"),
+            func.count(CartItem.id).label("unique_products"),
+            func.coalesce(
+                func.sum(func.coalesce(CartItem.unit_price, Product.price) * CartItem.quantity), 0
+            ).label("cart_value")
+        ).outerjoin(
+            CartItem, CartItem.cart_id == Cart.id
+        ).outerjoin(
+            Product, Product.id == CartItem.product_id
+        ).filter(
+            Cart.session_id == session_id,
+            Cart.status == CartStatus.ACTIVE.value
+        ).group_by(
+            Cart.id
+        ).first()
         
-        if not cart:
-            return {
+        if not row:
+            stats = {
                 "session_id": session_id,
                 "total_products_in_cart": 0,
                 "total_quantity": 0,
@@ -783,42 +1001,41 @@ class CartService:
                 "cart_value": 0,
                 "last_activity": None
             }
+        else:
+            stats = {
+                "session_id": session_id,
+                "total_products_in_cart": row.total_quantity,
+                "total_quantity": row.total_quantity,
+                "unique_products": row.unique_products,
+                "cart_value": float(row.cart_value),
+                "last_activity": row.updated_at,
+                "cart_status": row.status,
+                "expires_at": row.expires_at
+            }
         
-        # Calculate statistics
-        total_quantity = sum(item.quantity for item in cart.items)
-        unique_products = len(cart.items)
-        cart_value = sum(float(item.line_total or 0) for item in cart.items)
-        
-        return {
-            "session_id": session_id,
-            "total_products_in_cart": total_quantity,
-            "total_quantity": total_quantity,
-            "unique_products": unique_products,
-            "cart_value": cart_value,
-            "last_activity": cart.updated_at,
-            "cart_status": cart.status.value,
-            "expires_at": cart.expires_at
-        }
+        cache_set(key, stats, ttl=settings.CART_CACHE_TTL)
+        return stats
     
     @classmethod
-    def track_session_activity(
+    def track_session_activities(
         cls,
         db: Session,
         session_id: str,
-        activity_type: str,
-        product_id: Optional[int] = None,
-        metadata: Optional[dict] = None
+        activities: List[SessionActivity]
     ) -> None:
         """
-        Track user session activity for analytics.
-        Types: view_product, add_to_cart, remove_from_cart, checkout_start, etc.
+        Track a batch of session activities in one transaction.
+        For now tracking only refreshes the active session cart's updated_at
+        (a separate analytics table would hold the activities themselves),
+        so the whole batch is a single UPDATE. Callers drop the cached
+        session count (session_count_key) afterwards.
         """
-        # For now, we'll update the cart's updated_at timestamp
-        # In a production system, you'd want to store this in a separate analytics table
-        cart = cls.get_cart(db, session_id=session_id)
-        if cart:
-            cart.updated_at = datetime.utcnow()
-            db.commit()
+        db.execute(
+            update(Cart)
+            .where(Cart.session_id == session_id, Cart.status == CartStatus.ACTIVE.value)
+            .values(updated_at=func.now())
+        )
+        db.commit()
     
     @classmethod
     def get_session_statistics(
@@ -2,7 +2,7 @@
 Order Service - Business logic for order processing and management
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, update
 from fastapi import HTTPException, status
 from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
@@ -594,24 +594,39 @@ class OrderService:
             price=item_price,  # DB column is 'price' not 'unit_price'
         )
     
+    @staticmethod
+    def _change_stock(db: Session, product_id: int, quantity_change: int) -> Optional[int]:
+        """
+        Apply a stock change in one guarded UPDATE and return the new stock,
+        or None when the product is missing or the stock would go negative.
+        The row lock is held only for the statement, not across a read.
+        """
+        return db.execute(
+            update(Product).where(
+                Product.id == product_id,
+                Product.stock + quantity_change >= 0
+            ).values(
+                stock=Product.stock + quantity_change
+            ).returning(Product.stock)
+        ).scalar_one_or_none()
+    
     @classmethod
     def _reserve_stock(cls, db: Session, cart_item: CartItem, order_id: int) -> None:
         """Reserve stock for cart item"""
         product = cart_item.product
         
-        if product.stock < cart_item.quantity:
+        new_stock = cls._change_stock(db, product.id, -cart_item.quantity)
+        if new_stock is None:
             raise OrderError(
                 f"Insufficient stock for '{product.name}'",
                 status.HTTP_400_BAD_REQUEST
             )
         
-        product.stock -= cart_item.quantity
-        
         # Log inventory change
         log = InventoryLog(
             product_id=product.id,
             change_quantity=-cart_item.quantity,
-            new_stock=product.stock,
+            new_stock=new_stock,
             reason="order_placed",
             order_id=order_id,
         )
@@ -620,23 +635,22 @@ class OrderService:
     @classmethod
     def _reserve_stock_direct(cls, db: Session, product_id: int, quantity: int, order_id: int) -> None:
         """Reserve stock directly by product ID"""
-        product = db.query(Product).filter(Product.id == product_id).first()
+        new_stock = cls._change_stock(db, product_id, -quantity)
         
-        if not product:
-            raise OrderError(f"Product {product_id} not found", status.HTTP_404_NOT_FOUND)
-        
-        if product.stock < quantity:
+        if new_stock is None:
+            # Nothing updated: tell a missing product from a short one
+            name = db.query(Product.name).filter(Product.id == product_id).scalar()
+            if name is None:
+                raise OrderError(f"Product {product_id} not found", status.HTTP_404_NOT_FOUND)
             raise OrderError(
-                f"Insufficient stock for '{product.name}'",
+                f"Insufficient stock for '{name}'",
                 status.HTTP_400_BAD_REQUEST
             )
         
-        product.stock -= quantity
-        
         log = InventoryLog(
-            product_id=product.id,
+            product_id=product_id,
             change_quantity=-quantity,
-            new_stock=product.stock,
+            new_stock=new_stock,
             reason="order_placed",
             order_id=order_id,
         )
@@ -645,15 +659,13 @@ class OrderService:
     @classmethod
     def _release_stock(cls, db: Session, product_id: int, quantity: int, order_id: int) -> None:
         """Release reserved stock (for cancellations)"""
-        product = db.query(Product).filter(Product.id == product_id).first()
+        new_stock = cls._change_stock(db, product_id, quantity)
         
-        if product:
-            product.stock += quantity
-            
+        if new_stock is not None:
             log = InventoryLog(
-                product_id=product.id,
+                product_id=product_id,
                 change_quantity=quantity,
-                new_stock=product.stock,
+                new_stock=new_stock,
                 reason="order_cancelled",
                 order_id=order_id,
             )
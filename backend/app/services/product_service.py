@@ -4,14 +4,19 @@ Business logic for product management including search, filtering, and paginatio
 """
 from typing import Optional, List, Tuple
 from decimal import Decimal
-from datetime import datetime
-import uuid
-from sqlalchemy import or_, and_, func, desc, asc
-from sqlalchemy.orm import Session, joinedload
-
+from datetime import date
+import secrets
+from sqlalchemy import Float, or_, and_, func, desc, asc, delete, exists, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, lazyload, load_only, raiseload, selectinload
+
+from app.core.cache import PRODUCTS_NAMESPACE, cache_get, cache_set, make_key
+from app.core.config import settings
+from app.db.pagination import cursor_page, encode_cursor
 from app.models.product import (
     Product, Category, ProductImage, ProductVariation, 
-    Review, ProductCategoryAssociation, generate_slug
+    ProductCategoryAssociation, generate_slug,
+    PRODUCT_SEARCH_CONFIG, product_search_vector
 )
 from app.schemas.product import (
     ProductCreate, ProductUpdate, ProductFilter, ProductCreateSimple,
@@ -23,13 +28,59 @@ from app.schemas.product import (
 # PRODUCT QUERIES
 # =============================================================================
 
+def product_detail_options() -> list:
+    """
+    Loader options for reads serialized as Product/ProductDetail.
+    Collections are fetched with one SELECT ... IN each; in DEBUG any other
+    relationship access raises instead of silently lazy loading.
+    """
+    options = [
+        selectinload(Product.images),
+        selectinload(Product.categories),
+        selectinload(Product.variations),
+    ]
+    if settings.DEBUG:
+        options.append(raiseload("*"))
+    return options
+
+
+# Columns ProductSimple serializes, plus the keyset sort keys the cursor is
+# built from; descriptions, SEO fields and metadata are left unloaded
+PRODUCT_LIST_COLUMNS = (
+    Product.id, Product.name, Product.slug, Product.price,
+    Product.original_price, Product.sale_price, Product.stock,
+    Product.primary_image, Product.rating, Product.average_rating,
+    Product.review_count, Product.is_featured, Product.is_new,
+    Product.is_bestseller, Product.brand, Product.created_at,
+    Product.view_count,
+)
+
+
+# Row projection for paginated listings: plain column rows validate
+# straight into ProductSimple without hydrating Product instances;
+# is_in_stock mirrors the model property
+PRODUCT_LIST_ROW = (*PRODUCT_LIST_COLUMNS, (Product.stock > 0).label("is_in_stock"))
+
+
+def product_list_options() -> list:
+    """
+    Loader options for reads serialized as ProductSimple, which needs no
+    relationships and only a few columns: load just PRODUCT_LIST_COLUMNS
+    and skip the collections the model would otherwise selectin-load for
+    every row (raise on access in DEBUG).
+    """
+    strategy = raiseload if settings.DEBUG else lazyload
+    return [
+        load_only(*PRODUCT_LIST_COLUMNS, raiseload=settings.DEBUG),
+        strategy(Product.images),
+        strategy(Product.categories),
+        strategy(Product.variations),
+    ]
+
+
 def get_product_query(db: Session, include_inactive: bool = False):
-    """Get base product query with eager loading"""
-    query = db.query(Product).options(
-        joinedload(Product.images),
-        joinedload(Product.categories),
-        joinedload(Product.variations)
-    )
+    """Get base product query with eager loading for detail reads"""
+    query = db.query(Product).options(*product_detail_options())
     
     if not include_inactive:
         query = query.filter(Product.is_active == True)
@@ -57,6 +108,14 @@ def get_product_by_slug(
     return query.filter(Product.slug == slug).first()
 
 
+def product_exists(db: Session, product_id: int, include_inactive: bool = False) -> bool:
+    """Check a product exists without loading it"""
+    conditions = [Product.id == product_id]
+    if not include_inactive:
+        conditions.append(Product.is_active == True)
+    return bool(db.scalar(select(exists().where(*conditions))))
+
+
 def get_product_by_sku(db: Session, sku: str) -> Optional[Product]:
     """Get a single product by SKU"""
     return db.query(Product).filter(Product.sku == sku.upper()).first()
@@ -66,11 +125,49 @@ def get_product_by_sku(db: Session, sku: str) -> Optional[Product]:
 # PRODUCT LISTING WITH FILTERS
 # =============================================================================
 
+def full_text_search_available(query) -> bool:
+    """Whether the query's database has the generated products.search_vector"""
+    return query.session.get_bind().dialect.name == "postgresql"
+
+
+def _search_query(search: str):
+    """plainto_tsquery for a user's search text"""
+    return func.plainto_tsquery(PRODUCT_SEARCH_CONFIG, search)
+
+
+def search_rank(search: str):
+    """Relevance of a product to a search (ts_rank_cd over the weighted vector)"""
+    return func.ts_rank_cd(product_search_vector, _search_query(search), type_=Float)
+
+
+# pg_trgm indexes (migration d8f3b6a1c947) can only narrow patterns with a
+# full trigram in them
+MIN_TRIGRAM_SEARCH_LENGTH = 3
+
+
+def _in_categories(condition):
+    """EXISTS clause for products with a category link matching condition"""
+    return exists().where(ProductCategoryAssociation.product_id == Product.id, condition)
+
+
 def apply_product_filters(query, filters: ProductFilter):
     """Apply filters to product query"""
     
-    # Text search
-    if filters.search:
+    # Text search: GIN-indexed full-text match on PostgreSQL (plus an exact
+    # SKU lookup), substring matching elsewhere
+    if filters.search and full_text_search_available(query):
+        conditions = [
+            product_search_vector.op("@@")(_search_query(filters.search)),
+            Product.sku == filters.search.strip().upper()
+        ]
+        # Partial words ("iph") never match a tsquery; the pg_trgm indexes
+        # serve substring matches on name and SKU, but need 3+ characters
+        search_term = filters.search.strip()
+        if len(search_term) >= MIN_TRIGRAM_SEARCH_LENGTH:
+            conditions.append(Product.name.ilike(f"%{search_term}%"))
+            conditions.append(Product.sku.ilike(f"%{search_term}%"))
+        query = query.filter(or_(*conditions))
+    elif filters.search:
         search_term = f"%{filters.search}%"
         query = query.filter(
             or_(
@@ -81,13 +178,14 @@ def apply_product_filters(query, filters: ProductFilter):
             )
         )
     
-    # Category filter
+    # Category filter; EXISTS on the association table, so a product in
+    # several of the requested categories is still one row
     if filters.category_id:
-        query = query.join(Product.categories).filter(Category.id == filters.category_id)
+        query = query.filter(_in_categories(ProductCategoryAssociation.category_id == filters.category_id))
     elif filters.category_ids:
-        query = query.join(Product.categories).filter(Category.id.in_(filters.category_ids))
+        query = query.filter(_in_categories(ProductCategoryAssociation.category_id.in_(filters.category_ids)))
     
-    # Brand filter
+    # Brand filter (trigram-indexed on PostgreSQL)
     if filters.brand:
         query = query.filter(Product.brand.ilike(f"%{filters.brand}%"))
     elif filters.brands:
@@ -120,74 +218,187 @@ def apply_product_filters(query, filters: ProductFilter):
     return query
 
 
+def _ranks_by_relevance(query, filters: ProductFilter) -> bool:
+    """Whether a filtered query should be ordered by search relevance"""
+    return (
+        filters.sort_by == "relevance"
+        and bool(filters.search)
+        and full_text_search_available(query)
+    )
+
+
 def apply_sorting(query, sort_by: str, sort_order: str):
-    """Apply sorting to product query"""
+    """Apply sorting to product query, with id as the tie-breaker keyset pages also use"""
     sort_field = getattr(Product, sort_by, Product.created_at)
     
     if sort_order == "desc":
-        query = query.order_by(desc(sort_field))
+        query = query.order_by(desc(sort_field), desc(Product.id))
     else:
-        query = query.order_by(asc(sort_field))
+        query = query.order_by(asc(sort_field), asc(Product.id))
     
     return query
 
 
+def filtered_products_query(db: Session, filters: ProductFilter):
+    """
+    List query for filters; active products only unless filters say otherwise.
+    Yields PRODUCT_LIST_ROW rows rather than Product instances.
+    """
+    query = db.query(*PRODUCT_LIST_ROW)
+    
+    # Apply active filter by default ONLY if not explicitly set in filters
+    # This prevents duplicate is_active filters in SQL
+    if filters.is_active is None:
+        query = query.filter(Product.is_active == True)
+    
+    # Apply filters (will handle is_active if it was explicitly set)
+    return apply_product_filters(query, filters)
+
+
+def get_products_count(db: Session, filters: ProductFilter) -> int:
+    """
+    Number of products matching filters, for page totals.
+    Read through the cache; product writes invalidate the products namespace
+    and anything else is at most PRODUCT_COUNT_CACHE_TTL seconds stale.
+    """
+    params = filters.model_dump(exclude={"sort_by", "sort_order"}, exclude_none=True)
+    key = make_key(PRODUCTS_NAMESPACE, "count", params)
+    total = cache_get(key)
+    if total is None:
+        total = filtered_products_query(db, filters).count()
+        cache_set(key, total, ttl=settings.PRODUCT_COUNT_CACHE_TTL)
+    return total
+
+
 def get_products_paginated(
     db: Session,
     page: int = 1,
     per_page: int = 20,
-    filters: Optional[ProductFilter] = None
+    filters: Optional[ProductFilter] = None,
+    cursor: Optional[str] = None
 ) -> ProductListResponse:
     """
     Get paginated list of products with optional filters.
+    Pages after the first can follow meta.next_cursor instead of a page
+    number; with a cursor the page is fetched with keyset pagination and
+    no OFFSET or COUNT.
     
     Args:
         db: Database session
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), ignored when cursor is given
         per_page: Items per page
         filters: Optional filter parameters
+        cursor: next_cursor from a previous page
         
     Returns:
         ProductListResponse with items and pagination meta
+        
+    Raises:
+        ValueError: If the cursor is malformed
     """
     if filters is None:
         filters = ProductFilter()
     
-    # Base query with eager loading
-    query = db.query(Product).options(
-        joinedload(Product.images),
-        joinedload(Product.categories),
-        joinedload(Product.variations)
-    )
+    if cursor is not None:
+        return get_products_by_cursor(db, cursor, per_page, filters)
     
-    # Apply active filter by default ONLY if not explicitly set in filters
-    # This prevents duplicate is_active filters in SQL
-    if filters.is_active is None:
-        query = query.filter(Product.is_active == True)
-    
-    # Apply filters (will handle is_active if it was explicitly set)
-    query = apply_product_filters(query, filters)
+    query = filtered_products_query(db, filters)
     
-    # Get total count before pagination
-    total = query.count()
+    # The total is cached per filter set; has_next comes from the page itself
+    total = get_products_count(db, filters)
     
     # Apply sorting
-    query = apply_sorting(query, filters.sort_by, filters.sort_order)
+    search = filters.search or ""
+    ranked = _ranks_by_relevance(query, filters)
+    if ranked:
+        query = query.order_by(desc(search_rank(search)), desc(Product.id))
+    else:
+        query = apply_sorting(query, filters.sort_by, filters.sort_order)
     
-    # Apply pagination
+    # Apply pagination; one extra row tells whether another page exists
     offset = (page - 1) * per_page
-    products = query.offset(offset).limit(per_page).all()
+    products = query.offset(offset).limit(per_page + 1).all()
+    has_next = len(products) > per_page
+    products = products[:per_page]
     
     # Calculate pagination meta
     total_pages = (total + per_page - 1) // per_page
     
+    # Same (sort key, id) cursor get_products_by_cursor issues, so deeper
+    # pages can seek instead of paying for an ever larger OFFSET
+    next_cursor = None
+    if has_next and products and not ranked:
+        sort_field = getattr(Product, filters.sort_by, Product.created_at)
+        next_cursor = encode_cursor(getattr(products[-1], sort_field.key), products[-1].id)
+    
     meta = PaginationMeta(
         total=total,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1
+        has_next=has_next,
+        has_prev=page > 1,
+        next_cursor=next_cursor
+    )
+    
+    return ProductListResponse(items=products, meta=meta)
+
+
+def get_products_by_cursor(
+    db: Session,
+    cursor: Optional[str] = None,
+    per_page: int = 20,
+    filters: Optional[ProductFilter] = None
+) -> ProductListResponse:
+    """
+    Get a page of products with optional filters using keyset pagination.
+    
+    Args:
+        db: Database session
+        cursor: next_cursor from the previous page, None for the first page
+        per_page: Items per page
+        filters: Optional filter parameters
+        
+    Returns:
+        ProductListResponse with items and next_cursor in the meta
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if filters is None:
+        filters = ProductFilter()
+    
+    query = filtered_products_query(db, filters)
+    
+    search = filters.search or ""
+    if _ranks_by_relevance(query, filters):
+        # The rank rides along as a column so the cursor can be built
+        # from the last row; most relevant first
+        rank = search_rank(search).label("search_rank")
+        products, next_cursor = cursor_page(
+            query.add_columns(rank),
+            rank,
+            Product.id,
+            cursor=cursor,
+            descending=True,
+            limit=per_page
+        )
+    else:
+        sort_field = getattr(Product, filters.sort_by, Product.created_at)
+        products, next_cursor = cursor_page(
+            query,
+            sort_field,
+            Product.id,
+            cursor=cursor,
+            descending=filters.sort_order == "desc",
+            limit=per_page
+        )
+    
+    meta = PaginationMeta(
+        per_page=per_page,
+        has_next=next_cursor is not None,
+        has_prev=cursor is not None,
+        next_cursor=next_cursor
     )
     
     return ProductListResponse(items=products, meta=meta)
@@ -197,6 +408,51 @@ def get_products_paginated(
 # PRODUCT CRUD OPERATIONS
 # =============================================================================
 
+def _unique_slug(db: Session, model, base_slug: str, exclude_id: Optional[int] = None) -> str:
+    """
+    base_slug, or base_slug-N with the lowest free N. Every slug already
+    taken with that prefix is fetched in one query instead of probing each
+    candidate in turn.
+    """
+    query = db.query(model.slug).filter(
+        or_(model.slug == base_slug, model.slug.startswith(f"{base_slug}-", autoescape=True))
+    )
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+    with db.no_autoflush:
+        taken = {slug for (slug,) in query}
+    
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
+# Inserts tried before a slug collision is reported
+SLUG_INSERT_ATTEMPTS = 3
+
+
+def _add_with_unique_slug(db: Session, product: Product, base_slug: str) -> None:
+    """
+    Add and flush a new product under the first free slug for base_slug.
+    The unique index on products.slug settles races: when a concurrent
+    insert takes the slug first, the insert is retried with the next one.
+    """
+    for attempt in range(SLUG_INSERT_ATTEMPTS):
+        product.slug = _unique_slug(db, Product, base_slug)
+        try:
+            with db.begin_nested():
+                db.add(product)
+                db.flush()
+            return
+        except IntegrityError:
+            # Anything but a lost slug race (e.g. a duplicate SKU) is re-raised
+            if attempt == SLUG_INSERT_ATTEMPTS - 1 or _unique_slug(db, Product, base_slug) == product.slug:
+                raise
+
+
 def create_product(db: Session, product_data: ProductCreate) -> Product:
     """Create a new product"""
     # Check SKU uniqueness
@@ -212,32 +468,18 @@ def create_product(db: Session, product_data: ProductCreate) -> Product:
     product_dict = product_data.model_dump(exclude={'category_ids', 'variations'})
     product = Product(**product_dict)
     
-    # Generate slug
-    product.slug = generate_slug(product.name)
-    
-    # Ensure unique slug
-    base_slug = product.slug
-    counter = 1
-    while db.query(Product).filter(Product.slug == product.slug).first():
-        product.slug = f"{base_slug}-{counter}"
-        counter += 1
     
     # Add categories
     if category_ids:
         categories = db.query(Category).filter(Category.id.in_(category_ids)).all()
         product.categories = categories
     
-    db.add(product)
-    db.flush()  # Get the product ID
-    
-    # Add variations
-    for var_data in variations_data:
-        variation = ProductVariation(
-            product_id=product.id,
-            **var_data.model_dump()
-        )
-        db.add(variation)
+    # Add variations; they are inserted with the product in one flush
+    product.variations = [
+        ProductVariation(**var_data.model_dump()) for var_data in variations_data
+    ]
     
+    _add_with_unique_slug(db, product, generate_slug(product.name))
     db.commit()
     db.refresh(product)
     
@@ -247,7 +489,7 @@ def create_product(db: Session, product_data: ProductCreate) -> Product:
 def create_product_simple(db: Session, product_data: ProductCreateSimple) -> Product:
     """Create a new product with simplified data - auto-generates SKU"""
     # Auto-generate unique SKU
-    sku = f"SKU-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+    sku = f"SKU-{date.today():%Y%m%d}-{secrets.token_hex(4).upper()}"
     
     # Create product with defaults
     product = Product(
@@ -262,15 +504,6 @@ def create_product_simple(db: Session, product_data: ProductCreateSimple) -> Pro
         is_featured=False,
     )
     
-    # Generate slug
-    product.slug = generate_slug(product.name)
-    
-    # Ensure unique slug
-    base_slug = product.slug
-    counter = 1
-    while db.query(Product).filter(Product.slug == product.slug).first():
-        product.slug = f"{base_slug}-{counter}"
-        counter += 1
     
     # Add category if provided
     if product_data.category_id:
@@ -278,7 +511,7 @@ def create_product_simple(db: Session, product_data: ProductCreateSimple) -> Pro
         if category:
             product.categories = [category]
     
-    db.add(product)
+    _add_with_unique_slug(db, product, generate_slug(product.name))
     db.commit()
     db.refresh(product)
     
@@ -309,15 +542,7 @@ def update_product(
     if 'name' in update_data:
         new_slug = generate_slug(product.name)
         if new_slug != product.slug:
-            base_slug = new_slug
-            counter = 1
-            while db.query(Product).filter(
-                Product.slug == new_slug,
-                Product.id != product_id
-            ).first():
-                new_slug = f"{base_slug}-{counter}"
-                counter += 1
-            product.slug = new_slug
+            product.slug = _unique_slug(db, Product, new_slug, exclude_id=product_id)
     
     # Update categories if provided
     if category_ids is not None:
@@ -374,17 +599,23 @@ def update_stock(
     Returns:
         Updated product or None if not found
     """
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        return None
-    
-    new_stock = product.stock + quantity_change
-    if new_stock < 0:
+    # One guarded UPDATE, so concurrent changes cannot overwrite each other
+    product = db.execute(
+        update(Product).where(
+            Product.id == product_id,
+            Product.stock + quantity_change >= 0
+        ).values(
+            stock=Product.stock + quantity_change
+        ).returning(Product).execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    
+    if product is None:
+        # No row updated: either no such product or stock would go negative
+        if not product_exists(db, product_id, include_inactive=True):
+            return None
         raise ValueError("Stock cannot be negative")
     
-    product.stock = new_stock
     db.commit()
-    db.refresh(product)
     
     return product
 
@@ -407,12 +638,17 @@ def check_stock_availability(
     return product.stock >= quantity, product.stock
 
 
+# Stock reports can cover most of the catalogue; rows are fetched through a
+# server-side cursor in batches of this size instead of one buffered result
+STOCK_REPORT_BATCH_SIZE = 500
+
+
 def get_low_stock_products(
     db: Session, 
     threshold: Optional[int] = None
 ) -> List[Product]:
     """Get products that are below their low stock threshold"""
-    query = db.query(Product).filter(Product.is_active == True)
+    query = db.query(Product).options(*product_list_options()).filter(Product.is_active == True)
     
     if threshold is not None:
         query = query.filter(Product.stock <= threshold)
@@ -420,15 +656,15 @@ def get_low_stock_products(
         # Use default threshold of 10
         query = query.filter(Product.stock <= 10)
     
-    return query.order_by(Product.stock.asc()).all()
+    return list(query.order_by(Product.stock.asc(), Product.id).yield_per(STOCK_REPORT_BATCH_SIZE))
 
 
 def get_out_of_stock_products(db: Session) -> List[Product]:
     """Get products with zero stock"""
-    return db.query(Product).filter(
+    return list(db.query(Product).options(*product_list_options()).filter(
         Product.is_active == True,
         Product.stock <= 0
-    ).all()
+    ).order_by(Product.id).yield_per(STOCK_REPORT_BATCH_SIZE))
 
 
 # =============================================================================
@@ -512,15 +748,17 @@ def add_product_image(
     """Add an image to a product"""
     # If this is primary, unset other primary images
     if is_primary:
-        db.query(ProductImage).filter(
-            ProductImage.product_id == product_id,
-            ProductImage.is_primary == True
-        ).update({"is_primary": False})
+        db.execute(
+            update(ProductImage).where(
+                ProductImage.product_id == product_id,
+                ProductImage.is_primary == True
+            ).values(is_primary=False)
+        )
         
         # Also update product's primary_image field
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if product:
-            product.primary_image = image_url
+        db.execute(
+            update(Product).where(Product.id == product_id).values(primary_image=image_url)
+        )
     
     image = ProductImage(
         product_id=product_id,
@@ -538,32 +776,30 @@ def add_product_image(
 
 def delete_product_image(db: Session, image_id: int) -> Optional[str]:
     """Delete a product image and return its URL for file deletion"""
-    image = db.query(ProductImage).filter(ProductImage.id == image_id).first()
-    if not image:
+    deleted = db.execute(
+        delete(ProductImage).where(ProductImage.id == image_id).returning(
+            ProductImage.image_url, ProductImage.product_id, ProductImage.is_primary
+        )
+    ).first()
+    if not deleted:
         return None
     
-    image_url = image.image_url
-    product_id = image.product_id
-    was_primary = image.is_primary
-    
-    db.delete(image)
+    image_url, product_id, was_primary = deleted
     
-    # If this was primary, set another image as primary
+    # If this was primary, promote the oldest remaining image (clearing the
+    # product's primary image when none is left)
     if was_primary:
-        next_image = db.query(ProductImage).filter(
+        next_image_id = select(ProductImage.id).where(
             ProductImage.product_id == product_id
-        ).first()
-        
-        if next_image:
-            next_image.is_primary = True
-            product = db.query(Product).filter(Product.id == product_id).first()
-            if product:
-                product.primary_image = next_image.image_url
-        else:
-            # No more images, clear product's primary image
-            product = db.query(Product).filter(Product.id == product_id).first()
-            if product:
-                product.primary_image = None
+        ).order_by(ProductImage.id).limit(1).scalar_subquery()
+        next_image_url = db.execute(
+            update(ProductImage).where(
+                ProductImage.id == next_image_id
+            ).values(is_primary=True).returning(ProductImage.image_url)
+        ).scalar_one_or_none()
+        db.execute(
+            update(Product).where(Product.id == product_id).values(primary_image=next_image_url)
+        )
     
     db.commit()
     
@@ -572,53 +808,30 @@ def delete_product_image(db: Session, image_id: int) -> Optional[str]:
 
 def set_primary_image(db: Session, product_id: int, image_id: int) -> bool:
     """Set a specific image as the primary image"""
-    # Unset current primary
-    db.query(ProductImage).filter(
-        ProductImage.product_id == product_id,
-        ProductImage.is_primary == True
-    ).update({"is_primary": False})
-    
-    # Set new primary
-    image = db.query(ProductImage).filter(
-        ProductImage.id == image_id,
-        ProductImage.product_id == product_id
-    ).first()
+    # Flag the new primary and unset the current one in one statement
+    changed = db.execute(
+        update(ProductImage).where(
+            ProductImage.product_id == product_id,
+            or_(ProductImage.is_primary == True, ProductImage.id == image_id)
+        ).values(
+            is_primary=ProductImage.id == image_id
+        ).returning(ProductImage.id, ProductImage.image_url)
+    ).all()
     
-    if not image:
+    image_url = next((url for id_, url in changed if id_ == image_id), None)
+    if image_url is None:
+        db.rollback()
         return False
     
-    image.is_primary = True
-    
     # Update product
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if product:
-        product.primary_image = image.image_url
+    db.execute(
+        update(Product).where(Product.id == product_id).values(primary_image=image_url)
+    )
     
     db.commit()
     return True
 
 
-# =============================================================================
-# REVIEWS
-# =============================================================================
-
-def update_product_rating(db: Session, product_id: int) -> None:
-    """Recalculate and update product rating based on reviews"""
-    result = db.query(
-        func.avg(Review.rating).label('avg_rating'),
-        func.count(Review.id).label('count')
-    ).filter(
-        Review.product_id == product_id,
-        Review.is_approved == True
-    ).first()
-    
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if product:
-        product.rating = result.avg_rating or 0
-        product.review_count = result.count or 0
-        db.commit()
-
-
 # =============================================================================
 # ANALYTICS
 # =============================================================================
@@ -639,17 +852,14 @@ def increment_sales_count(db: Session, product_id: int, quantity: int = 1) -> No
 
 def get_bestsellers(db: Session, limit: int = 10) -> List[Product]:
     """Get best-selling products (by is_bestseller flag or view_count)"""
-    return db.query(Product).filter(
+    return db.query(Product).options(*product_list_options()).filter(
         Product.is_active == True
     ).order_by(desc(Product.view_count)).limit(limit).all()
 
 
 def get_featured_products(db: Session, limit: int = 10) -> List[Product]:
     """Get featured products"""
-    return db.query(Product).options(
-        joinedload(Product.images),
-        joinedload(Product.categories)
-    ).filter(
+    return db.query(Product).options(*product_list_options()).filter(
         Product.is_active == True,
         Product.is_featured == True
     ).order_by(desc(Product.created_at)).limit(limit).all()
@@ -657,10 +867,7 @@ def get_featured_products(db: Session, limit: int = 10) -> List[Product]:
 
 def get_new_arrivals(db: Session, limit: int = 10) -> List[Product]:
     """Get newest products"""
-    return db.query(Product).options(
-        joinedload(Product.images),
-        joinedload(Product.categories)
-    ).filter(
+    return db.query(Product).options(*product_list_options()).filter(
         Product.is_active == True
     ).order_by(desc(Product.created_at)).limit(limit).all()
 
@@ -671,16 +878,17 @@ def get_related_products(
     limit: int = 4
 ) -> List[Product]:
     """Get related products based on categories"""
-    # Get product's categories
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product or not product.categories:
-        return []
-    
-    category_ids = [cat.id for cat in product.categories]
+    # Product's categories, straight from the association table
+    category_ids = select(ProductCategoryAssociation.category_id).where(
+        ProductCategoryAssociation.product_id == product_id
+    )
+    related_ids = select(ProductCategoryAssociation.product_id).where(
+        ProductCategoryAssociation.category_id.in_(category_ids)
+    )
     
     # Get products in same categories
-    return db.query(Product).join(Product.categories).filter(
-        Category.id.in_(category_ids),
+    return db.query(Product).options(*product_list_options()).filter(
+        Product.id.in_(related_ids),
         Product.id != product_id,
         Product.is_active == True
     ).order_by(desc(Product.rating)).limit(limit).all()
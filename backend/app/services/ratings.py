@@ -0,0 +1,110 @@
+"""
+Product Ratings
+Keeps products.rating and products.review_count in step with reviews.
+
+A new review is folded into the stored average with one O(1) UPDATE
+instead of re-aggregating every review of the product on the request
+path. A periodic recalculation restores the exact figures, correcting
+rounding drift and any change made outside the review endpoint.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.locks import JobLeadership
+from app.models.product import Product, Review
+
+logger = logging.getLogger(__name__)
+
+
+def add_review_to_rating(db: Session, product_id: int, rating: int) -> None:
+    """Fold one approved review into the product's average and count, then commit"""
+    db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(
+            # Both right-hand sides see the row's values before the update
+            rating=(Product.rating * Product.review_count + rating) / (Product.review_count + 1),
+            review_count=Product.review_count + 1,
+        )
+    )
+    db.commit()
+
+
+def _exact_rating():
+    """Correlated subqueries for a product's approved-review average and count"""
+    approved = and_(Review.product_id == Product.id, Review.is_approved == True)
+    exact_rating = select(
+        func.coalesce(func.round(func.avg(Review.rating), 1), 0)
+    ).where(approved).scalar_subquery()
+    exact_count = select(func.count(Review.id)).where(approved).scalar_subquery()
+    return exact_rating, exact_count
+
+
+def recalculate_product_rating(db: Session, product_id: int) -> None:
+    """
+    Recompute one product's rating and review count from its approved
+    reviews in a single UPDATE, then commit. Aggregate and write happen in
+    the same statement, so concurrent reviews cannot interleave between them.
+    """
+    exact_rating, exact_count = _exact_rating()
+    db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(rating=exact_rating, review_count=exact_count)
+    )
+    db.commit()
+
+
+def recalculate_product_ratings(db: Session) -> int:
+    """
+    Recompute every product's rating and review count from its approved
+    reviews, writing only the rows that drifted. Returns the rows updated.
+    """
+    exact_rating, exact_count = _exact_rating()
+
+    result = db.execute(
+        update(Product)
+        .where(or_(Product.rating != exact_rating, Product.review_count != exact_count))
+        .values(rating=exact_rating, review_count=exact_count)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+async def run_rating_recalculator(interval_seconds: int) -> None:
+    """Background loop recalculating product ratings every interval_seconds"""
+    from app.db.session import SessionLocal
+
+    # Every worker runs this loop; only the lock holder recalculates
+    leadership = JobLeadership("rating_recalculation")
+
+    def _recalculate() -> None:
+        if not leadership.acquire():
+            return
+        db = SessionLocal()
+        try:
+            recalculate_product_ratings(db)
+        finally:
+            db.close()
+
+    job = None
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            job = asyncio.ensure_future(asyncio.to_thread(_recalculate))
+            try:
+                await asyncio.shield(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to recalculate product ratings: {e}")
+    finally:
+        # A running thread cannot be cancelled and may still be using the
+        # lock's connection; let it finish before giving the lock up
+        if job is not None and not job.done():
+            await asyncio.wait([job])
+        leadership.release()
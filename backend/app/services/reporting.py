@@ -0,0 +1,157 @@
+"""
+Reporting Service - Dashboard sales aggregates backed by rollup views.
+
+Daily and per-category sales are read from the `sales_daily` and
+`category_sales_rollup` materialized views on PostgreSQL, which reduces
+the dashboard charts from a scan over every order to one row per day or
+category. When the views are unavailable (other databases, migration
+not applied) the same figures are aggregated live from the orders tables.
+"""
+import asyncio
+import logging
+from datetime import date
+from typing import List
+
+from sqlalchemy import Float, cast, desc, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.locks import JobLeadership
+from app.models.order import Order, OrderItem
+from app.models.product import Category, Product, ProductCategoryAssociation
+from app.models.reporting import category_sales_rollup, sales_daily
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_VIEWS = ("sales_daily", "category_sales_rollup")
+
+
+def rollups_available(db: Session) -> bool:
+    """Whether the rollup views can be used for this session's database"""
+    return settings.SALES_ROLLUPS_ENABLED and db.get_bind().dialect.name == "postgresql"
+
+
+def get_daily_sales(db: Session, start_date: date) -> List:
+    """
+    Paid order count and revenue per day since start_date (rows: date, order_count, revenue).
+    Revenue is cast to double precision in SQL; these figures are for display only.
+    """
+    if rollups_available(db):
+        try:
+            return db.query(
+                sales_daily.c.day.label('date'),
+                sales_daily.c.order_count,
+                cast(sales_daily.c.revenue, Float).label('revenue')
+            ).filter(
+                sales_daily.c.day >= start_date
+            ).order_by(
+                sales_daily.c.day
+            ).all()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"sales_daily rollup unavailable, aggregating live: {e}")
+
+    return db.query(
+        func.date(Order.created_at).label('date'),
+        func.count(Order.id).label('order_count'),
+        cast(func.sum(Order.total_amount), Float).label('revenue')
+    ).filter(
+        Order.created_at >= start_date,
+        Order.payment_status == "paid"
+    ).group_by(
+        func.date(Order.created_at)
+    ).order_by(
+        func.date(Order.created_at)
+    ).all()
+
+
+def get_category_sales(db: Session) -> List:
+    """
+    Paid sales per category (rows: id, name, order_count, items_sold, revenue).
+    Revenue is cast to double precision in SQL; these figures are for display only.
+    """
+    if rollups_available(db):
+        try:
+            return db.query(
+                category_sales_rollup.c.category_id.label('id'),
+                category_sales_rollup.c.name,
+                category_sales_rollup.c.order_count,
+                category_sales_rollup.c.items_sold,
+                cast(category_sales_rollup.c.revenue, Float).label('revenue')
+            ).order_by(
+                desc(category_sales_rollup.c.revenue)
+            ).all()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"category_sales_rollup unavailable, aggregating live: {e}")
+
+    return db.query(
+        Category.id,
+        Category.name,
+        func.count(OrderItem.id).label('order_count'),
+        func.coalesce(func.sum(OrderItem.quantity), 0).label('items_sold'),
+        cast(func.coalesce(func.sum(OrderItem.quantity * OrderItem.price), 0), Float).label('revenue')
+    ).outerjoin(
+        ProductCategoryAssociation,
+        ProductCategoryAssociation.category_id == Category.id
+    ).outerjoin(
+        Product,
+        Product.id == ProductCategoryAssociation.product_id
+    ).outerjoin(
+        OrderItem,
+        OrderItem.product_id == Product.id
+    ).outerjoin(
+        Order,
+        Order.id == OrderItem.order_id
+    ).filter(
+        Order.payment_status == "paid"
+    ).group_by(
+        Category.id,
+        Category.name
+    ).order_by(
+        desc('revenue')
+    ).all()
+
+
+def refresh_sales_rollups(db: Session) -> None:
+    """Refresh the rollup views without blocking readers"""
+    for view in ROLLUP_VIEWS:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+    db.commit()
+
+
+async def run_rollup_refresher(interval_seconds: int) -> None:
+    """Background loop refreshing the rollup views every interval_seconds"""
+    from app.db.session import SessionLocal
+
+    # Every worker runs this loop; only the lock holder refreshes
+    leadership = JobLeadership("sales_rollup_refresh")
+
+    def _refresh() -> None:
+        if not leadership.acquire():
+            return
+        db = SessionLocal()
+        try:
+            if rollups_available(db):
+                refresh_sales_rollups(db)
+        finally:
+            db.close()
+
+    job = None
+    try:
+        while True:
+            job = asyncio.ensure_future(asyncio.to_thread(_refresh))
+            try:
+                await asyncio.shield(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to refresh sales rollups: {e}")
+            await asyncio.sleep(interval_seconds)
+    finally:
+        # A running thread cannot be cancelled and may still be using the
+        # lock's connection; let it finish before giving the lock up
+        if job is not None and not job.done():
+            await asyncio.wait([job])
+        leadership.release()
@@ -2,11 +2,12 @@
 Upload Service
 File upload handling with validation, thumbnail generation, and storage management.
 """
+import asyncio
 import os
 import uuid
 import shutil
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import BinaryIO, Optional, Tuple, List, Union
 from datetime import datetime
 from io import BytesIO
 
@@ -24,8 +25,12 @@ from app.core.config import settings
 ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
 ALLOWED_MIME_TYPES = {'image/jpeg', 'image/png', 'image/webp'}
 
+# Leading bytes of the accepted formats (WebP is RIFF....WEBP)
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n')
+
 # Size limits
 MAX_FILE_SIZE = settings.MAX_FILE_SIZE  # 5MB default
+UPLOAD_CHUNK_SIZE = 64 * 1024
 MAX_IMAGES_PER_PRODUCT = 5
 
 # Image dimensions
@@ -66,12 +71,29 @@ def generate_unique_filename(original_filename: str, prefix: str = "") -> str:
     return f"{timestamp}_{unique_id}{ext}"
 
 
-def get_image_dimensions(file_content: bytes) -> Tuple[int, int]:
-    """Get image width and height"""
-    with Image.open(BytesIO(file_content)) as img:
+ImageSource = Union[bytes, BinaryIO, Path]
+
+
+def _image_source(source: ImageSource):
+    """Wrap raw bytes for Image.open; file objects and paths are read in place"""
+    if isinstance(source, (bytes, bytearray)):
+        return BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+
+def get_image_dimensions(source: ImageSource) -> Tuple[int, int]:
+    """Get image width and height (read from the header, not decoded)"""
+    with Image.open(_image_source(source)) as img:
         return img.size
 
 
+def has_image_signature(head: bytes) -> bool:
+    """Whether the leading bytes of a file match an accepted image format"""
+    return head.startswith(IMAGE_SIGNATURES) or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')
+
+
 def validate_image_dimensions(width: int, height: int) -> bool:
     """Validate image is not too large"""
     return width <= MAX_IMAGE_WIDTH and height <= MAX_IMAGE_HEIGHT
@@ -82,12 +104,12 @@ def validate_image_dimensions(width: int, height: int) -> bool:
 # =============================================================================
 
 def create_thumbnail(
-    image_content: bytes, 
+    image_content: ImageSource, 
     size: Tuple[int, int] = THUMBNAIL_SIZE,
     quality: int = 85
 ) -> bytes:
     """Create a thumbnail from image content"""
-    with Image.open(BytesIO(image_content)) as img:
+    with Image.open(_image_source(image_content)) as img:
         # Convert to RGB if necessary (for PNG with transparency)
         if img.mode in ('RGBA', 'P'):
             img = img.convert('RGB')
@@ -102,12 +124,12 @@ def create_thumbnail(
 
 
 def optimize_image(
-    image_content: bytes,
+    image_content: ImageSource,
     max_size: Tuple[int, int] = MEDIUM_SIZE,
     quality: int = 85
 ) -> Tuple[bytes, int, int]:
     """Optimize image for web: resize if too large and compress"""
-    with Image.open(BytesIO(image_content)) as img:
+    with Image.open(_image_source(image_content)) as img:
         original_format = img.format or 'JPEG'
         
         # Convert to RGB if necessary
@@ -140,14 +162,46 @@ def optimize_image(
 # VALIDATION
 # =============================================================================
 
+def _uploaded_size(file: UploadFile) -> int:
+    """Size of an upload, from the multipart parser or the spooled file itself"""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+def _verify_image(source: BinaryIO) -> Tuple[int, int]:
+    """Check an image decodes and is within the dimension limits"""
+    try:
+        with Image.open(_image_source(source)) as img:
+            img.verify()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image file"
+        )
+    
+    # verify() leaves the image unusable; reopen for the header
+    width, height = get_image_dimensions(source)
+    if not validate_image_dimensions(width, height):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Image too large. Maximum: {MAX_IMAGE_WIDTH}x{MAX_IMAGE_HEIGHT}px"
+        )
+    return width, height
+
+
 async def validate_upload_file(
     file: UploadFile,
     allowed_extensions: set = ALLOWED_EXTENSIONS,
     max_size: int = MAX_FILE_SIZE
-) -> bytes:
+) -> Tuple[int, int]:
     """
-    Validate uploaded file for extension, size, and content type.
-    Returns file content if valid.
+    Validate uploaded file for extension, size, signature, and content type.
+    Works on the spooled upload in place rather than reading it into
+    memory; returns the image's (width, height).
     """
     # Check file exists
     if not file or not file.filename:
@@ -171,39 +225,24 @@ async def validate_upload_file(
             detail=f"Invalid content type: {file.content_type}"
         )
     
-    # Read file content
-    content = await file.read()
-    
-    # Check file size
-    if len(content) > max_size:
+    # Check file size before touching the content
+    if _uploaded_size(file) > max_size:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size: {max_size // (1024 * 1024)}MB"
         )
     
-    # Validate it's actually an image
-    try:
-        with Image.open(BytesIO(content)) as img:
-            img.verify()
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid image file"
-        )
-    
-    # Re-read since verify() consumes the file
+    # Check the leading bytes match an image format
+    head = await file.read(16)
     await file.seek(0)
-    content = await file.read()
-    
-    # Check dimensions
-    width, height = get_image_dimensions(content)
-    if not validate_image_dimensions(width, height):
+    if not has_image_signature(head):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Image too large. Maximum: {MAX_IMAGE_WIDTH}x{MAX_IMAGE_HEIGHT}px"
+            detail="Invalid image file"
         )
     
-    return content
+    # Validate it's actually an image (off the event loop)
+    return await asyncio.to_thread(_verify_image, file.file)
 
 
 # =============================================================================
@@ -248,29 +287,32 @@ async def save_product_image(
     ensure_upload_dirs()
     
     # Validate file
-    content = await validate_upload_file(file)
+    width, height = await validate_upload_file(file)
     
     # Generate filename
     prefix = f"product_{product_id}" if product_id else "product"
     filename = generate_unique_filename(file.filename, prefix)
-    
-    # Optimize image if requested
-    if optimize:
-        content, width, height = optimize_image(content)
-    else:
-        width, height = get_image_dimensions(content)
-    
-    # Save main image
     image_path = PRODUCTS_DIR / filename
-    with open(image_path, 'wb') as f:
-        f.write(content)
-    
-    # Create and save thumbnail
-    thumbnail_content = create_thumbnail(content)
     thumbnail_filename = f"thumb_{filename.rsplit('.', 1)[0]}.jpg"
     thumbnail_path = THUMBNAILS_DIR / thumbnail_filename
-    with open(thumbnail_path, 'wb') as f:
-        f.write(thumbnail_content)
+    
+    def store() -> Tuple[int, int, int]:
+        # Optimize image if requested, otherwise copy the upload in chunks
+        if optimize:
+            content, out_width, out_height = optimize_image(file.file)
+            image_path.write_bytes(content)
+        else:
+            file.file.seek(0)
+            with open(image_path, 'wb') as f:
+                shutil.copyfileobj(file.file, f, UPLOAD_CHUNK_SIZE)
+            content, out_width, out_height = image_path, width, height
+        
+        # Create and save thumbnail
+        thumbnail_path.write_bytes(create_thumbnail(content))
+        return image_path.stat().st_size, out_width, out_height
+    
+    # Image processing and disk writes run off the event loop
+    file_size, width, height = await asyncio.to_thread(store)
     
     # Generate URLs (relative to static mount)
     image_url = f"/uploads/products/{filename}"
@@ -280,7 +322,7 @@ async def save_product_image(
         filename=filename,
         image_url=image_url,
         thumbnail_url=thumbnail_url,
-        file_size=len(content),
+        file_size=file_size,
         width=width,
         height=height
     )
@@ -290,17 +332,18 @@ async def save_category_image(file: UploadFile, category_id: Optional[int] = Non
     """Save a category image and return the URL"""
     ensure_upload_dirs()
     
-    content = await validate_upload_file(file)
-    
-    # Optimize for category images (smaller size)
-    content, _, _ = optimize_image(content, max_size=(600, 600))
+    await validate_upload_file(file)
     
     prefix = f"category_{category_id}" if category_id else "category"
     filename = generate_unique_filename(file.filename, prefix)
-    
     image_path = CATEGORIES_DIR / filename
-    with open(image_path, 'wb') as f:
-        f.write(content)
+    
+    def store() -> None:
+        # Optimize for category images (smaller size)
+        content, _, _ = optimize_image(file.file, max_size=(600, 600))
+        image_path.write_bytes(content)
+    
+    await asyncio.to_thread(store)
     
     return f"/uploads/categories/{filename}"
 
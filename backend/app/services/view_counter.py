@@ -0,0 +1,153 @@
+"""
+Product View Counter
+Batches product view increments so detail reads never write to products.
+
+Views are counted with HINCRBY in a Redis hash and flushed to
+products.view_count periodically as one UPDATE per product. Without
+Redis each view falls back to a background task that issues the UPDATE
+after the response has been sent.
+"""
+import asyncio
+import logging
+from uuid import uuid4
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+
+from app.core.cache import KEY_PREFIX, get_redis, reset_client
+from app.models.product import Product
+from app.services import product_service
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTS_KEY = f"{KEY_PREFIX}:product_views"
+FLUSH_LEASE_KEY = f"{VIEW_COUNTS_KEY}:flush_lease"
+CLAIM_TTL_SECONDS = 24 * 3600
+
+
+def record_product_view(product_id: int) -> bool:
+    """Count a view in Redis; returns False when Redis is unavailable"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        client.hincrby(VIEW_COUNTS_KEY, str(product_id), 1)
+    except Exception as e:
+        logger.warning(f"Failed to record view for product {product_id}: {e}")
+        reset_client()
+        return False
+    return True
+
+
+def increment_view_count_in_background(product_id: int) -> None:
+    """Fallback for BackgroundTasks: increment directly with its own session"""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        product_service.increment_view_count(db, product_id)
+    finally:
+        db.close()
+
+
+def flush_view_counts(db: Session) -> int:
+    """
+    Move the pending view counts from Redis into products.view_count.
+    The hash is renamed to a key unique to this flush before reading, so
+    views recorded meanwhile land in a fresh hash and no other flush can
+    read the same batch. If the UPDATE fails the counts are merged back
+    into the live hash. Returns the number of products updated.
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+
+    claim_key = f"{VIEW_COUNTS_KEY}:flushing:{uuid4().hex}"
+    try:
+        if not client.exists(VIEW_COUNTS_KEY):
+            return 0
+        pipe = client.pipeline()
+        pipe.rename(VIEW_COUNTS_KEY, claim_key)
+        # An abandoned claim (crashed worker) expires instead of leaking
+        pipe.expire(claim_key, CLAIM_TTL_SECONDS)
+        pipe.hgetall(claim_key)
+        pending = pipe.execute()[-1]
+    except Exception as e:
+        logger.warning(f"Failed to claim pending view counts: {e}")
+        reset_client()
+        return 0
+
+    params = [
+        {"product_id": int(product_id), "delta": int(delta)}
+        for product_id, delta in pending.items()
+    ]
+    try:
+        if params:
+            table = Product.__table__
+            db.execute(
+                table.update()
+                .where(table.c.id == bindparam("product_id"))
+                .values(view_count=table.c.view_count + bindparam("delta")),
+                params
+            )
+            db.commit()
+    except Exception:
+        db.rollback()
+        _restore_view_counts(client, claim_key, pending)
+        raise
+
+    try:
+        client.delete(claim_key)
+    except Exception as e:
+        # The counts are already applied; the claim key just expires
+        logger.warning(f"Failed to delete flushed view counts: {e}")
+        reset_client()
+    return len(params)
+
+
+def _restore_view_counts(client, claim_key: str, pending: dict) -> None:
+    """Merge a claimed batch back into the live hash after a failed flush"""
+    try:
+        pipe = client.pipeline()
+        for product_id, delta in pending.items():
+            pipe.hincrby(VIEW_COUNTS_KEY, product_id, int(delta))
+        pipe.delete(claim_key)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to restore pending view counts: {e}")
+        reset_client()
+
+
+def _take_flush_lease(seconds: int) -> bool:
+    """Let one process per interval flush; False when another holds the lease"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        return bool(client.set(FLUSH_LEASE_KEY, "1", nx=True, ex=seconds))
+    except Exception as e:
+        logger.warning(f"Failed to take view count flush lease: {e}")
+        reset_client()
+        return False
+
+
+async def run_view_count_flusher(interval_seconds: int) -> None:
+    """Background loop flushing view counts every interval_seconds"""
+    from app.db.session import SessionLocal
+
+    def _flush() -> None:
+        # Every worker runs this loop; only the lease holder flushes
+        if not _take_flush_lease(interval_seconds):
+            return
+        db = SessionLocal()
+        try:
+            flush_view_counts(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(_flush)
+        except Exception as e:
+            logger.warning(f"Failed to flush product view counts: {e}")
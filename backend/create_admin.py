@@ -14,6 +14,7 @@ Environment variables (optional):
 """
 import argparse
 import os
+import re
 import sys
 import getpass
 from datetime import datetime, timezone
@@ -27,19 +28,20 @@ from app.core.security import get_password_hash, check_password_strength
 from app.core.config import settings
 
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+
 def validate_email(email: str) -> bool:
     """Basic email validation"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def validate_username(username: str) -> bool:
     """Validate username format"""
-    import re
     if len(username) < 3 or len(username) > 50:
         return False
-    return re.match(r'^[a-zA-Z0-9_-]+$', username) is not None
+    return USERNAME_PATTERN.match(username) is not None
 
 
 def create_admin_user(
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Uvicorn configuration for development server with optimized settings
+to reduce excessive reloading and improve performance.
+"""
+
+from uvicorn_config import *  # noqa: F401,F403
+from uvicorn_config import backend_dir
+
+workers = 1
+
+# Reload configuration - optimized to reduce excessive reloading
+reload = True
+reload_dirs = [str(backend_dir / "app")]  # Only watch app directory
+reload_includes = ["*.py"]  # Only Python changes need a backend reload
+reload_excludes = [
+    "*.pyc",
+    "*.pyo",
+    "__pycache__",
+    ".git",
+    "node_modules",
+    "*.log",
+    "*.tmp",
+    "logs/",
+    "postgres-db/",
+    "postgres-debug-log/",
+    "uploads/",
+    "*.sqlite",
+    "*.db",
+    "alembic/versions/*.py",  # Don't reload on migration files
+    "*.md",
+    "*.swp",
+    "*~",
+    "*.ipynb_checkpoints*",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+]
+# Editors save atomically (temp file + rename) and git checkouts touch many
+# files at once; wait long enough to fold a burst into one reload
+reload_delay = 1.0
+
+# Logging
+log_level = "info"
+access_log = True
+
+debug = True
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Uvicorn configuration for production: no reloader, one worker process
+per core (times two, plus one) and no per-request access log.
+"""
+
+import os
+
+from uvicorn_config import *  # noqa: F401,F403
+
+workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+
+reload = False
+
+# Recycle each worker after this many requests (plus up to the jitter, so
+# workers do not restart together); the supervisor starts a replacement
+max_requests = 1000
+max_requests_jitter = 50
+
+# Logging; access lines come from the proxy in front of the app
+log_level = "warning"
+access_log = False
+
+debug = False
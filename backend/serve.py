@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Start the API with uvicorn. UVICORN_ENV=production runs the prod_config
+profile; anything else runs dev_config.
+"""
+
+import importlib
+import os
+
+import uvicorn
+
+
+def load_profile():
+    """The settings module for UVICORN_ENV"""
+    production = os.getenv("UVICORN_ENV", "development") == "production"
+    return importlib.import_module("prod_config" if production else "dev_config")
+
+
+def main() -> None:
+    config = load_profile()
+    options = dict(
+        host=config.host,
+        port=config.port,
+        loop=config.loop,
+        http=config.http,
+        log_level=config.log_level,
+        access_log=config.access_log,
+        timeout_keep_alive=config.timeout_keep_alive,
+        backlog=config.backlog,
+        limit_concurrency=config.limit_concurrency,
+        h11_max_incomplete_event_size=config.h11_max_incomplete_event_size,
+    )
+    if config.reload:
+        options.update(
+            reload=True,
+            reload_dirs=config.reload_dirs,
+            reload_includes=config.reload_includes,
+            reload_excludes=config.reload_excludes,
+            reload_delay=config.reload_delay,
+        )
+    else:
+        options["workers"] = config.workers
+        # Only a multi-worker supervisor replaces a worker that exits at
+        # its request limit; a lone process would just stop serving
+        if config.workers > 1:
+            options.update(
+                limit_max_requests=config.max_requests,
+                limit_max_requests_jitter=config.max_requests_jitter,
+            )
+    uvicorn.run(config.application, **options)
+
+
+if __name__ == "__main__":
+    main()
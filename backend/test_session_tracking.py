@@ -1,67 +1,170 @@
 #!/usr/bin/env python3
 """
 Test script for session tracking endpoints
+
+Without arguments it runs the smoke test below. --load N turns it into a
+load generator for the track-activities endpoint that reports request
+rate, latency percentiles and errors, and exits nonzero when p95 is over
+--max-p95-ms.
 """
-import requests
-import json
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+import orjson
 
 BASE_URL = "http://localhost:8000/api/v1/cart"
 
-def test_session_tracking():
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+activities = [
+    (8, "view"),
+    (7, "view"),
+    (6, "add_to_cart"),
+    (8, "add_to_cart"),
+    (7, "remove_from_cart")
+]
+
+# Request body for the activities above, encoded once
+ACTIVITY_BATCH = orjson.dumps({"activities": [
+    {"product_id": product_id, "activity_type": activity_type}
+    for product_id, activity_type in activities
+]})
+
+
+async def run_smoke_test():
+    # One pooled client for every call instead of a socket per request
+    async with httpx.AsyncClient(base_url=BASE_URL) as http:
+        await _run(http)
+
+
+async def _run(http):
     # Test session ID
     session_id = "test-session-123"
+    count_url = f"/session/{session_id}/product-count"
+    track_url = f"/session/{session_id}/track-activities"
+    stats_url = f"/session/{session_id}/statistics"
 
     print("=== Testing Session Tracking Endpoints ===\n")
 
     # 1. Get initial product count (should be 0)
     print("1. Getting initial product count...")
-    response = requests.get(f"{BASE_URL}/session/{session_id}/product-count")
+    response = await http.get(count_url)
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"   Initial count: {data['product_count']}")
     else:
         print(f"   Error: {response.status_code} - {response.text}")
         return
 
-    # 2. Track some activities
+    # 2. Track some activities, all in one batch request
     print("\n2. Tracking session activities...")
-    activities = [
-        (8, "view"),
-        (7, "view"),
-        (6, "add_to_cart"),
-        (8, "add_to_cart"),
-        (7, "remove_from_cart")
-    ]
-
-    for product_id, activity_type in activities:
-        response = requests.post(
-            f"{BASE_URL}/session/{session_id}/track-activity",
-            params={"product_id": product_id, "activity_type": activity_type}
-        )
-        if response.status_code == 200:
+    response = await http.post(track_url, content=ACTIVITY_BATCH, headers=JSON_HEADERS)
+    # One response covers the whole batch, so check it once
+    if response.status_code == 200:
+        for product_id, activity_type in activities:
             print(f"   ✓ Tracked {activity_type} for product {product_id}")
-        else:
+    else:
+        for product_id, activity_type in activities:
             print(f"   ✗ Failed to track {activity_type} for product {product_id}: {response.status_code}")
 
+    # Steps 3 and 4 are independent reads; fetch them together
+    count_response, stats_response = await asyncio.gather(
+        http.get(count_url),
+        http.get(stats_url)
+    )
+
     # 3. Get updated product count
     print("\n3. Getting updated product count...")
-    response = requests.get(f"{BASE_URL}/session/{session_id}/product-count")
+    response = count_response
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"   Updated count: {data['product_count']}")
     else:
         print(f"   Error: {response.status_code} - {response.text}")
 
     # 4. Get session statistics
     print("\n4. Getting session statistics...")
-    response = requests.get(f"{BASE_URL}/session/{session_id}/statistics")
+    response = stats_response
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print("   Session statistics:")
         for key, value in data.items():
             print(f"     {key}: {value}")
     else:
         print(f"   Error: {response.status_code} - {response.text}")
 
+async def run_load(total: int, concurrency: int, session_prefix: str) -> float:
+    """
+    Send `total` activity batches, at most `concurrency` at a time, one
+    session per request. Prints a summary; returns p95 latency in ms.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies: list = []
+    errors = 0
+
+    async def track(http, i):
+        nonlocal errors
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                response = await http.post(
+                    f"/session/{session_prefix}-{i}/track-activities",
+                    content=ACTIVITY_BATCH, headers=JSON_HEADERS
+                )
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if not ok:
+                errors += 1
+
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(track(http, i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+
+    print(f"=== Load: {total} requests, concurrency {concurrency} ===")
+    print(f"   Rate:    {total / elapsed:.1f} req/s over {elapsed:.2f}s")
+    print(f"   Latency: p50 {p50:.1f}ms  p95 {p95:.1f}ms  p99 {p99:.1f}ms")
+    print(f"   Errors:  {errors} ({errors / total:.1%})")
+    return p95
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Session tracking smoke test and load generator")
+    parser.add_argument("--load", "--total", dest="total", type=int, metavar="N",
+                        help="Send N activity batches instead of running the smoke test")
+    parser.add_argument("--concurrency", "-c", type=int, default=10,
+                        help="Requests in flight at once in load mode (default: 10)")
+    parser.add_argument("--session-prefix", default="load-session",
+                        help="Session id prefix for load mode requests")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="Exit with status 1 when p95 latency exceeds this many ms")
+    args = parser.parse_args()
+
+    if args.total is None:
+        asyncio.run(run_smoke_test())
+        return 0
+    if args.total < 1 or args.concurrency < 1:
+        parser.error("--load and --concurrency must be positive")
+
+    p95 = asyncio.run(run_load(args.total, args.concurrency, args.session_prefix))
+    if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        print(f"   p95 {p95:.1f}ms exceeds {args.max_p95_ms:.1f}ms")
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
-    test_session_tracking()
\ No newline at end of file
+    sys.exit(main())
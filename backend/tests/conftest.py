@@ -9,14 +9,15 @@ import sys
 # Add the backend directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.customer import User, Role
 from app.core.security import get_password_hash, create_access_token
 
@@ -25,8 +26,11 @@ from app.core.security import get_password_hash, create_access_token
 # TEST DATABASE
 # =============================================================================
 
-# Use in-memory SQLite for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Use in-memory SQLite for testing. The database is named and in shared-cache
+# mode so the async engine (for `async def` endpoints) sees the same tables
+# and rows; the sync engine's single connection keeps it alive.
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:neatify_test?mode=memory&cache=shared&uri=true"
+SQLALCHEMY_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///file:neatify_test?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -34,7 +38,18 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, poolclass=NullPool)
+
+
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def _read_uncommitted(dbapi_connection, connection_record):
+    """Shared-cache readers would otherwise hold table locks that block the other engine's writes"""
+    dbapi_connection.execute("PRAGMA read_uncommitted = 1")
+
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 
 
 def override_get_db():
@@ -46,8 +61,15 @@ def override_get_db():
         db.close()
 
 
-# Apply the override
+async def override_get_async_db():
+    """Override async database dependency for testing"""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+# Apply the overrides
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 
 # =============================================================================
@@ -71,8 +93,12 @@ def db():
 
 
 @pytest.fixture(scope="function")
-def client(db):
+def client(db, monkeypatch):
     """Create a test client with database session"""
+    # Test modules that install their own get_db override at import time
+    # would otherwise point this client at their database
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
     return TestClient(app)
 
 
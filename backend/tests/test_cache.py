@@ -0,0 +1,336 @@
+"""
+Response Cache Tests
+Tests for the Redis-backed cache helpers and the cached() decorator,
+run against a small in-memory stand-in for the Redis client.
+"""
+import time
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.core.config import settings
+
+
+class StubRedis:
+    """The subset of redis.Redis (decode_responses=True) the cache uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def _live(self, key):
+        expires_at = self.expiry.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return self.data.get(key)
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        return self._live(key)
+
+    def mget(self, *keys):
+        return [self._live(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = value.decode() if isinstance(value, bytes) else value
+        self.expiry[key] = time.time() + ex if ex else None
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        members = self.data.get(key, {})
+        for member in [m for m, score in members.items() if score <= float(high)]:
+            del members[member]
+
+    def zrange(self, key, start, end):
+        members = self.data.get(key, {})
+        return sorted(members, key=members.get)
+
+    def pipeline(self):
+        return StubPipeline(self)
+
+
+class StubPipeline:
+    """Queues calls and runs them on execute(), like a MULTI/EXEC pipeline"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.client, name), args, kwargs))
+        return queue
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class BrokenRedis(StubRedis):
+    """A client whose every command fails, as when Redis goes away"""
+
+    def get(self, key):
+        raise ConnectionError("Redis went away")
+
+    def mget(self, *keys):
+        raise ConnectionError("Redis went away")
+
+
+@pytest.fixture
+def redis_stub(monkeypatch):
+    """Enable caching against a fresh StubRedis"""
+    stub = StubRedis()
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://stub")
+    monkeypatch.setattr(cache, "_client", stub)
+    monkeypatch.setattr(cache, "_local_cache", cache.LocalTTLCache(cache.LOCAL_CACHE_MAXSIZE))
+    return stub
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    """Caching configured but no Redis client available"""
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://stub")
+    monkeypatch.setattr(cache, "_client", None)
+    monkeypatch.setattr(cache, "_retry_at", time.monotonic() + 60)
+    monkeypatch.setattr(cache, "_local_cache", cache.LocalTTLCache(cache.LOCAL_CACHE_MAXSIZE))
+
+
+def make_app(calls, **cache_options):
+    """App with one cached endpoint that records how often it runs"""
+    app = FastAPI()
+
+    @app.get("/items")
+    @cache.cached("items", ttl=60, **cache_options)
+    def list_items(request: Request, response: Response, page: int = 1):
+        calls.append(page)
+        return {"page": page, "items": ["a", "b"]}
+
+    return app
+
+
+# =============================================================================
+# CACHE HELPERS
+# =============================================================================
+
+class TestCacheHelpers:
+    """Tests for the get/set/delete helpers"""
+
+    def test_make_key_sorts_params(self):
+        """Test keys do not depend on parameter order"""
+        key = cache.make_key("products", "list", {"page": 2, "brand": "x"})
+        assert key == "neatify:products:list:brand=x,page=2"
+
+    @pytest.mark.parametrize("header, matches", [
+        ('W/"abc-1"', True),
+        ('"abc-1"', True),
+        ('"other", W/"abc-1"', True),
+        ("*", True),
+        ('"other"', False),
+        ("", False),
+        (None, False),
+    ])
+    def test_etag_matches(self, header, matches):
+        """Test If-None-Match lists, `*` and weak comparison"""
+        assert cache.etag_matches(header, 'W/"abc-1"') is matches
+
+    def test_set_and_get(self, redis_stub):
+        """Test a stored value is returned with its ETag"""
+        key = cache.make_key("products", "count", {"q": "phone"})
+        etag = cache.cache_set(key, {"count": 3}, ttl=60)
+
+        assert cache.cache_get(key) == {"count": 3}
+        assert cache.cache_get_with_etag(key) == ({"count": 3}, etag)
+
+    def test_miss(self, redis_stub):
+        """Test a missing key reads as None"""
+        key = cache.make_key("products", "count", {"q": "none"})
+        assert cache.cache_get(key) is None
+        assert cache.cache_get_with_etag(key) == (None, None)
+
+    def test_ttl_jitter(self, redis_stub):
+        """Test jitter lengthens the TTL by at most `jitter` seconds"""
+        key = cache.make_key("products", "count")
+        before = time.time()
+        cache.cache_set(key, 1, ttl=60, jitter=30)
+
+        ttl = redis_stub.expiry[key] - before
+        assert 59 <= ttl <= 91
+
+    def test_cache_delete(self, redis_stub):
+        """Test deleting a key also drops its ETag"""
+        key = cache.make_key("cart", "summary", {"user": 1})
+        cache.cache_set(key, {"items": 0})
+        cache.cache_delete(key)
+
+        assert key not in redis_stub.data
+        assert key + cache.ETAG_SUFFIX not in redis_stub.data
+
+    def test_invalidate_namespace(self, redis_stub):
+        """Test only the namespace's entries and ETags are deleted"""
+        first = cache.make_key("products", "list", {"page": 1})
+        second = cache.make_key("products", "list", {"page": 2})
+        other = cache.make_key("dashboard", "stats")
+        for key in (first, second, other):
+            cache.cache_set(key, {"ok": True})
+
+        cache.invalidate_namespace("products")
+
+        assert cache.cache_get(first) is None
+        assert cache.cache_get(second) is None
+        assert first + cache.ETAG_SUFFIX not in redis_stub.data
+        assert cache.cache_get(other) == {"ok": True}
+
+    def test_invalidate_namespace_indexes_later_writes(self, redis_stub):
+        """Test entries written after an invalidation are invalidated next time"""
+        key = cache.make_key("products", "list", {"page": 1})
+        cache.cache_set(key, 1)
+        cache.invalidate_namespace("products")
+        cache.cache_set(key, 2)
+        cache.invalidate_namespace("products")
+
+        assert cache.cache_get(key) is None
+
+    def test_refill_lock(self, redis_stub):
+        """Test only one caller gets the refill lock until it is released"""
+        key = cache.make_key("products", "list")
+        assert cache._acquire_refill_lock(key) is True
+        assert cache._acquire_refill_lock(key) is False
+        cache._release_refill_lock(key)
+        assert cache._acquire_refill_lock(key) is True
+
+    def test_noop_without_redis(self, redis_down):
+        """Test the helpers do nothing when Redis is unavailable"""
+        key = cache.make_key("products", "count")
+        assert cache.cache_set(key, 1) is None
+        assert cache.cache_get(key) is None
+        cache.cache_delete(key)
+        cache.invalidate_namespace("products")
+
+    def test_read_error_drops_client(self, redis_stub, monkeypatch):
+        """Test a failing Redis read is a miss and resets the client"""
+        monkeypatch.setattr(cache, "_client", BrokenRedis())
+        assert cache.cache_get(cache.make_key("products", "count")) is None
+        assert cache._client is None
+
+
+class TestLocalTTLCache:
+    """Tests for the per-worker LRU"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry goes first"""
+        local = cache.LocalTTLCache(maxsize=2)
+        local.set("a", 1, ttl=60)
+        local.set("b", 2, ttl=60)
+        local.get("a")
+        local.set("c", 3, ttl=60)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_expired_entry_is_a_miss(self, monkeypatch):
+        """Test entries are not served past their TTL"""
+        local = cache.LocalTTLCache(maxsize=2)
+        local.set("a", 1, ttl=5)
+        later = time.monotonic() + 10
+        monkeypatch.setattr(cache.time, "monotonic", lambda: later)
+
+        assert local.get("a") is None
+
+    def test_invalidate_prefix(self):
+        """Test invalidating a prefix keeps other entries"""
+        local = cache.LocalTTLCache(maxsize=4)
+        local.set("neatify:products:a", 1, ttl=60)
+        local.set("neatify:cart:a", 2, ttl=60)
+        local.invalidate_prefix("neatify:products:")
+
+        assert local.get("neatify:products:a") is None
+        assert local.get("neatify:cart:a") == 2
+
+
+# =============================================================================
+# CACHED DECORATOR
+# =============================================================================
+
+class TestCachedEndpoint:
+    """Tests for endpoints wrapped in cached()"""
+
+    def test_second_call_is_served_from_cache(self, redis_stub):
+        """Test the endpoint runs once per distinct set of parameters"""
+        calls = []
+        client = TestClient(make_app(calls))
+
+        assert client.get("/items?page=1").json() == {"page": 1, "items": ["a", "b"]}
+        assert client.get("/items?page=1").json() == {"page": 1, "items": ["a", "b"]}
+        client.get("/items?page=2")
+
+        assert calls == [1, 2]
+
+    def test_etag_not_modified(self, redis_stub):
+        """Test a request carrying the entry's ETag gets an empty 304"""
+        client = TestClient(make_app([]))
+        etag = client.get("/items").headers["ETag"]
+
+        response = client.get("/items", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_stale_etag_gets_full_response(self, redis_stub):
+        """Test an ETag from an older entry gets the current body"""
+        client = TestClient(make_app([]))
+        client.get("/items")
+
+        response = client.get("/items", headers={"If-None-Match": 'W/"stale-1"'})
+
+        assert response.status_code == 200
+        assert response.json()["page"] == 1
+
+    def test_raw_response(self, redis_stub):
+        """Test raw mode sends the stored JSON on misses and hits"""
+        calls = []
+        client = TestClient(make_app(calls, raw=True))
+
+        first = client.get("/items")
+        second = client.get("/items")
+
+        assert first.json() == second.json() == {"page": 1, "items": ["a", "b"]}
+        assert second.headers["content-type"] == "application/json"
+        assert calls == [1]
+
+    def test_local_cache_survives_redis_outage(self, redis_stub, monkeypatch):
+        """Test local_ttl keeps serving hits from this worker's LRU"""
+        calls = []
+        client = TestClient(make_app(calls, local_ttl=30))
+        client.get("/items")
+        monkeypatch.setattr(cache, "_client", BrokenRedis())
+
+        assert client.get("/items").json()["page"] == 1
+        assert calls == [1]
+
+    def test_runs_endpoint_without_redis(self, redis_down):
+        """Test the endpoint runs on every call when Redis is unavailable"""
+        calls = []
+        client = TestClient(make_app(calls))
+
+        assert client.get("/items").json() == {"page": 1, "items": ["a", "b"]}
+        client.get("/items")
+
+        assert calls == [1, 1]
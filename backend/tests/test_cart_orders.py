@@ -6,12 +6,15 @@ import pytest
 from decimal import Decimal
 from datetime import datetime, timedelta
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from app.models.cart import Cart, CartItem, CartStatus
 from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus
 from app.models.product import Product, Category
 from app.models.customer import User, Role, Address
 from app.core.security import get_password_hash, create_access_token
+from app.schemas.cart import MAX_TRACKED_ACTIVITIES
 from app.services.cart_service import CartService, CartError
 from app.services.orders import OrderService, OrderError
 
@@ -293,7 +296,59 @@ class TestCartService:
         # Session cart should be marked as converted
         db.refresh(session_cart)
         assert session_cart.status == CartStatus.CONVERTED.value
-
+    
+    def test_handle_guest_user_cart(self, db):
+        """Test a guest cart is kept alive, then merged and retired at login"""
+        from app.schemas.cart import CartItemCreate
+        
+        user = User(
+            email="guest-login@example.com",
+            username="guestlogin",
+            full_name="Guest Login",
+            hashed_password=get_password_hash("password123"),
+            role=Role.USER.value,
+            is_active=True,
+        )
+        products = [
+            Product(
+                name=f"Guest Product {i}",
+                slug=f"guest-product-{i}",
+                sku=f"GUEST-{i:03d}",
+                price=Decimal("25.00"),
+                stock=10,
+                is_active=True,
+            )
+            for i in range(3)
+        ]
+        db.add_all([user, *products])
+        db.commit()
+        
+        session_id = CartService.generate_session_id()
+        guest_cart = CartService.get_or_create_cart(db, session_id=session_id)
+        for product in products:
+            CartService.add_item(db, guest_cart, CartItemCreate(product_id=product.id, quantity=2))
+        
+        # Three tracked items in the cart earn the longer guest expiry
+        result = CartService.handle_guest_user_cart(
+            db, session_id, product_ids=[p.id for p in products]
+        )
+        
+        assert result["status"] == "handled"
+        assert result["actions"] == ["multi_item_extension"]
+        assert result["expires_at"] > datetime.utcnow() + timedelta(hours=119)
+        
+        # Logging in moves the guest items into the user's cart
+        user_cart = CartService.merge_session_cart(db, user, session_id)
+        
+        assert user_cart is not None
+        assert user_cart.user_id == user.id
+        assert sorted((item.product_id, item.quantity) for item in user_cart.items) == [
+            (product.id, 2) for product in products
+        ]
+        
+        db.refresh(guest_cart)
+        assert guest_cart.status == CartStatus.CONVERTED.value
+        assert CartService.handle_guest_user_cart(db, session_id)["status"] == "no_cart"
 
 # =============================================================================
 # CART ROUTER TESTS
@@ -412,6 +467,77 @@ class TestCartRouter:
         assert response.status_code == 200
         assert len(response.json()["items"]) == 1
 
+    @pytest.mark.parametrize("if_none_match", [
+        "{etag}",
+        '"stale", {etag}',
+        "*",
+    ])
+    def test_get_cart_not_modified(self, client, db, if_none_match):
+        """Test a request carrying the cart's current ETag gets a 304"""
+        user = User(
+            email="etag@example.com",
+            username="etaguser",
+            full_name="ETag User",
+            hashed_password=get_password_hash("TestPass123!"),
+            role=Role.USER.value,
+            is_active=True,
+        )
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(subject=user.email, role=user.role)}"}
+        
+        response = client.get("/api/v1/cart", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        
+        response = client.get(
+            "/api/v1/cart",
+            headers={**headers, "If-None-Match": if_none_match.format(etag=etag)},
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        
+        response = client.get("/api/v1/cart", headers={**headers, "If-None-Match": '"stale"'})
+        assert response.status_code == 200
+    
+    def test_track_activities_batch(self, client, db):
+        """Test a batch of activities is tracked with a single UPDATE"""
+        session_id = CartService.generate_session_id()
+        CartService.get_or_create_cart(db, session_id=session_id)
+        activities = [
+            {"product_id": 1, "activity_type": "view"},
+            {"product_id": 2, "activity_type": "add_to_cart"},
+            {"product_id": 1, "activity_type": "remove_from_cart"},
+        ]
+        
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        # The endpoint runs on the async engine; listen on every engine
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = client.post(
+                f"/api/v1/cart/session/{session_id}/track-activities",
+                json={"activities": activities},
+            )
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+        
+        assert response.status_code == 200
+        updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+        assert len(updates) == 1
+    
+    @pytest.mark.parametrize("count", [0, MAX_TRACKED_ACTIVITIES + 1])
+    def test_track_activities_batch_size_limits(self, client, count):
+        """Test an empty or oversized batch is rejected"""
+        response = client.post(
+            "/api/v1/cart/session/limits-session/track-activities",
+            json={"activities": [{"product_id": 1}] * count},
+        )
+        assert response.status_code == 422
+
 
 # =============================================================================
 # ORDER SERVICE TESTS
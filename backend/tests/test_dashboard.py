@@ -0,0 +1,84 @@
+"""
+Admin Dashboard Tests
+Query-count checks for the dashboard read endpoints.
+"""
+import pytest
+from contextlib import contextmanager
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.models.customer import User, Role
+from app.models.order import Order
+from app.routers import dashboard
+
+
+@contextmanager
+def count_queries(db):
+    """Count SQL statements executed through the session's engine"""
+    engine = db.get_bind()
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def dashboard_admin(db):
+    """Admin user for calling dashboard endpoints directly"""
+    admin = User(
+        email="dash-admin@example.com",
+        username="dash_admin",
+        full_name="Dashboard Admin",
+        hashed_password="not-used",
+        role=Role.ADMIN.value,
+    )
+    db.add(admin)
+    db.commit()
+    return admin
+
+
+def create_orders(db, count: int, prefix: str = "customer"):
+    """Create `count` paid orders, each for a different customer"""
+    for i in range(count):
+        customer = User(
+            email=f"{prefix}{i}@example.com",
+            username=f"{prefix}{i}",
+            full_name=f"{prefix.title()} {i}",
+            hashed_password="not-used",
+        )
+        db.add(customer)
+        db.flush()
+        db.add(Order(
+            user_id=customer.id,
+            order_number=f"ORD-{prefix.upper()}-{i:04d}",
+            total_amount=Decimal("100.00"),
+            status="pending",
+            payment_status="paid",
+        ))
+    db.commit()
+    db.expunge_all()
+
+
+class TestRecentOrders:
+    """Recent orders must not issue a query per order"""
+
+    def test_query_count_is_constant(self, db, dashboard_admin):
+        create_orders(db, 1)
+        with count_queries(db) as single:
+            result = dashboard.get_recent_orders(limit=20, db=db, current_admin=dashboard_admin)
+        assert len(result) == 1
+        assert len(single) == 1
+
+        create_orders(db, 5, prefix="extra")
+        with count_queries(db) as many:
+            result = dashboard.get_recent_orders(limit=20, db=db, current_admin=dashboard_admin)
+        assert len(result) == 6
+        assert len(many) == len(single)
+        assert "extra4@example.com" in {o["customer_email"] for o in result}
@@ -0,0 +1,174 @@
+"""
+Pagination Tests
+Tests for keyset cursors and the cursor-paginated product endpoints.
+"""
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.db.pagination import cursor_page, decode_cursor, encode_cursor
+from app.models.customer import User
+from app.models.product import Product, Review
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def products(db):
+    """Seven active products, one minute apart, newest last"""
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    items = [
+        Product(
+            name=f"Product {i}",
+            slug=f"product-{i}",
+            sku=f"PAGE-{i:03d}",
+            price=Decimal("10.00") + i,
+            stock=10,
+            is_active=True,
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(7)
+    ]
+    db.add_all(items)
+    db.commit()
+    return items
+
+
+@pytest.fixture
+def reviewed_product(db, products):
+    """A product with five approved reviews from different users"""
+    product = products[0]
+    start = datetime(2026, 2, 1, 12, 0, 0)
+    for i in range(5):
+        user = User(
+            email=f"reviewer{i}@example.com",
+            username=f"reviewer{i}",
+            full_name=f"Reviewer {i}",
+            hashed_password="x",
+        )
+        db.add(user)
+        db.flush()
+        db.add(Review(
+            product_id=product.id,
+            user_id=user.id,
+            rating=4,
+            comment=f"Review {i}",
+            created_at=start + timedelta(minutes=i),
+        ))
+    db.commit()
+    return product
+
+
+# =============================================================================
+# CURSOR ENCODING
+# =============================================================================
+
+class TestCursorEncoding:
+    """Tests for encode_cursor/decode_cursor"""
+
+    def test_round_trip(self):
+        """Test values come back as their JSON forms"""
+        created = datetime(2026, 3, 4, 5, 6, 7)
+        cursor = encode_cursor(created, 42)
+
+        assert decode_cursor(cursor) == [created.isoformat(), 42]
+
+    def test_cursor_is_url_safe(self):
+        """Test cursors need no escaping in a query string"""
+        cursor = encode_cursor("a/b+c?", 1)
+        assert not set(cursor) & set("+/=?&")
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24", "eyJhIjogMX0"])
+    def test_malformed_cursor(self, cursor):
+        """Test garbage, non-JSON and non-list cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+# =============================================================================
+# CURSOR PAGES
+# =============================================================================
+
+class TestCursorPage:
+    """Tests for cursor_page"""
+
+    def test_pages_cover_every_row_once(self, db, products):
+        """Test following next_cursor visits all rows in order, then stops"""
+        seen = []
+        cursor = None
+        for _ in range(len(products)):
+            rows, cursor = cursor_page(
+                db.query(Product), Product.created_at, Product.id, cursor=cursor, limit=3
+            )
+            seen.extend(row.id for row in rows)
+            if cursor is None:
+                break
+
+        assert seen == [p.id for p in reversed(products)]
+        assert cursor is None
+
+    def test_ascending_with_select(self, db, products):
+        """Test ascending pages of a select() run with a session"""
+        rows, cursor = cursor_page(
+            select(Product), Product.created_at, Product.id,
+            descending=False, limit=4, session=db
+        )
+        rest, last_cursor = cursor_page(
+            select(Product), Product.created_at, Product.id,
+            cursor=cursor, descending=False, limit=4, session=db
+        )
+
+        assert [p.id for p in rows + rest] == [p.id for p in products]
+        assert last_cursor is None
+
+    def test_invalid_cursor_values(self, db, products):
+        """Test a well-formed cursor with unusable values raises ValueError"""
+        with pytest.raises(ValueError):
+            cursor_page(db.query(Product), Product.created_at, Product.id,
+                        cursor=encode_cursor("yesterday", 1))
+        with pytest.raises(ValueError):
+            cursor_page(db.query(Product), Product.created_at, Product.id,
+                        cursor=encode_cursor(1))
+
+
+# =============================================================================
+# ENDPOINTS
+# =============================================================================
+
+class TestCursorEndpoints:
+    """Tests for the cursor-paginated product endpoints"""
+
+    def test_products_next_cursor_round_trip(self, client, products):
+        """Test meta.next_cursor fetches the following page"""
+        first = client.get("/api/v1/products?per_page=4").json()
+        second = client.get(
+            f"/api/v1/products?per_page=4&cursor={first['meta']['next_cursor']}"
+        ).json()
+
+        ids = [p["id"] for p in first["items"] + second["items"]]
+        assert ids == [p.id for p in reversed(products)]
+        assert second["meta"]["next_cursor"] is None
+
+    def test_products_malformed_cursor(self, client, products):
+        """Test a malformed cursor is a 400"""
+        response = client.get("/api/v1/products?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_reviews_next_cursor_round_trip(self, client, reviewed_product):
+        """Test X-Next-Cursor fetches the following page of reviews"""
+        url = f"/api/v1/products/{reviewed_product.id}/reviews"
+        first = client.get(f"{url}?per_page=3")
+        second = client.get(f"{url}?per_page=3&cursor={first.headers['X-Next-Cursor']}")
+
+        comments = [r["comment"] for r in first.json() + second.json()]
+        assert comments == [f"Review {i}" for i in reversed(range(5))]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_reviews_malformed_cursor(self, client, reviewed_product):
+        """Test a malformed reviews cursor is a 400"""
+        response = client.get(f"/api/v1/products/{reviewed_product.id}/reviews?cursor=%%%")
+        assert response.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Rate Limit Tests
+Tests for the per-user limiter on authenticated write endpoints.
+"""
+import pytest
+from types import SimpleNamespace
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import cache, rate_limit
+from app.core.config import settings
+from app.core.rate_limit import UserRateLimiter
+from app.core.security import get_current_user
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """A 30-per-minute limiter counting in process (Redis unavailable)"""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: None)
+    return UserRateLimiter(max_requests=30, window_seconds=60)
+
+
+def make_client(limiter, user_id=1):
+    """App with one write endpoint behind the limiter, as user_id"""
+    app = FastAPI()
+
+    @app.post("/reviews", dependencies=[Depends(limiter)])
+    def create_review():
+        return {"ok": True}
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id)
+    return TestClient(app)
+
+
+class TestUserRateLimiter:
+    """Tests for UserRateLimiter"""
+
+    def test_31st_write_in_window_is_rejected(self, limiter):
+        """Test the request after the limit gets a 429 with Retry-After"""
+        client = make_client(limiter)
+        for _ in range(30):
+            assert client.post("/reviews").status_code == 200
+
+        response = client.post("/reviews")
+
+        assert response.status_code == 429
+        assert 1 <= int(response.headers["Retry-After"]) <= 60
+
+    def test_limits_are_per_user(self, limiter):
+        """Test one user's writes do not count against another's"""
+        first = make_client(limiter, user_id=1)
+        for _ in range(30):
+            first.post("/reviews")
+
+        assert make_client(limiter, user_id=2).post("/reviews").status_code == 200
+
+    def test_window_resets(self, limiter, monkeypatch):
+        """Test the count starts over once the window has passed"""
+        client = make_client(limiter)
+        for _ in range(31):
+            client.post("/reviews")
+        later = rate_limit.time.monotonic() + 61
+        monkeypatch.setattr(rate_limit.time, "monotonic", lambda: later)
+
+        assert client.post("/reviews").status_code == 200
+
+    def test_expired_windows_are_pruned(self, limiter, monkeypatch):
+        """Test windows of users who stopped writing do not pile up"""
+        for user_id in range(5):
+            make_client(limiter, user_id=user_id).post("/reviews")
+        assert len(limiter._windows) == 5
+        later = rate_limit.time.monotonic() + 61
+        monkeypatch.setattr(rate_limit.time, "monotonic", lambda: later)
+
+        make_client(limiter, user_id=99).post("/reviews")
+
+        assert list(limiter._windows) == [f"{cache.KEY_PREFIX}:rl:create_review:99"]
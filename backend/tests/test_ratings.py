@@ -0,0 +1,102 @@
+"""
+Product Rating Tests
+Tests for the incremental rating update and the exact recalculation.
+"""
+import pytest
+from decimal import Decimal
+
+from app.models.customer import User
+from app.models.product import Product, Review
+from app.services.ratings import add_review_to_rating, recalculate_product_ratings
+
+
+@pytest.fixture
+def product(db):
+    """An active product with no reviews yet"""
+    product = Product(name="Rated Product", slug="rated-product", sku="RATE-001",
+                      price=Decimal("10.00"), stock=5, is_active=True)
+    db.add(product)
+    db.commit()
+    return product
+
+
+def add_reviews(db, product, ratings, is_approved=True):
+    """Store one review per rating, each from a new user"""
+    offset = db.query(User).count()
+    for i, rating in enumerate(ratings, start=offset):
+        user = User(email=f"rater{i}@example.com", username=f"rater{i}",
+                    full_name=f"Rater {i}", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(Review(product_id=product.id, user_id=user.id, rating=rating,
+                      is_approved=is_approved))
+    db.commit()
+
+
+class TestAddReviewToRating:
+    """Tests for the O(1) incremental update"""
+
+    def test_first_review(self, db, product):
+        """Test the first review sets the average outright"""
+        add_review_to_rating(db, product.id, 4)
+        db.refresh(product)
+
+        assert product.rating == Decimal("4.0")
+        assert product.review_count == 1
+
+    def test_running_average_is_rounded_to_one_place(self, db, product):
+        """Test the stored average is rounded into Numeric(2,1)"""
+        for rating in (4, 5, 5):
+            add_review_to_rating(db, product.id, rating)
+        db.refresh(product)
+
+        # (4 + 5 + 5) / 3 = 4.67
+        assert product.rating == Decimal("4.7")
+        assert product.review_count == 3
+
+
+class TestRecalculateProductRatings:
+    """Tests for the exact periodic recalculation"""
+
+    def test_corrects_drift(self, db, product):
+        """Test a drifted rating and count are replaced by the exact figures"""
+        add_reviews(db, product, [4, 4, 5])
+        product.rating = Decimal("3.0")
+        product.review_count = 7
+        db.commit()
+
+        assert recalculate_product_ratings(db) == 1
+        db.refresh(product)
+
+        # (4 + 4 + 5) / 3 = 4.33
+        assert product.rating == Decimal("4.3")
+        assert product.review_count == 3
+
+    def test_ignores_unapproved_reviews(self, db, product):
+        """Test reviews awaiting approval do not count"""
+        add_reviews(db, product, [5])
+        add_reviews(db, product, [1, 1], is_approved=False)
+
+        recalculate_product_ratings(db)
+        db.refresh(product)
+
+        assert product.rating == Decimal("5.0")
+        assert product.review_count == 1
+
+    def test_skips_rows_already_exact(self, db, product):
+        """Test products whose figures are right are not rewritten"""
+        add_reviews(db, product, [3, 4])
+        recalculate_product_ratings(db)
+
+        assert recalculate_product_ratings(db) == 0
+
+    def test_incremental_and_exact_agree(self, db, product):
+        """Test the incremental updates land on the recalculated figures"""
+        ratings = [5, 3, 4, 4]
+        add_reviews(db, product, ratings)
+        for rating in ratings:
+            add_review_to_rating(db, product.id, rating)
+
+        assert recalculate_product_ratings(db) == 0
+        db.refresh(product)
+        assert product.rating == Decimal("4.0")
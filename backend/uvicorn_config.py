@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-Uvicorn configuration for development server with optimized settings
-to reduce excessive reloading and improve performance.
+Uvicorn settings shared by the dev_config and prod_config profiles.
+serve.py picks the profile from UVICORN_ENV.
 """
 
 import os
@@ -10,46 +10,24 @@ from pathlib import Path
 # Get the backend directory
 backend_dir = Path(__file__).parent
 
-# Configuration for development server
 bind = "0.0.0.0:8000"
-workers = 1
 worker_class = "uvicorn.workers.UvicornWorker"
 worker_connections = 1000
 
-# Reload configuration - optimized to reduce excessive reloading
-reload = True
-reload_dirs = [str(backend_dir / "app")]  # Only watch app directory
-reload_includes = ["*.py", "*.html", "*.js", "*.css"]  # Only reload on relevant file changes
-reload_excludes = [
-    "*.pyc",
-    "*.pyo",
-    "__pycache__",
-    ".git",
-    "node_modules",
-    "*.log",
-    "*.tmp",
-    "logs/",
-    "postgres-db/",
-    "postgres-debug-log/",
-    "uploads/",
-    "*.sqlite",
-    "*.db",
-    "alembic/versions/*.py",  # Don't reload on migration files
-]
-
 # Performance settings
-max_requests = 1000
-max_requests_jitter = 50
+# uvloop and httptools ship with uvicorn[standard]; UVICORN_LOOP=asyncio
+# falls back to the stdlib loop where uvloop is unavailable (Windows)
+loop = os.getenv("UVICORN_LOOP", "uvloop")
+http = "httptools"
 
-# Logging
-log_level = "info"
-access_log = True
+# Connection handling
+timeout_keep_alive = 30  # seconds; keeps a client's socket open between calls
+backlog = 2048
+limit_concurrency = 1000  # connections/tasks before new requests get a 503
+h11_max_incomplete_event_size = 65536  # bytes buffered for request line + headers (h11)
 
 # Application
 application = "app.main:app"
 
-# Additional settings for better development experience
 host = "0.0.0.0"
 port = 8000
-debug = True
-reload_delay = 0.25  # Small delay to batch file changes
\ No newline at end of file